@@ -0,0 +1,71 @@
+import importlib
+
+# Public names resolve lazily (PEP 562): ``import chemistrynote`` loads no
+# submodule, and each name imports only the module that defines it. SciPy,
+# Matplotlib and PyArrow are imported inside the functions that need them,
+# so nothing here pulls them in.
+
+_SUBMODULES = (
+    'assignment_index', 'balancing', 'benchmarks', 'chemical_analyzer', 'cli',
+    'electrophysiology', 'formula_parser', 'generate_chromatogram',
+    'goldman_hodgkin_katz_flux', 'instrumentation', 'lcms_cube', 'mass_spectrometry',
+    'molecular_spectroscopy_analyzer', 'nernst_equation', 'nernst_planck_flux',
+    'nernst_planck_poisson', 'oxidation_states', 'peak_characterization', 'peak_table',
+    'periodic_table', 'pyrolysis', 'reaction_store', 'rendering', 'reverse_osmosis',
+    'spectral_io', 'spectral_library', 'spectrum_synthesis', 'stoichiometry',
+    'thermodynamics',
+)
+
+# name -> defining submodule
+_EXPORTS = {
+    'ChemicalAnalyzer': 'chemical_analyzer',
+    'MolecularSpectroscopyAnalyzer': 'molecular_spectroscopy_analyzer',
+    'SpectroscopyType': 'molecular_spectroscopy_analyzer',
+    'AmbiguousReactionError': 'balancing',
+    'FormulaParser': 'formula_parser',
+    'ReactionStoichiometry': 'stoichiometry',
+    'ReactionStore': 'reaction_store',
+    'IntervalIndex': 'assignment_index',
+    'PeakTable': 'peak_table',
+    'SpectralPeak': 'peak_table',
+    'SpectralLibrary': 'spectral_library',
+    'Spectrum': 'spectral_io',
+    'SpectrumPipeline': 'spectral_io',
+    'iter_spectra': 'spectral_io',
+    'IsotopePattern': 'mass_spectrometry',
+    'IsotopePatternEngine': 'mass_spectrometry',
+    'MassReference': 'mass_spectrometry',
+    'LCMSCube': 'lcms_cube',
+    'PeakFit': 'generate_chromatogram',
+    'simulate_chromatograms': 'generate_chromatogram',
+    'fit_peaks': 'generate_chromatogram',
+    'fit_sequence': 'generate_chromatogram',
+    'ghk_flux': 'electrophysiology',
+    'ghk_voltage': 'electrophysiology',
+    'ghk_current': 'electrophysiology',
+    'resting_potential': 'electrophysiology',
+    'nernst_potential': 'electrophysiology',
+    'NernstPlanckPoisson': 'nernst_planck_poisson',
+    'Species': 'nernst_planck_poisson',
+    'Membrane': 'reverse_osmosis',
+    'PyrolysisModel': 'pyrolysis',
+    'instrument': 'instrumentation',
+    'profiled': 'instrumentation',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f'.{name}', __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS) | set(_SUBMODULES))
@@ -0,0 +1,89 @@
+import numpy as np
+from typing import Dict, List, Tuple
+
+
+class IntervalIndex:
+    """Static index of closed [low, high] reference ranges.
+
+    Ranges are bucketed by length (powers of two) and sorted by lower bound
+    within each bucket. A range of bucket length at most ``L`` can only
+    contain ``q`` if its lower bound lies in ``[q - L, q]``, so a batch of
+    positions is answered with two ``np.searchsorted`` calls per bucket and
+    a ragged gather. Because ranges in a bucket differ in length by at most
+    2x, at most about half the candidates examined are rejected. Every
+    overlapping range is returned, not only the first match.
+    """
+
+    def __init__(self, table: Dict[str, Tuple[float, float]]):
+        self.names = tuple(table)
+        ranges = np.array([table[name] for name in self.names], dtype=float).reshape(-1, 2)
+        self.lows = np.minimum(ranges[:, 0], ranges[:, 1])
+        self.highs = np.maximum(ranges[:, 0], ranges[:, 1])
+        self.centers = (self.lows + self.highs) / 2
+        self.half_widths = (self.highs - self.lows) / 2
+
+        lengths = self.highs - self.lows
+        with np.errstate(divide='ignore'):
+            bucket = np.where(lengths > 0, np.ceil(np.log2(np.where(lengths > 0, lengths, 1))), -np.inf)
+        self._buckets = []  # (max length, sorted lows, range ids)
+        for value in np.unique(bucket):
+            members = np.flatnonzero(bucket == value)
+            members = members[np.argsort(self.lows[members], kind='stable')]
+            self._buckets.append((float(lengths[members].max()), self.lows[members], members))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def query(self, positions) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """All (position, range) overlaps for a batch of positions.
+
+        Returns:
+        tuple: (position index, range index, score) arrays ordered by
+            position, then by descending score, then by table order. The
+            score is 1 at the center of a range and falls to 0 at its edges.
+        """
+        positions = np.atleast_1d(np.asarray(positions, dtype=float))
+        peaks, intervals = [], []
+        for max_length, lows, members in self._buckets:
+            start = np.searchsorted(lows, positions - max_length)
+            lengths = np.searchsorted(lows, positions, side='right') - start
+            peak = np.repeat(np.arange(positions.size), lengths)
+            within = np.arange(peak.size) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            interval = members[np.repeat(start, lengths) + within]
+            keep = self.highs[interval] >= positions[peak]
+            peaks.append(peak[keep])
+            intervals.append(interval[keep])
+        peak = np.concatenate(peaks) if peaks else np.empty(0, dtype=np.intp)
+        interval = np.concatenate(intervals) if intervals else np.empty(0, dtype=np.intp)
+
+        half = self.half_widths[interval]
+        distance = np.abs(positions[peak] - self.centers[interval])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            score = np.where(half > 0, 1.0 - distance / half, 1.0)
+        order = np.lexsort((interval, -score, peak))
+        return peak[order], interval[order], score[order]
+
+    def candidates(self, positions) -> List[List[Tuple[str, float]]]:
+        """Every matching (name, score) per position, best first."""
+        positions = np.atleast_1d(positions)
+        peak, interval, score = self.query(positions)
+        result: List[List[Tuple[str, float]]] = [[] for _ in range(positions.size)]
+        for p, k, s in zip(peak.tolist(), interval.tolist(), score.tolist()):
+            result[p].append((self.names[k], s))
+        return result
+
+    def best_index(self, positions) -> np.ndarray:
+        """Index of the highest-scoring range per position, -1 when none match."""
+        positions = np.atleast_1d(positions)
+        peak, interval, _ = self.query(positions)
+        result = np.full(positions.size, -1, dtype=np.intp)
+        # query() orders each position's matches best first
+        first = np.ones(peak.size, dtype=bool)
+        first[1:] = peak[1:] != peak[:-1]
+        result[peak[first]] = interval[first]
+        return result
+
+    def best(self, positions, default: str = "Unknown") -> List[str]:
+        """Highest-scoring name per position, or ``default`` when none match."""
+        names = self.names + (default,)
+        return [names[k] for k in self.best_index(positions).tolist()]
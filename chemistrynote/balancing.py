@@ -0,0 +1,135 @@
+from math import gcd
+from typing import Dict, List, Sequence
+
+# Sparse integer matrix: one {column: value} dict per row
+SparseRow = Dict[int, int]
+
+
+class AmbiguousReactionError(ValueError):
+    """Raised when a reaction has several independent balancings."""
+
+    def __init__(self, message: str, balancings: List[List[int]]):
+        super().__init__(message)
+        self.balancings = balancings
+
+
+def _row_gcd(row: SparseRow) -> int:
+    g = 0
+    for value in row.values():
+        g = gcd(g, value)
+        if g == 1:
+            break
+    return g
+
+
+def _reduce_row(row: SparseRow) -> SparseRow:
+    g = _row_gcd(row)
+    if g > 1:
+        return {col: value // g for col, value in row.items()}
+    return row
+
+
+def integer_nullspace(rows: Sequence[SparseRow], n_cols: int) -> List[List[int]]:
+    """Compute an integer basis of the nullspace of a sparse integer matrix.
+
+    Fraction-free Gauss-Jordan elimination: every row update is
+    ``a*row - b*pivot_row`` followed by division by the row gcd, so all
+    arithmetic stays in exact (and small) Python integers. Each basis vector
+    is primitive (gcd 1) and belongs to one free column.
+    """
+    pivots: List[tuple] = []  # (pivot column, row)
+    pivot_cols = set()
+    for row in rows:
+        row = {col: value for col, value in row.items() if value}
+        # Eliminate existing pivot columns from the incoming row
+        for col, pivot_row in pivots:
+            b = row.get(col)
+            if b:
+                a = pivot_row[col]
+                updated = {c: a * v for c, v in row.items()}
+                for c, v in pivot_row.items():
+                    nv = updated.get(c, 0) - b * v
+                    if nv:
+                        updated[c] = nv
+                    else:
+                        updated.pop(c, None)
+                row = _reduce_row(updated)
+        if not row:
+            continue
+        col = min(row)
+        if row[col] < 0:
+            row = {c: -v for c, v in row.items()}
+        # Back-substitute the new pivot into earlier rows (reduced form)
+        a = row[col]
+        for i, (pcol, pivot_row) in enumerate(pivots):
+            b = pivot_row.get(col)
+            if b:
+                updated = {c: a * v for c, v in pivot_row.items()}
+                for c, v in row.items():
+                    nv = updated.get(c, 0) - b * v
+                    if nv:
+                        updated[c] = nv
+                    else:
+                        updated.pop(c, None)
+                pivots[i] = (pcol, _reduce_row(updated))
+        pivots.append((col, row))
+        pivot_cols.add(col)
+
+    basis = []
+    for free in range(n_cols):
+        if free in pivot_cols:
+            continue
+        # x_free = L, x_pivot = -row[free] * L / row[pivot] for each pivot row
+        scale = 1
+        for col, row in pivots:
+            if free in row:
+                p = row[col]
+                scale = scale * p // gcd(scale, p)
+        vector = [0] * n_cols
+        vector[free] = scale
+        for col, row in pivots:
+            v = row.get(free)
+            if v:
+                vector[col] = -v * scale // row[col]
+        g = 0
+        for value in vector:
+            g = gcd(g, value)
+        basis.append([value // g for value in vector])
+    return basis
+
+
+def balance_coefficients(compositions: Sequence[Dict[str, int]], n_reactants: int,
+                         charges: Sequence[int] = ()) -> List[int]:
+    """Return the minimal positive integer coefficients for a reaction.
+
+    Parameters:
+    compositions: element counts for the reactants followed by the products
+    n_reactants: number of leading entries that are reactants
+    charges: optional net charge per compound, balanced like an element
+
+    Raises ValueError when no positive balancing exists and
+    AmbiguousReactionError when several independent balancings exist.
+    """
+    n = len(compositions)
+    rows: Dict[str, SparseRow] = {}
+    for j, parsed in enumerate(compositions):
+        sign = 1 if j < n_reactants else -1
+        for element, count in parsed.items():
+            rows.setdefault(element, {})[j] = sign * count
+    if any(charges):
+        rows['(charge)'] = {j: (1 if j < n_reactants else -1) * q
+                            for j, q in enumerate(charges) if q}
+
+    basis = integer_nullspace(list(rows.values()), n)
+    if not basis:
+        raise ValueError("No solution exists")
+    if len(basis) > 1:
+        raise AmbiguousReactionError(
+            f"Reaction has {len(basis)} independent balancings: {basis}", basis)
+
+    coefficients = basis[0]
+    if all(c <= 0 for c in coefficients):
+        coefficients = [-c for c in coefficients]
+    if any(c <= 0 for c in coefficients):
+        raise ValueError(f"No positive solution exists: {coefficients}")
+    return coefficients
@@ -0,0 +1,268 @@
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Reproducible workloads for the hot paths. Each setup function receives a
+# seeded generator and a scale factor and returns (callable, items); only
+# the callable is timed, and throughput is items per second.
+#
+#   python -m chemistrynote.benchmarks                       run everything
+#   python -m chemistrynote.benchmarks --save baseline.json  store a baseline
+#   python -m chemistrynote.benchmarks --compare baseline.json --tolerance 0.2
+#                                     exit 1 on a >20% throughput drop
+
+Setup = Callable[[np.random.Generator, float], Tuple[Callable[[], object], int]]
+WORKLOADS: Dict[str, Setup] = {}
+
+
+def workload(name: str):
+    """Register a benchmark setup function under ``name``."""
+    def decorator(setup: Setup) -> Setup:
+        WORKLOADS[name] = setup
+        return setup
+    return decorator
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    items: int
+    best_seconds: float
+    median_seconds: float
+    throughput: float  # items per second at the best time (least disturbed by noise)
+    peak_memory_mb: float  # traced allocations during one extra run
+
+
+def _random_formulas(rng: np.random.Generator, n: int) -> List[str]:
+    """Formulas with groups, hydrates and charges drawn from common elements."""
+    elements = np.array(['C', 'H', 'O', 'N', 'S', 'P', 'Cl', 'Na', 'K', 'Ca', 'Fe', 'Cu', 'Mg', 'Br'])
+    formulas = []
+    for _ in range(n):
+        picks = rng.choice(elements, size=rng.integers(1, 5), replace=False)
+        body = ''.join(f"{e}{c if c > 1 else ''}" for e, c in zip(picks, rng.integers(1, 12, len(picks))))
+        roll = rng.random()
+        if roll < 0.2:
+            body = f"{body}({rng.choice(elements)}{rng.choice(elements)}){rng.integers(2, 4)}"
+        elif roll < 0.3:
+            body = f"{body}·{rng.integers(1, 8)}H2O"
+        elif roll < 0.35:
+            body = f"{body}{rng.choice(['+', '-', '2+', '3-'])}"
+        formulas.append(body)
+    return formulas
+
+
+@workload('formula_parsing')
+def _formula_parsing(rng, scale):
+    from .formula_parser import FormulaParser
+
+    formulas = _random_formulas(rng, int(20000 * scale))
+
+    def run():
+        parser = FormulaParser()  # cold cache: measures the grammar, not the LRU
+        return [parser.parse_with_charge(f) for f in formulas]
+    return run, len(formulas)
+
+
+@workload('molar_masses')
+def _molar_masses(rng, scale):
+    from .chemical_analyzer import ChemicalAnalyzer
+    from .formula_parser import FormulaParser
+
+    distinct = _random_formulas(rng, int(5000 * scale))
+    formulas = list(rng.choice(np.array(distinct, dtype=object), size=int(200000 * scale)))
+
+    def run():
+        return ChemicalAnalyzer(parser=FormulaParser()).molar_masses(formulas)
+    return run, len(formulas)
+
+
+@workload('equation_balancing')
+def _equation_balancing(rng, scale):
+    from .chemical_analyzer import ChemicalAnalyzer
+    from .formula_parser import FormulaParser
+
+    templates = [
+        lambda n: (f"C{n}H{2 * n + 2} + O2", "CO2 + H2O"),
+        lambda n: (f"C{n}H{2 * n + 1}OH + O2", "CO2 + H2O"),
+        lambda n: (f"C{n}H{2 * n} + O2", "CO2 + H2O"),
+        lambda n: ("KMnO4 + HCl", "KCl + MnCl2 + H2O + Cl2"),
+        lambda n: ("MnO4- + Fe^2+ + H+", "Mn^2+ + Fe^3+ + H2O"),
+    ]
+    reactions = [templates[t](int(n)) for t, n in
+                 zip(rng.integers(0, len(templates), int(2000 * scale)), rng.integers(1, 40, int(2000 * scale)))]
+    analyzer = ChemicalAnalyzer(parser=FormulaParser())
+
+    def run():
+        return [analyzer.balance_equation(r, p) for r, p in reactions]
+    return run, len(reactions)
+
+
+def _ir_samples(rng, n):
+    from .molecular_spectroscopy_analyzer import MolecularSpectroscopyAnalyzer
+
+    analyzer = MolecularSpectroscopyAnalyzer()
+    groups = np.array(list(analyzer.ir_functional_groups), dtype=object)
+    samples = [list(rng.choice(groups, size=rng.integers(1, 5), replace=False)) for _ in range(n)]
+    return analyzer, samples
+
+
+@workload('spectrum_generation')
+def _spectrum_generation(rng, scale):
+    from .molecular_spectroscopy_analyzer import SpectroscopyType
+
+    analyzer, samples = _ir_samples(rng, int(5000 * scale))
+    seed = int(rng.integers(2 ** 31))
+
+    def run():
+        return analyzer.generate_spectra(SpectroscopyType.IR, samples, seed=seed)
+    return run, len(samples)
+
+
+@workload('spectrum_analysis')
+def _spectrum_analysis(rng, scale):
+    from .molecular_spectroscopy_analyzer import SpectroscopyType
+
+    analyzer, samples = _ir_samples(rng, int(2000 * scale))
+    grid, spectra = analyzer.generate_spectra(SpectroscopyType.IR, samples, seed=int(rng.integers(2 ** 31)))
+
+    def run():
+        return analyzer.analyze_spectra(grid, spectra, SpectroscopyType.IR)
+    return run, len(spectra)
+
+
+@workload('chromatogram_synthesis')
+def _chromatogram_synthesis(rng, scale):
+    from .generate_chromatogram import simulate_chromatograms
+
+    runs, peaks = int(2000 * scale), 8
+    time_axis = np.linspace(0, 30, 3000)
+    params = np.stack([rng.uniform(0.5, 5, (runs, peaks)), rng.uniform(2, 28, (runs, peaks)),
+                       rng.uniform(0.05, 0.2, (runs, peaks)), rng.uniform(0.01, 0.5, (runs, peaks))], axis=-1)
+    seed = int(rng.integers(2 ** 31))
+
+    def run():
+        return simulate_chromatograms(time_axis, params, noise_level=0.01, seed=seed)
+    return run, runs
+
+
+@workload('membrane_flux')
+def _membrane_flux(rng, scale):
+    from .electrophysiology import ghk_flux
+
+    n = int(1000 * scale)
+    z = np.array([1.0, 1.0, -1.0, 2.0])[:, None, None]
+    permeability = rng.uniform(1e-9, 1e-7, (4, 1, 1))
+    voltages = np.linspace(-0.1, 0.1, n)[None, :, None]
+    outside = rng.uniform(1, 150, (4, 1, 250))
+
+    def run():
+        return ghk_flux(permeability, z, voltages, outside, 10.0)
+    return run, 4 * n * 250
+
+
+@workload('resting_potential')
+def _resting_potential(rng, scale):
+    from .electrophysiology import resting_potential
+
+    cells = int(20000 * scale)
+    z = np.array([1.0, 1.0, -1.0, 2.0])
+    permeability = rng.uniform(0.01, 1, (cells, 4))
+    outside, inside = rng.uniform(1, 150, (cells, 4)), rng.uniform(1, 150, (cells, 4))
+
+    def run():
+        return resting_potential(permeability, z, outside, inside)
+    return run, cells
+
+
+def run_benchmark(name: str, seed: int = 0, scale: float = 1.0, repeat: int = 5) -> BenchmarkResult:
+    """Set up one workload with a fixed seed, time it and trace its memory."""
+    run, items = WORKLOADS[name](np.random.default_rng(seed), scale)
+    run()  # warm-up: imports, grids and caches built outside the timed runs
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    median = statistics.median(times)
+    return BenchmarkResult(name, items, min(times), median, items / min(times), peak / 2 ** 20)
+
+
+def run_all(names: Optional[Sequence[str]] = None, **options) -> List[BenchmarkResult]:
+    names = list(WORKLOADS) if not names else list(names)
+    unknown = [n for n in names if n not in WORKLOADS]
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {', '.join(unknown)}")
+    return [run_benchmark(name, **options) for name in names]
+
+
+def compare(results: Sequence[BenchmarkResult], baseline: Dict[str, dict]) -> Dict[str, float]:
+    """Throughput ratio (current / baseline) for every benchmark in both."""
+    return {r.name: r.throughput / baseline[r.name]['throughput']
+            for r in results if r.name in baseline}
+
+
+def save_baseline(path: str, results: Sequence[BenchmarkResult], **meta):
+    environment = {'python': platform.python_version(), 'numpy': np.__version__,
+                   'machine': platform.machine(), **meta}
+    with open(path, 'w') as f:
+        json.dump({'environment': environment,
+                   'results': {r.name: asdict(r) for r in results}}, f, indent=2)
+
+
+def load_baseline(path: str) -> Dict[str, dict]:
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def format_results(results: Sequence[BenchmarkResult], ratios: Optional[Dict[str, float]] = None) -> str:
+    lines = [f"{'benchmark':<24} {'items':>10} {'median s':>10} {'items/s':>12} {'peak MB':>9}"
+             + (f" {'vs base':>8}" if ratios is not None else "")]
+    for r in results:
+        line = (f"{r.name:<24} {r.items:>10} {r.median_seconds:>10.4f} "
+                f"{r.throughput:>12.4g} {r.peak_memory_mb:>9.1f}")
+        if ratios is not None:
+            line += f" {ratios[r.name]:>7.2f}x" if r.name in ratios else f" {'-':>8}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the ChemistryNote benchmark suite.")
+    parser.add_argument('names', nargs='*', help=f"benchmarks to run (default: all of {', '.join(WORKLOADS)})")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--scale', type=float, default=1.0, help="workload size multiplier")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save', metavar='PATH', help="write results as a baseline")
+    parser.add_argument('--compare', metavar='PATH', help="compare against a stored baseline")
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help="allowed fractional throughput drop before failing")
+    args = parser.parse_args(argv)
+
+    results = run_all(args.names, seed=args.seed, scale=args.scale, repeat=args.repeat)
+    ratios = compare(results, load_baseline(args.compare)) if args.compare else None
+    print(format_results(results, ratios))
+    if args.save:
+        save_baseline(args.save, results, seed=args.seed, scale=args.scale)
+    regressions = [name for name, ratio in (ratios or {}).items() if ratio < 1 - args.tolerance]
+    if regressions:
+        print(f"Regressions beyond {args.tolerance:.0%}: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
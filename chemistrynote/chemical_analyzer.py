@@ -0,0 +1,303 @@
+import os
+from multiprocessing import Pool
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import numpy as np
+from dataclasses import dataclass
+from .balancing import AmbiguousReactionError, balance_coefficients
+from .formula_parser import FormulaParser, default_parser
+from .instrumentation import instrument
+from . import periodic_table as pt
+from . import rendering
+from .stoichiometry import ReactionStoichiometry
+from . import thermodynamics
+from .oxidation_states import OxidationState, OxidationStateSolver
+
+# A reaction is either a (reactants, products) pair or "A + B -> C"
+Reaction = Union[Tuple[str, str], str]
+
+@dataclass
+class Element:
+    symbol: str
+    atomic_number: int
+    atomic_mass: float
+    electronegativity: float
+    oxidation_states: List[int]
+
+class ChemicalAnalyzer:
+    def __init__(self, parser: Optional[FormulaParser] = None):
+        # Compositions are cached by the parser; share it across analyzers
+        self.parser = parser if parser is not None else default_parser
+
+        # Full periodic table; the arrays behind it are indexed by atomic number
+        self.periodic_table = {
+            symbol: Element(symbol, z, float(pt.ATOMIC_MASS[z]),
+                            float(pt.ELECTRONEGATIVITY[z]), pt.oxidation_states(z))
+            for z, symbol in enumerate(pt.SYMBOLS) if symbol
+        }
+        self.oxidation_solver = OxidationStateSolver(self.periodic_table)
+        
+    def parse_formula(self, formula: str) -> Dict[str, int]:
+        """Parse chemical formula into element counts.
+
+        Handles parentheses, hydrates (``CuSO4·5H2O``) and trailing charges;
+        results are served from the parser's LRU cache.
+        """
+        return self.parser.parse(formula)
+
+    @instrument()
+    def balance_equation(self, reactants: str, products: str) -> Tuple[List[int], List[int]]:
+        """Balance chemical equation using an exact integer nullspace.
+
+        Raises AmbiguousReactionError (a ValueError) listing every
+        independent balancing when the coefficients are not unique.
+        """
+        # Split equations into compounds
+        reactant_compounds = reactants.split(' + ')
+        product_compounds = products.split(' + ')
+        compounds = reactant_compounds + product_compounds
+
+        # Parse each compound once; charges are balanced like an element
+        parsed = [self.parser.parse_with_charge(c) for c in compounds]
+        coefficients = balance_coefficients([p[0] for p in parsed],
+                                            len(reactant_compounds),
+                                            [p[1] for p in parsed])
+
+        n_reactants = len(reactant_compounds)
+        return coefficients[:n_reactants], coefficients[n_reactants:]
+
+    def calculate_molar_mass(self, formula: str) -> float:
+        """Calculate molar mass of a compound."""
+        total_mass = 0.0
+        for element, count in self.parser.composition(formula):
+            total_mass += pt.ATOMIC_MASS[pt.atomic_number(element)] * count
+        return float(total_mass)
+
+    def composition_matrix(self, formulas: Iterable[str]):
+        """Build a sparse (formulas × atomic number) composition matrix.
+
+        Returns a ``scipy.sparse.csr_matrix`` whose column ``z`` holds the
+        count of element ``z`` in each formula.
+        """
+        from scipy.sparse import csr_matrix
+        indptr, columns, counts, inverse = self._csr_composition(formulas)
+        unique = csr_matrix((counts, columns, indptr), shape=(len(indptr) - 1, pt.N_ELEMENTS + 1))
+        return unique[inverse]
+
+    @instrument(items=len)
+    def molar_masses(self, formulas: Iterable[str]) -> np.ndarray:
+        """Calculate molar masses of many formulas at once.
+
+        Distinct formulas are encoded as CSR composition rows and all masses
+        come from a single sparse matrix-vector product with the atomic mass
+        array.
+        """
+        indptr, columns, counts, inverse = self._csr_composition(formulas)
+        rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        masses = np.bincount(rows, weights=counts * pt.ATOMIC_MASS[columns],
+                             minlength=len(indptr) - 1)
+        return masses[inverse]
+
+    def _csr_composition(self, formulas: Iterable[str]):
+        """Encode distinct formulas as CSR arrays plus an index per input."""
+        row_of: Dict[str, int] = {}
+        inverse = []
+        columns: List[int] = []
+        counts: List[int] = []
+        indptr = [0]
+        for formula in formulas:
+            row = row_of.get(formula)
+            if row is None:
+                row = row_of[formula] = len(indptr) - 1
+                for element, count in self.parser.composition(formula):
+                    columns.append(pt.atomic_number(element))
+                    counts.append(count)
+                indptr.append(len(columns))
+            inverse.append(row)
+        return (np.array(indptr, dtype=np.int64), np.array(columns, dtype=np.int64),
+                np.array(counts, dtype=np.float64), np.array(inverse, dtype=np.int64))
+
+    def calculate_oxidation_states(self, formula: str) -> Dict[str, OxidationState]:
+        """Calculate oxidation states of elements in a compound.
+
+        Mixed-valence compounds (e.g. Fe3O4) get fractional average states.
+        """
+        return self.oxidation_solver.solve(self.parser.composition(formula),
+                                           self.parser.charge(formula))
+
+    def oxidation_states(self, formulas: Iterable[str]) -> Dict[str, Dict[str, OxidationState]]:
+        """Calculate oxidation states for a batch of formulas in one call."""
+        return {formula: self.calculate_oxidation_states(formula)
+                for formula in dict.fromkeys(formulas)}
+
+    def stoichiometry(self, reactants: str, products: str) -> ReactionStoichiometry:
+        """Build a vectorized yield calculator for a balanced reaction."""
+        r_coeff, p_coeff = self.balance_equation(reactants, products)
+        reactant_compounds = reactants.split(' + ')
+        product_compounds = products.split(' + ')
+        return ReactionStoichiometry(reactant_compounds, product_compounds, r_coeff, p_coeff,
+                                     self.molar_masses(reactant_compounds),
+                                     self.molar_masses(product_compounds))
+
+    def analyze_reaction(self, reactants: str, products: str) -> dict:
+        """Analyze a chemical reaction comprehensively."""
+        try:
+            r_coeff, p_coeff = self.balance_equation(reactants, products)
+            reactant_compounds = reactants.split(' + ')
+            product_compounds = products.split(' + ')
+            
+            analysis = {
+                'balanced_equation': ' + '.join(f"{c if c>1 else ''}{r}" 
+                    for c, r in zip(r_coeff, reactant_compounds)) + 
+                    ' → ' + ' + '.join(f"{c if c>1 else ''}{p}" 
+                    for c, p in zip(p_coeff, product_compounds)),
+                'molar_masses': {
+                    'reactants': {r: self.calculate_molar_mass(r) for r in reactant_compounds},
+                    'products': {p: self.calculate_molar_mass(p) for p in product_compounds}
+                },
+                'oxidation_states': {
+                    'reactants': self.oxidation_states(reactant_compounds),
+                    'products': self.oxidation_states(product_compounds)
+                }
+            }
+            return analysis
+        except Exception as e:
+            return {'error': str(e)}
+
+    @instrument()
+    def analyze_reactions(self, reactions: Iterable[Reaction], workers: Optional[int] = None,
+                          chunksize: int = 256, ordered: bool = True) -> Iterator:
+        """Analyze many reactions, streaming results from a process pool.
+
+        Each reaction is a ``(reactants, products)`` pair or a string such as
+        ``"H2 + O2 -> H2O"``. Failures are reported per reaction as
+        ``{'error': ...}`` instead of aborting the batch. In ordered mode the
+        analyses are yielded in input order; with ``ordered=False`` they are
+        yielded as ``(index, analysis)`` pairs as soon as they complete.
+        ``workers=None`` uses every core and ``workers=1`` runs in-process.
+        """
+        items = enumerate(reactions)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1:
+            _init_worker(self)
+            results = map(_analyze_item, items)
+            if ordered:
+                for _, analysis in results:
+                    yield analysis
+            else:
+                yield from results
+            return
+
+        with Pool(workers, initializer=_init_worker, initargs=(self,)) as pool:
+            if ordered:
+                for _, analysis in pool.imap(_analyze_item, items, chunksize):
+                    yield analysis
+            else:
+                yield from pool.imap_unordered(_analyze_item, items, chunksize)
+
+    def plot_energy_diagram(self, reactants_energy: float, products_energy: float, 
+                          activation_energy: float, reaction_name: str = ""):
+        """Plot reaction energy diagram."""
+        import matplotlib.pyplot as plt
+        plt.figure(figsize=(10, 6))
+        
+        # Reaction coordinate points
+        x = np.array([0, 0.5, 1])
+        y = np.array([reactants_energy, reactants_energy + activation_energy, products_energy])
+        
+        # Plot energy curve
+        reaction_coordinate = np.linspace(0, 1, 100)
+        energy_curve = self._interpolate_energy_curve(x, y, reaction_coordinate)
+        plt.plot(reaction_coordinate, energy_curve, 'b-', linewidth=2)
+        
+        # Add labels and arrows
+        plt.plot([0], [reactants_energy], 'ro', label='Reactants')
+        plt.plot([1], [products_energy], 'go', label='Products')
+        plt.plot([0.5], [reactants_energy + activation_energy], 'ko', label='Transition State')
+        
+        # Add energy differences
+        plt.arrow(0.1, reactants_energy + activation_energy/2, 0, activation_energy/2, 
+                 head_width=0.03, head_length=0.5, fc='r', ec='r')
+        plt.text(0.15, reactants_energy + activation_energy/2, f'Ea = {activation_energy:.1f} kJ/mol')
+        
+        dH = products_energy - reactants_energy
+        plt.arrow(0.8, min(reactants_energy, products_energy) + abs(dH)/2, 
+                 0, dH/10, head_width=0.03, head_length=0.5, fc='g', ec='g')
+        plt.text(0.85, min(reactants_energy, products_energy) + abs(dH)/2, 
+                f'ΔH = {dH:.1f} kJ/mol')
+        
+        plt.xlabel('Reaction Coordinate')
+        plt.ylabel('Energy (kJ/mol)')
+        plt.title(f'Energy Diagram: {reaction_name}')
+        plt.legend()
+        plt.grid(True)
+        plt.show()
+
+    def render_energy_diagram(self, reactants_energy: float, products_energy: float,
+                              activation_energy: float, reaction_name: str = "",
+                              fmt: str = 'png') -> bytes:
+        """Render reaction energy diagram headlessly to PNG/SVG bytes."""
+        return rendering.get_renderer('energy').render(
+            reactants_energy, products_energy, activation_energy, reaction_name, fmt)
+
+    def _interpolate_energy_curve(self, x: np.ndarray, y: np.ndarray, 
+                                reaction_coordinate: np.ndarray) -> np.ndarray:
+        """Create smooth energy curve through three points (quadratic)."""
+        return np.polyval(np.polyfit(x, y, 2), reaction_coordinate)
+
+    def calculate_equilibrium_constant(self, delta_G, temperature=298.15):
+        """Calculate equilibrium constant from Gibbs free energy.
+
+        Accepts scalars or arrays; see the thermodynamics module for log-space
+        results and (reaction × temperature) grids.
+        """
+        return thermodynamics.equilibrium_constant(delta_G, temperature)
+
+# Per-process analyzer used by analyze_reactions workers
+_worker_analyzer: Optional[ChemicalAnalyzer] = None
+
+def _init_worker(analyzer: ChemicalAnalyzer):
+    global _worker_analyzer
+    _worker_analyzer = analyzer
+
+def _split_reaction(reaction: Reaction) -> Tuple[str, str]:
+    """Split a reaction string on its arrow, or unpack a pair."""
+    if isinstance(reaction, str):
+        for arrow in ('→', '->', '='):
+            if arrow in reaction:
+                reactants, products = reaction.split(arrow, 1)
+                return reactants.strip(), products.strip()
+        raise ValueError(f"No reaction arrow in: {reaction!r}")
+    reactants, products = reaction
+    return reactants, products
+
+def _analyze_item(item: Tuple[int, Reaction]) -> Tuple[int, dict]:
+    index, reaction = item
+    try:
+        reactants, products = _split_reaction(reaction)
+    except (TypeError, ValueError) as e:
+        return index, {'error': str(e)}
+    return index, _worker_analyzer.analyze_reaction(reactants, products)
+
+# Example usage
+if __name__ == "__main__":
+    import json
+
+    analyzer = ChemicalAnalyzer()
+    
+    # Analyze water formation reaction
+    result = analyzer.analyze_reaction("H2 + O2", "H2O")
+    print("Water Formation Analysis:")
+    print(json.dumps(result, indent=2))
+    
+    # Plot energy diagram for a sample reaction
+    analyzer.plot_energy_diagram(
+        reactants_energy=0,
+        products_energy=-40,
+        activation_energy=20,
+        reaction_name="Sample Exothermic Reaction"
+    )
+    
+    # Calculate equilibrium constant
+    K = analyzer.calculate_equilibrium_constant(delta_G=-37.2e3)  # Example ΔG in J/mol
+    print(f"\nEquilibrium Constant (K) at 25°C: {K:.2e}")
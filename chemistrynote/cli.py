@@ -0,0 +1,211 @@
+import argparse
+import json
+import sys
+from collections import deque
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO
+
+# JSON-lines batch filter. Every input line is one job object with an "op"
+# and optional "id"; every output line is {"id", "result"} or {"id",
+# "error"}, in input order. Only the standard library is imported at
+# startup: each handler imports the modules it needs on first use. Only
+# analyze_spectrum needs SciPy (peak finding); Matplotlib is never loaded.
+#
+#   {"op": "balance", "reaction": "H2 + O2 -> H2O"}
+#   {"op": "molar_mass", "formulas": ["H2O", "CuSO4·5H2O"]}
+#   {"op": "analyze_spectrum", "spec_type": "IR", "x": [...], "y": [...]}
+#   {"op": "flux", "kind": "ghk", "P": 1e-7, "z": 1, "V": -0.07, "C_out": 5, "C_in": 140}
+
+Handler = Callable[[dict], object]
+HANDLERS: Dict[str, Handler] = {}
+
+
+def handler(op: str):
+    """Register a job handler under ``op``."""
+    def decorator(func: Handler) -> Handler:
+        HANDLERS[op] = func
+        return func
+    return decorator
+
+
+@lru_cache(maxsize=None)
+def _chemical_analyzer():
+    from .chemical_analyzer import ChemicalAnalyzer
+    return ChemicalAnalyzer()
+
+
+@lru_cache(maxsize=None)
+def _spectroscopy_analyzer():
+    from .molecular_spectroscopy_analyzer import MolecularSpectroscopyAnalyzer
+    return MolecularSpectroscopyAnalyzer()
+
+
+def _plain(value):
+    """NumPy scalars and arrays as JSON-compatible Python values."""
+    return value.tolist() if hasattr(value, 'tolist') else value
+
+
+@handler('balance')
+def _balance(job: dict) -> dict:
+    from .chemical_analyzer import _split_reaction
+
+    reactants, products = _split_reaction(job['reaction'] if 'reaction' in job
+                                          else (job['reactants'], job['products']))
+    r_coeff, p_coeff = _chemical_analyzer().balance_equation(reactants, products)
+    return {'reactants': r_coeff, 'products': p_coeff}
+
+
+@handler('molar_mass')
+def _molar_mass(job: dict):
+    analyzer = _chemical_analyzer()
+    if 'formulas' in job:
+        return analyzer.molar_masses(job['formulas']).tolist()
+    return analyzer.calculate_molar_mass(job['formula'])
+
+
+@handler('analyze_spectrum')
+def _analyze_spectrum(job: dict) -> List[dict]:
+    import numpy as np
+    from .molecular_spectroscopy_analyzer import SpectroscopyType
+
+    spec_type = SpectroscopyType[job.get('spec_type', 'IR').upper().replace('-', '_')]
+    x = np.asarray(job['x'], dtype=float)
+    y = np.atleast_2d(np.asarray(job['y'], dtype=float))
+    table = _spectroscopy_analyzer().analyze_spectra(
+        x, y, spec_type, height=job.get('height', 0.1), distance=job.get('distance'))
+    columns = table.to_dict()
+    return [dict(zip(columns, values)) for values in zip(*(_plain(c) for c in columns.values()))]
+
+
+@handler('flux')
+def _flux(job: dict):
+    from . import electrophysiology as ep
+
+    kind = job.get('kind', 'ghk')
+    T = job.get('T', ep.BODY_TEMPERATURE)
+    if kind == 'ghk':
+        value = ep.ghk_flux(job['P'], job['z'], job['V'], job['C_out'], job['C_in'], T)
+    elif kind == 'nernst':
+        value = ep.nernst_potential(job['z'], job['C_out'], job['C_in'], T)
+    elif kind == 'nernst_planck':
+        value = ep.nernst_planck_flux(job['D'], job['z'], job['C'], job['dC_dx'], job['dphi_dx'], T)
+    elif kind == 'resting_potential':
+        value = ep.resting_potential(job['P'], job['z'], job['C_out'], job['C_in'], T)
+    else:
+        raise ValueError(f"Unknown flux kind: {kind!r}")
+    return _plain(value)
+
+
+def process_line(line: str) -> str:
+    """Run one JSON job and return its JSON result line (errors included)."""
+    job_id = None
+    try:
+        job = json.loads(line)
+        if not isinstance(job, dict):
+            raise ValueError("Job must be a JSON object")
+        job_id = job.get('id')
+        op = job.get('op')
+        if op not in HANDLERS:
+            raise ValueError(f"Unknown op: {op!r}")
+        record = {'id': job_id, 'result': HANDLERS[op](job)}
+    except Exception as e:  # one bad job must not stop the stream
+        record = {'id': job_id, 'error': f"{type(e).__name__}: {e}"}
+    return json.dumps(record, ensure_ascii=False)
+
+
+def process_batch(lines: Sequence[str]) -> List[str]:
+    return [process_line(line) for line in lines]
+
+
+def _batches(lines: Iterable[str], size: int) -> Iterator[List[str]]:
+    batch: List[str] = []
+    for line in lines:
+        if line.strip():
+            batch.append(line)
+            if len(batch) == size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def run(lines: Iterable[str], output: TextIO, workers: Optional[int] = 1,
+        batch_size: int = 64, max_pending: Optional[int] = None) -> int:
+    """
+    Stream jobs from ``lines`` to ``output`` in input order.
+
+    With workers != 1, batches go to a process pool while at most
+    ``max_pending`` batches (default four per worker) are in flight, so
+    memory stays bounded however long the input is; the reader blocks
+    until the oldest batch has been written.
+
+    Parameters:
+    lines (Iterable[str]): JSON job lines
+    output (TextIO): Destination for result lines
+    workers (int): Processes (None: one per CPU, 1: in-process)
+    batch_size (int): Jobs per task sent to a worker
+    max_pending (int): Bound on batches submitted but not yet written
+
+    Returns:
+    int: Number of jobs processed
+    """
+    count = 0
+
+    def write(results: List[str]):
+        nonlocal count
+        output.write('\n'.join(results) + '\n')
+        output.flush()
+        count += len(results)
+
+    batches = _batches(lines, batch_size)
+    if workers == 1:
+        for batch in batches:
+            write(process_batch(batch))
+        return count
+
+    from multiprocessing import Pool, cpu_count
+
+    workers = workers or cpu_count()
+    limit = max_pending or 4 * workers
+    pending: deque = deque()
+    with Pool(workers) as pool:
+        for batch in batches:
+            pending.append(pool.apply_async(process_batch, (batch,)))
+            if len(pending) >= limit:
+                write(pending.popleft().get())
+        while pending:
+            write(pending.popleft().get())
+    return count
+
+
+def _input_lines(paths: Sequence[str]) -> Iterator[str]:
+    for path in paths or ['-']:
+        if path == '-':
+            yield from sys.stdin
+        else:
+            with open(path, encoding='utf-8') as f:
+                yield from f
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m chemistrynote',
+        description="Run JSON-lines chemistry jobs (ops: " + ", ".join(HANDLERS) + ").")
+    parser.add_argument('inputs', nargs='*', help="job files ('-' or none: stdin)")
+    parser.add_argument('-o', '--output', help="result file (default: stdout)")
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help="worker processes (0: one per CPU, default 1: in-process)")
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--max-pending', type=int, help="batches in flight (default 4 per worker)")
+    args = parser.parse_args(argv)
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        run(_input_lines(args.inputs), output, workers=args.workers or None,
+            batch_size=args.batch_size, max_pending=args.max_pending)
+    except BrokenPipeError:  # downstream closed early (e.g. piped into head)
+        pass
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 0
@@ -0,0 +1,223 @@
+import numpy as np
+
+from .instrumentation import instrument
+
+# Constants
+F = 96485  # Faraday constant in C/mol
+R = 8.314  # Gas constant in J/(mol·K)
+BODY_TEMPERATURE = 310.15  # Temperature in Kelvin (37°C)
+
+# All kernels broadcast: pass e.g. valences of shape (ions, 1, 1), voltages
+# of shape (1, voltages, 1) and concentrations of shape (1, 1, n) to get an
+# (ions, voltages, n) result from one call. Temperature broadcasts too.
+
+
+def thermal_voltage(T=BODY_TEMPERATURE) -> np.ndarray:
+    """RT/F in volts."""
+    return R * np.asarray(T, dtype=float) / F
+
+
+def bernoulli(u) -> np.ndarray:
+    """Bernoulli function ``u / (exp(u) - 1)`` with its limit 1 at ``u = 0``.
+
+    ``expm1`` keeps full precision for small ``|u|``; for large ``u`` the
+    exponential overflows to inf and the result correctly underflows to 0.
+    """
+    u = np.asarray(u, dtype=float)
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        result = u / np.expm1(u)
+    return np.where(u == 0, 1.0, result)
+
+
+@instrument(items=np.size)
+def ghk_flux(P_i, z_i, V_m, C_i_out, C_i_in, T=BODY_TEMPERATURE) -> np.ndarray:
+    """
+    Ion flux from the Goldman–Hodgkin–Katz flux equation.
+
+    With u = zFV/RT the equation ``P z² F² V/RT · (C_in - C_out e^{-u}) /
+    (1 - e^{-u})`` is evaluated as ``P z F · (C_in·B(-u) - C_out·B(u))``
+    using the Bernoulli function B, which has no 0/0 at V_m = 0 (where it
+    reduces to ``P z F (C_in - C_out)``) and no overflow at large |V_m|.
+    Outward flux is positive and vanishes at the Nernst potential.
+
+    Parameters:
+    P_i (array): Permeability of the membrane to the ion
+    z_i (array): Valence of the ion
+    V_m (array): Membrane potential in volts
+    C_i_out, C_i_in (array): Concentrations outside and inside the cell
+    T (array): Temperature in Kelvin
+
+    Returns:
+    ndarray: Flux, broadcast over all inputs
+    """
+    z_i = np.asarray(z_i, dtype=float)
+    u = z_i * np.asarray(V_m, dtype=float) / thermal_voltage(T)
+    return P_i * z_i * F * (C_i_in * bernoulli(-u) - C_i_out * bernoulli(u))
+
+
+def nernst_potential(z_i, C_i_out, C_i_in, T=BODY_TEMPERATURE) -> np.ndarray:
+    """Equilibrium (reversal) potential of an ion in volts."""
+    return thermal_voltage(T) / np.asarray(z_i, dtype=float) * np.log(
+        np.asarray(C_i_out, dtype=float) / C_i_in)
+
+
+def nernst_equation(E_standard, T, n, Q) -> np.ndarray:
+    """
+    Cell potential from the Nernst equation, E° - (RT/nF) ln Q.
+
+    Parameters:
+    E_standard (array): Standard electrode potential in volts
+    T (array): Temperature in Kelvin
+    n (array): Number of moles of electrons transferred
+    Q (array): Reaction quotient
+
+    Returns:
+    ndarray: Cell potential in volts
+    """
+    return E_standard - thermal_voltage(T) / n * np.log(Q)
+
+
+def nernst_planck_flux(D_i, z_i, C_i, dC_dx, dphi_dx, T=BODY_TEMPERATURE) -> np.ndarray:
+    """
+    Ion flux from the Nernst–Planck equation, -D (dC/dx + zF/RT · C dφ/dx).
+
+    Parameters:
+    D_i (array): Diffusion coefficient of the ion
+    z_i (array): Valence of the ion
+    C_i (array): Concentration of the ion
+    dC_dx (array): Concentration gradient
+    dphi_dx (array): Electric potential gradient
+    T (array): Temperature in Kelvin
+
+    Returns:
+    ndarray: Flux, broadcast over all inputs
+    """
+    return -D_i * (dC_dx + np.asarray(z_i, dtype=float) / thermal_voltage(T) * C_i * dphi_dx)
+
+
+def _bernoulli_derivative(u) -> np.ndarray:
+    """d/du of ``bernoulli``, using ``B' = B (1 - B - u) / u`` away from zero."""
+    u = np.asarray(u, dtype=float)
+    small = np.abs(u) < 1e-2
+    b = bernoulli(u)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result = b * (1.0 - b - u) / u
+    series = -0.5 + u / 6.0 - u ** 3 / 180.0
+    return np.where(small, series, np.where(np.isfinite(result), result, 0.0))
+
+
+def _ion_arrays(P, z, C_out, C_in, axis):
+    """Broadcast per-ion inputs together and move the ion axis last."""
+    P, z, C_out, C_in = np.broadcast_arrays(*(np.asarray(a, dtype=float)
+                                               for a in (P, z, C_out, C_in)))
+    return tuple(np.moveaxis(a, axis, -1) for a in (P, z, C_out, C_in))
+
+
+def _batch_temperature(T) -> np.ndarray:
+    """Temperature shaped to broadcast against an ion axis in last position."""
+    T = np.asarray(T, dtype=float)
+    return T[..., None] if T.ndim else T
+
+
+def ghk_voltage(P, z, C_out, C_in, T=BODY_TEMPERATURE, axis=-1) -> np.ndarray:
+    """
+    Membrane potential from the GHK voltage equation.
+
+    The closed form only exists for monovalent ions:
+    V = RT/F ln((Σ P⁺ C_out + Σ P⁻ C_in) / (Σ P⁺ C_in + Σ P⁻ C_out)).
+    Use ``resting_potential`` when divalent ions are involved.
+
+    Parameters:
+    P (array): Permeabilities, ions along ``axis``
+    z (array): Valences (+1 or -1), ions along ``axis``
+    C_out, C_in (array): Concentrations, ions along ``axis``
+    T (array): Temperature in Kelvin, broadcast over the remaining axes
+    axis (int): Ion axis
+
+    Returns:
+    ndarray: Potential in volts with the ion axis removed
+    """
+    P, z, C_out, C_in = _ion_arrays(P, z, C_out, C_in, axis)
+    if np.any(np.abs(z) != 1):
+        raise ValueError("The GHK voltage equation requires monovalent ions")
+    cation = z > 0
+    numerator = np.sum(P * np.where(cation, C_out, C_in), axis=-1)
+    denominator = np.sum(P * np.where(cation, C_in, C_out), axis=-1)
+    return thermal_voltage(T) * np.log(numerator / denominator)
+
+
+def ghk_current(P, z, V_m, C_out, C_in, T=BODY_TEMPERATURE, axis=-1) -> np.ndarray:
+    """Total GHK current summed over the ion ``axis``; V_m and T broadcast over the rest."""
+    P, z, C_out, C_in = _ion_arrays(P, z, C_out, C_in, axis)
+    V_m = _batch_temperature(V_m)
+    return np.sum(ghk_flux(P, z, V_m, C_out, C_in, _batch_temperature(T)), axis=-1)
+
+
+@instrument(items=np.size)
+def resting_potential(P, z, C_out, C_in, T=BODY_TEMPERATURE, axis=-1,
+                      V0=None, tol=1e-12, max_iter=50) -> np.ndarray:
+    """
+    Solve Σ ghk_flux = 0 for the membrane potential of every cell at once.
+
+    Each ion's current increases monotonically with V_m and vanishes at its
+    Nernst potential, so the root is bracketed by the smallest and largest
+    Nernst potentials. Newton steps with the analytic derivative are taken
+    inside that bracket, falling back to bisection whenever a step leaves
+    it, so every cell converges regardless of valences or starting point.
+
+    Parameters:
+    P (array): Permeabilities, ions along ``axis``
+    z (array): Valences, ions along ``axis``
+    C_out, C_in (array): Concentrations, ions along ``axis``
+    T (array): Temperature in Kelvin, broadcast over the cells
+    axis (int): Ion axis
+    V0 (array): Optional starting potentials, e.g. the previous timestep
+    tol (float): Convergence tolerance on V_m in volts
+    max_iter (int): Maximum number of iterations
+
+    Returns:
+    ndarray: Resting potential in volts with the ion axis removed
+    """
+    P, z, C_out, C_in = _ion_arrays(P, z, C_out, C_in, axis)
+    T = _batch_temperature(T)
+    vt = thermal_voltage(T)
+    charged = (P > 0) & (z != 0)
+    if not np.all(np.any(charged, axis=-1)):
+        raise ValueError("Every cell needs at least one permeant charged ion")
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        reversal = nernst_potential(np.where(charged, z, 1.0), C_out, C_in, T)
+    reversal = np.clip(reversal, -1.0, 1.0)
+    low = np.min(np.where(charged, reversal, np.inf), axis=-1)
+    high = np.max(np.where(charged, reversal, -np.inf), axis=-1)
+
+    shape = low.shape
+    V = 0.5 * (low + high) if V0 is None else np.clip(
+        np.broadcast_to(np.asarray(V0, dtype=float), shape), low, high)
+    V, low, high = (np.array(a, dtype=float).ravel() for a in (V, low, high))
+    ions = P.shape[-1]
+    P, z, C_out, C_in, vt = (np.broadcast_to(a, shape + (ions,)).reshape(-1, ions)
+                             for a in np.broadcast_arrays(P, z, C_out, C_in, vt))
+
+    # Newton on the still-unconverged cells only; converged cells are frozen.
+    active = np.arange(V.size)
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        p, q, c_out, c_in, v_t = (a[active] for a in (P, z, C_out, C_in, vt))
+        v, lo, hi = V[active], low[active], high[active]
+        u = q * v[:, None] / v_t
+        current = np.sum(p * q * F * (c_in * bernoulli(-u) - c_out * bernoulli(u)), axis=-1)
+        slope = np.sum(-p * q * q * F / v_t * (c_in * _bernoulli_derivative(-u)
+                                                + c_out * _bernoulli_derivative(u)), axis=-1)
+        lo = np.where(current < 0, v, lo)
+        hi = np.where(current > 0, v, hi)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = v - current / slope
+        inside = (slope > 0) & (newton >= lo) & (newton <= hi)
+        v_new = np.where(inside, newton, 0.5 * (lo + hi))
+        v_new = np.where(current == 0, v, v_new)
+        V[active], low[active], high[active] = v_new, lo, hi
+        done = (np.abs(v_new - v) <= tol) | (hi - lo <= tol)
+        active = active[~done]
+    return V.reshape(shape)
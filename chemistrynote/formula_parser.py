@@ -0,0 +1,151 @@
+import re
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+# Single-pass grammar for condensed formulas:
+#   formula  := part (SEP part)*            e.g. CuSO4·5H2O
+#   part     := [multiplier] group+          e.g. 5H2O
+#   group    := Element [count] | '(' group+ ')' [count]
+#   charge   := '^' n sign | '{' n sign '}' | sign n | sign+   (trailing)
+# Digits directly before a bare sign are treated as counts ("NH4+" is NH4
+# with charge +1); write "Fe^3+", "Fe{3+}", "Fe+3" or "Fe+++" for ions.
+_TOKEN = re.compile(r'([A-Z][a-z]?)|(\d+)|([(\[])|([)\]])|([·•.*])|(\s+)')
+_SIMPLE = re.compile(r'(?:[A-Z][a-z]?\d*)+')
+_SIMPLE_TOKEN = re.compile(r'([A-Z][a-z]?)(\d*)')
+_CHARGE = re.compile(r'(?:\^(\d*)([+-])|\{(\d*)([+-])\}|([+-])(\d+)|([+-]+))$')
+
+Composition = Tuple[Tuple[str, int], ...]
+
+
+def _split_charge(formula: str) -> Tuple[str, int]:
+    """Strip a trailing charge annotation and return it as a signed integer."""
+    match = _CHARGE.search(formula)
+    if not match:
+        return formula, 0
+    caret_n, caret_sign, brace_n, brace_sign, sign, sign_n, signs = match.groups()
+    if signs:
+        charge = len(signs) if signs[0] == '+' else -len(signs)
+        if len(set(signs)) > 1:
+            raise ValueError(f"Invalid charge in formula: {formula}")
+    else:
+        digits = caret_n if caret_sign else brace_n if brace_sign else sign_n
+        s = caret_sign or brace_sign or sign
+        charge = (int(digits) if digits else 1) * (1 if s == '+' else -1)
+    return formula[:match.start()], charge
+
+
+def _parse(formula: str) -> Tuple[Composition, int]:
+    """Parse a formula into (sorted element counts, net charge) in one pass."""
+    body, charge = _split_charge(formula.strip())
+    if _SIMPLE.fullmatch(body):
+        # Fast path: flat formulas without groups or hydrates
+        totals: Dict[str, int] = {}
+        for element, count in _SIMPLE_TOKEN.findall(body):
+            totals[element] = totals.get(element, 0) + (int(count) if count else 1)
+        return tuple(sorted(totals.items())), charge
+
+    totals = {}
+    stack: List[Dict[str, int]] = [{}]
+    multiplier = 1
+    at_part_start = True
+    last_group = None
+    pos = 0
+    end = len(body)
+
+    def flush_part():
+        for element, count in stack[0].items():
+            totals[element] = totals.get(element, 0) + count * multiplier
+        stack[0] = {}
+
+    while pos < end:
+        match = _TOKEN.match(body, pos)
+        if not match:
+            raise ValueError(f"Invalid formula: {formula!r} (at position {pos})")
+        element, number, opening, closing, separator, _ = match.groups()
+        pos = match.end()
+        if element:
+            last_group = {element: 1}
+            top = stack[-1]
+            top[element] = top.get(element, 0) + 1
+            at_part_start = False
+        elif number:
+            n = int(number)
+            if at_part_start:
+                multiplier = n
+            elif last_group is None:
+                raise ValueError(f"Invalid formula: {formula!r} (stray count)")
+            else:
+                top = stack[-1]
+                for el, count in last_group.items():
+                    top[el] += count * (n - 1)
+                last_group = None
+            at_part_start = False
+        elif opening:
+            stack.append({})
+            last_group = None
+            at_part_start = False
+        elif closing:
+            if len(stack) == 1:
+                raise ValueError(f"Invalid formula: {formula!r} (unbalanced ')')")
+            group = stack.pop()
+            top = stack[-1]
+            for el, count in group.items():
+                top[el] = top.get(el, 0) + count
+            last_group = group
+        elif separator:
+            if len(stack) != 1:
+                raise ValueError(f"Invalid formula: {formula!r} (unbalanced '(')")
+            flush_part()
+            multiplier = 1
+            at_part_start = True
+            last_group = None
+    if len(stack) != 1:
+        raise ValueError(f"Invalid formula: {formula!r} (unbalanced '(')")
+    flush_part()
+    if not totals:
+        raise ValueError(f"Invalid formula: {formula!r} (no elements)")
+    return tuple(sorted(totals.items())), charge
+
+
+class FormulaParser:
+    """Compiled formula grammar backed by a bounded LRU cache of compositions."""
+
+    def __init__(self, maxsize: int = 65536):
+        self.maxsize = maxsize
+        self._cached = lru_cache(maxsize=maxsize)(_parse)
+
+    def __getstate__(self):
+        # The cache itself is not picklable; workers start with an empty one
+        return {'maxsize': self.maxsize}
+
+    def __setstate__(self, state):
+        self.__init__(state['maxsize'])
+
+    def parse(self, formula: str) -> Dict[str, int]:
+        """Parse chemical formula into element counts."""
+        return dict(self._cached(formula)[0])
+
+    def parse_with_charge(self, formula: str) -> Tuple[Dict[str, int], int]:
+        """Parse chemical formula into element counts and net charge."""
+        composition, charge = self._cached(formula)
+        return dict(composition), charge
+
+    def composition(self, formula: str) -> Composition:
+        """Return the cached, immutable (element, count) tuple for a formula."""
+        return self._cached(formula)[0]
+
+    def charge(self, formula: str) -> int:
+        """Return the net charge of a formula."""
+        return self._cached(formula)[1]
+
+    def cache_info(self):
+        """Return cache statistics (hits, misses, maxsize, currsize)."""
+        return self._cached.cache_info()
+
+    def cache_clear(self):
+        """Drop all cached compositions and reset the statistics."""
+        self._cached.cache_clear()
+
+
+# Shared parser so every analyzer in a process reuses the same cache
+default_parser = FormulaParser()
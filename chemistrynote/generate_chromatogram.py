@@ -0,0 +1,360 @@
+import numpy as np
+from dataclasses import dataclass
+from multiprocessing import Pool
+from typing import Optional, Tuple
+
+from .instrumentation import instrument
+
+# Parameters per peak, in this order along the last axis
+AREA, RETENTION, SIGMA, TAU = range(4)
+PEAK_PARAMETERS = 4
+_SQRT2 = np.sqrt(2.0)
+_SQRT_PI = np.sqrt(np.pi)
+
+
+# Simulate Chromatogram Peaks
+def generate_chromatogram():
+    """Generate a simulated chromatogram."""
+    time = np.linspace(0, 10, 1000)  # Time in minutes
+    # Gaussian peaks for compounds
+    peaks = np.array([
+        (3, 1.5, 100),  # (Retention time, width, intensity)
+        (5, 0.8, 150),
+        (7, 1.2, 200)
+    ])
+    rt, width, intensity = peaks[:, 0, None], peaks[:, 1, None], peaks[:, 2, None]
+    chromatogram = (intensity * np.exp(-((time - rt)**2) / (2 * width**2))).sum(axis=0)
+    return time, chromatogram
+
+
+# Simulate Mass Spectrum for a Compound
+def generate_mass_spectrum():
+    """Generate a simulated mass spectrum."""
+    mass_to_charge = np.array([50, 75, 100, 125, 150])  # m/z values
+    intensities = np.array([10, 40, 80, 20, 60])  # Corresponding intensities
+    return mass_to_charge, intensities
+
+
+def _emg_core(x, sigma, tau):
+    """``exp(-x²/2σ²) · erfcx(z)`` and ``z``, evaluated without overflow.
+
+    ``erfcx(z)`` grows like ``exp(z²)`` for negative ``z`` (far tail of a
+    strongly tailing peak), so there the equivalent
+    ``exp(σ²/2τ² - x/τ) · erfc(z)`` form is used, whose exponent is < 0.
+    """
+    from scipy.special import erfc, erfcx
+    z = (sigma / tau - x / sigma) / _SQRT2
+    gauss = np.exp(-0.5 * (x / sigma) ** 2)
+    with np.errstate(over='ignore', invalid='ignore'):
+        core = np.where(z >= 0, gauss * erfcx(np.maximum(z, 0)),
+                        np.exp(np.minimum(0.5 * (sigma / tau) ** 2 - x / tau, 0)) * erfc(z))
+    return core, z, gauss
+
+
+def emg(time: np.ndarray, area, retention, sigma, tau) -> np.ndarray:
+    """Exponentially modified Gaussian peak with unit-free ``area``.
+
+    Uses the scaled complementary error function so the shape stays finite
+    for any tailing and tends to a Gaussian as ``tau`` → 0. Parameters
+    broadcast against ``time``.
+    """
+    tau = np.maximum(tau, 1e-9 * np.asarray(sigma))
+    core, _, _ = _emg_core(time - retention, sigma, tau)
+    return area / (2 * tau) * core
+
+
+def _emg_jacobian(time: np.ndarray, params: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Model and analytic derivatives for (..., M, 4) parameters.
+
+    Returns:
+    tuple: values (..., M, points) and derivatives (..., M, 4, points)
+    """
+    area, retention, sigma, tau = (params[..., k, None] for k in range(PEAK_PARAMETERS))
+    tau = np.maximum(tau, 1e-9 * sigma)
+    x = time - retention
+    core, z, gauss = _emg_core(x, sigma, tau)
+    d_core = 2 * z * core - 2 / _SQRT_PI * gauss   # exp(-x²/2σ²) · d erfcx/dz
+    scale = 1 / (2 * tau)
+    value = area * scale * core
+    jacobian = np.empty(value.shape[:-1] + (PEAK_PARAMETERS,) + value.shape[-1:])
+    jacobian[..., AREA, :] = scale * core
+    jacobian[..., RETENTION, :] = area * scale * (x / sigma ** 2 * core + d_core / (_SQRT2 * sigma))
+    jacobian[..., SIGMA, :] = area * scale * (x ** 2 / sigma ** 3 * core
+                                              + d_core * (1 / tau + x / sigma ** 2) / _SQRT2)
+    jacobian[..., TAU, :] = -value / tau - area * scale * d_core * sigma / (_SQRT2 * tau ** 2)
+    return value, jacobian
+
+
+@instrument(items=len)
+def simulate_chromatograms(time: np.ndarray, params: np.ndarray, baseline: Optional[np.ndarray] = None,
+                           drift: float = 0.0, noise_level: float = 0.0,
+                           rng: Optional[np.random.Generator] = None, seed: Optional[int] = None,
+                           block_runs: int = 256) -> np.ndarray:
+    """Simulate a batch of runs made of EMG peaks on a drifting baseline.
+
+    Parameters:
+    time (ndarray): Shared time axis, shape (points,)
+    params (ndarray): Peak (area, retention, sigma, tau), shape (N, M, 4)
+        or (M, 4) for one run
+    baseline (ndarray): Per-run (offset, slope), shape (N, 2)
+    drift (float): Standard deviation of an added random slope per run
+    noise_level (float): Standard deviation of Gaussian detector noise
+    rng, seed: Generator (or seed for a new one) for drift and noise
+    block_runs (int): Runs evaluated per vectorized block
+
+    Returns:
+    ndarray: Chromatograms, shape (N, points)
+    """
+    time = np.asarray(time, dtype=float)
+    params = np.asarray(params, dtype=float)
+    if params.ndim == 2:
+        params = params[np.newaxis]
+    n_runs = len(params)
+    out = np.empty((n_runs, len(time)))
+    for start in range(0, n_runs, block_runs):
+        block = params[start:start + block_runs]
+        out[start:start + len(block)] = emg(time, *(block[..., k, None] for k in range(PEAK_PARAMETERS))).sum(axis=1)
+    if baseline is not None:
+        baseline = np.broadcast_to(np.asarray(baseline, dtype=float), (n_runs, 2))
+        out += baseline[:, :1] + baseline[:, 1:] * time
+    if drift or noise_level:
+        rng = rng if rng is not None else np.random.default_rng(seed)
+        if drift:
+            out += rng.normal(0.0, drift, (n_runs, 1)) * (time - time[0])
+        if noise_level:
+            out += rng.normal(0.0, noise_level, out.shape)
+    return out
+
+
+@dataclass
+class PeakFit:
+    """Batched deconvolution result; leading axis runs over chromatograms."""
+    params: np.ndarray       # (N, M, 4) area, retention, sigma, tau per peak
+    baseline: np.ndarray     # (N, 2) offset and slope
+    residual: np.ndarray     # (N,) root-mean-square residual
+    converged: np.ndarray    # (N,) bool
+    iterations: int
+
+    @property
+    def areas(self) -> np.ndarray:
+        """(N, M) peak areas (the EMG area parameter)."""
+        return self.params[..., AREA]
+
+    @property
+    def retention_times(self) -> np.ndarray:
+        return self.params[..., RETENTION]
+
+
+def estimate_peaks(time: np.ndarray, chromatograms: np.ndarray, n_peaks: int) -> np.ndarray:
+    """Starting (M, 4) parameters from the ``n_peaks`` most prominent peaks of the mean run."""
+    from scipy.signal import find_peaks, peak_widths
+    mean = np.atleast_2d(chromatograms).mean(axis=0)
+    indices, properties = find_peaks(mean, prominence=0)
+    indices = np.sort(indices[np.argsort(properties['prominences'])[::-1][:n_peaks]])
+    if len(indices) < n_peaks:
+        raise ValueError(f"Found {len(indices)} peaks, expected {n_peaks}")
+    step = (time[-1] - time[0]) / (len(time) - 1)
+    sigma = peak_widths(mean, indices, rel_height=0.5)[0] * step / (2 * np.sqrt(2 * np.log(2)))
+    area = mean[indices] * sigma * np.sqrt(2 * np.pi)
+    return np.column_stack([area, time[indices], sigma, 0.1 * sigma])
+
+
+@instrument(items=lambda fit: len(fit.params))
+def fit_peaks(time: np.ndarray, chromatograms: np.ndarray, initial: np.ndarray,
+              baseline: Optional[np.ndarray] = None, fit_baseline: bool = True,
+              max_iter: int = 100, tol: float = 1e-6, damping: float = 1e-3,
+              max_scale: float = 2.0) -> PeakFit:
+    """Deconvolve many chromatograms into EMG peaks with batched Levenberg–Marquardt.
+
+    Every run is an independent least-squares problem, but all runs are
+    stepped together: model values and analytic Jacobians are evaluated
+    for the whole (N, M, 4, points) batch, normal equations are formed with
+    batched matrix products and solved with one batched ``np.linalg.solve``. Each run
+    keeps its own damping and stops updating once converged.
+
+    Steps are taken in (area, mean, sigma, tau) with mean = retention +
+    tau, which decorrelates retention from tailing, and are bounded so a
+    poor start cannot run into a false minimum: sigma and tau change by at
+    most a factor of ``max_scale`` per iteration, areas shrink by at most
+    the same factor (a vanished peak has no gradient), the mean moves at
+    most one peak width and the retention time stays on the time axis.
+    Runs whose damping exceeds 1e6 without meeting ``tol`` stop as stalled
+    and are reported as not converged.
+
+    Parameters:
+    time (ndarray): Shared time axis, shape (points,)
+    chromatograms (ndarray): Intensities, shape (N, points) or (points,)
+    initial (ndarray): Starting (area, retention, sigma, tau), shape (M, 4)
+        shared by all runs or (N, M, 4) per run (e.g. a previous fit for
+        a warm start)
+    baseline (ndarray): Starting (offset, slope), shape (2,) or (N, 2)
+    fit_baseline (bool): Fit a linear baseline along with the peaks
+    """
+    time = np.asarray(time, dtype=float)
+    data = np.atleast_2d(np.asarray(chromatograms, dtype=float))
+    n_runs, points = data.shape
+    params = np.array(np.broadcast_to(initial, (n_runs,) + np.shape(initial)[-2:]), dtype=float)
+    n_peaks = params.shape[1]
+    lines = np.array(np.broadcast_to(np.zeros(2) if baseline is None else baseline, (n_runs, 2)), dtype=float)
+    n_params = n_peaks * PEAK_PARAMETERS + (2 if fit_baseline else 0)
+    baseline_design = np.stack([np.ones(points), time])          # (2, points)
+
+    def evaluate(p, b):
+        values, jac = _emg_jacobian(time, p)
+        model = values.sum(axis=1) + b @ baseline_design
+        return model, jac
+
+    model, jac = evaluate(params, lines)
+    residual = data - model
+    cost = np.einsum('np,np->n', residual, residual)
+    lam = np.full(n_runs, damping)
+    active = np.ones(n_runs, dtype=bool)
+    converged = np.zeros(n_runs, dtype=bool)
+    iteration = 0
+    for iteration in range(1, max_iter + 1):
+        idx = np.flatnonzero(active)
+        if not len(idx):
+            break
+        # Step in (area, mean, sigma, tau) with mean = retention + tau, which
+        # removes most of the retention/tau correlation of tailing peaks
+        J = jac[idx].copy()
+        J[:, :, TAU] -= J[:, :, RETENTION]
+        J = J.reshape(len(idx), n_peaks * PEAK_PARAMETERS, points)
+        if fit_baseline:
+            J = np.concatenate([J, np.broadcast_to(baseline_design, (len(idx), 2, points))], axis=1)
+        JtJ = J @ J.transpose(0, 2, 1)
+        Jtr = (J @ residual[idx][..., None])[..., 0]
+        diagonal = np.einsum('nii->ni', JtJ)
+        A = JtJ + (lam[idx, None] * np.maximum(diagonal, 1e-12))[:, :, None] * np.eye(n_params)
+        try:
+            step = np.linalg.solve(A, Jtr[..., None])[..., 0]
+        except np.linalg.LinAlgError:
+            step = np.einsum('nij,nj->ni', np.linalg.pinv(A), Jtr)
+
+        start = params[idx]
+        trial = start + step[:, :n_peaks * PEAK_PARAMETERS].reshape(len(idx), n_peaks, PEAK_PARAMETERS)
+        trial[..., AREA] = np.maximum(trial[..., AREA], start[..., AREA] / max_scale)
+        for k in (SIGMA, TAU):
+            trial[..., k] = np.clip(trial[..., k], start[..., k] / max_scale, start[..., k] * max_scale)
+        # trial[..., RETENTION] holds the new mean; move it at most one peak
+        # width and keep the retention time on the time axis
+        mean = start[..., RETENTION] + start[..., TAU]
+        reach = start[..., SIGMA] + start[..., TAU]
+        trial[..., RETENTION] = np.clip(trial[..., RETENTION] + start[..., TAU], mean - reach, mean + reach)
+        trial[..., RETENTION] = np.clip(trial[..., RETENTION] - trial[..., TAU], time[0], time[-1])
+        trial_lines = lines[idx] + step[:, n_peaks * PEAK_PARAMETERS:] if fit_baseline else lines[idx]
+        # The step actually taken, for the convergence test
+        step = (trial - start).reshape(len(idx), -1)
+        if fit_baseline:
+            step = np.concatenate([step, trial_lines - lines[idx]], axis=1)
+        trial_model, trial_jac = evaluate(trial, trial_lines)
+        trial_residual = data[idx] - trial_model
+        trial_cost = np.einsum('np,np->n', trial_residual, trial_residual)
+
+        better = trial_cost < cost[idx]
+        accepted = idx[better]
+        params[accepted] = trial[better]
+        lines[accepted] = trial_lines[better]
+        residual[accepted] = trial_residual[better]
+        jac[accepted] = trial_jac[better]
+        improvement = np.where(better, (cost[idx] - trial_cost) / np.maximum(cost[idx], 1e-300), 0.0)
+        cost[accepted] = trial_cost[better]
+        lam[idx] = np.where(better, np.maximum(lam[idx] / 3, 1e-12), lam[idx] * 10)
+        current = params[idx].reshape(len(idx), -1)
+        if fit_baseline:
+            current = np.concatenate([current, lines[idx]], axis=1)
+        small_step = np.all(np.abs(step) <= tol * (np.abs(current) + tol), axis=1)
+        finished = (better & (improvement < tol)) | small_step
+        converged[idx[finished]] = True
+        active[idx[finished | (lam[idx] > 1e6)]] = False
+    return PeakFit(params, lines, np.sqrt(cost / points), converged, iteration)
+
+
+def _fit_chunk(task) -> PeakFit:
+    time, chunk, initial, options = task
+    return fit_peaks(time, chunk, initial, **options)
+
+
+def fit_sequence(time: np.ndarray, chromatograms: np.ndarray, initial: Optional[np.ndarray] = None,
+                 n_peaks: Optional[int] = None, chunk_size: int = 256,
+                 workers: Optional[int] = 1, **options) -> PeakFit:
+    """Deconvolve a whole LC/GC sequence (thousands of runs) in chunks.
+
+    The first chunk is fitted from ``initial`` (or from peaks estimated on
+    it when only ``n_peaks`` is given); the median of its converged
+    parameters then warm-starts every remaining chunk, which are fitted
+    across ``workers`` processes (None: one per CPU, 1: in-process).
+    ``options`` are passed to :func:`fit_peaks`.
+    """
+    data = np.atleast_2d(np.asarray(chromatograms, dtype=float))
+    if initial is None:
+        if n_peaks is None:
+            raise ValueError("Provide initial parameters or n_peaks")
+        initial = estimate_peaks(time, data[:chunk_size], n_peaks)
+    first = fit_peaks(time, data[:chunk_size], initial, **options)
+    fits = [first]
+    if len(data) > chunk_size:
+        good = first.converged if first.converged.any() else np.ones(len(first.converged), dtype=bool)
+        warm = np.median(first.params[good], axis=0)
+        warm_options = dict(options, baseline=np.median(first.baseline[good], axis=0))
+        tasks = [(time, data[start:start + chunk_size], warm, warm_options)
+                 for start in range(chunk_size, len(data), chunk_size)]
+        if workers == 1:
+            fits.extend(map(_fit_chunk, tasks))
+        else:
+            with Pool(workers) as pool:
+                fits.extend(pool.imap(_fit_chunk, tasks))
+    return PeakFit(np.concatenate([f.params for f in fits]), np.concatenate([f.baseline for f in fits]),
+                   np.concatenate([f.residual for f in fits]), np.concatenate([f.converged for f in fits]),
+                   max(f.iterations for f in fits))
+
+
+def integrate_areas(time: np.ndarray, chromatograms: np.ndarray, windows: np.ndarray,
+                    baseline_correct: bool = True) -> np.ndarray:
+    """Trapezoidal peak areas between (start, end) time windows for every run.
+
+    With ``baseline_correct`` the straight line joining the signal at the
+    window edges is subtracted (drop-line integration).
+
+    Returns:
+    ndarray: Areas, shape (N, n_windows)
+    """
+    time = np.asarray(time, dtype=float)
+    data = np.atleast_2d(np.asarray(chromatograms, dtype=float))
+    windows = np.asarray(windows, dtype=float).reshape(-1, 2)
+    cumulative = np.zeros_like(data)
+    np.cumsum((data[:, 1:] + data[:, :-1]) * 0.5 * np.diff(time), axis=1, out=cumulative[:, 1:])
+    sample = np.arange(len(time))
+    edges = np.interp(windows, time, sample)                     # fractional sample positions
+    lo, hi = np.floor(edges).astype(int), np.minimum(np.floor(edges).astype(int) + 1, len(time) - 1)
+    frac = edges - lo
+
+    def at(table):
+        return table[:, lo] * (1 - frac) + table[:, hi] * frac    # (N, W, 2)
+
+    # Cumulative area is piecewise quadratic; linear interpolation between
+    # samples is exact to the same order as the trapezoid rule itself
+    area_edges = at(cumulative)
+    areas = area_edges[..., 1] - area_edges[..., 0]
+    if baseline_correct:
+        signal_edges = at(data)
+        areas -= 0.5 * (signal_edges[..., 0] + signal_edges[..., 1]) * (windows[:, 1] - windows[:, 0])
+    return areas
+
+
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
+    time, chromatogram = generate_chromatogram()
+    plt.plot(time, chromatogram)
+    plt.title("Simulated Chromatogram")
+    plt.xlabel("Time (minutes)")
+    plt.ylabel("Intensity")
+    plt.show()
+
+    mz, intensities = generate_mass_spectrum()
+    plt.bar(mz, intensities, width=5, color='blue', edgecolor='black')
+    plt.title("Simulated Mass Spectrum")
+    plt.xlabel("m/z (mass-to-charge ratio)")
+    plt.ylabel("Intensity")
+    plt.show()
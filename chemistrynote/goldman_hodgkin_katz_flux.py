@@ -0,0 +1,48 @@
+from .electrophysiology import F, R, ghk_flux as _ghk_flux, nernst_potential
+
+# Constants
+T = 310.15  # Temperature in Kelvin (37°C)
+
+def ghk_flux(P_i, z_i, V_m, C_i_out, C_i_in, T=T):
+    """
+    Calculate the ion flux using the GHK flux equation.
+
+    Earlier versions of this function swapped C_i_in and C_i_out, so the
+    flux did not vanish at the Nernst potential (the example below gave
+    -3.806 instead of +0.1417). It now uses the textbook form: outward
+    flux is positive, zero at the Nernst potential, and P z F (C_in -
+    C_out) at V_m = 0.
+    
+    Parameters:
+    P_i (float or array): Permeability of the membrane to ion i
+    z_i (int or array): Valence of ion i
+    V_m (float or array): Membrane potential in volts
+    C_i_out (float or array): Concentration of ion i outside the cell
+    C_i_in (float or array): Concentration of ion i inside the cell
+    T (float or array): Temperature in Kelvin
+
+    Returns:
+    float or ndarray: Outward flux of ion i; arrays broadcast (see electrophysiology)
+    """
+    flux = _ghk_flux(P_i, z_i, V_m, C_i_out, C_i_in, T)
+    return flux[()] if flux.ndim == 0 else flux
+
+if __name__ == "__main__":
+    # Example values
+    P_i = 1e-7  # Permeability in cm/s
+    z_i = 1  # Valence for potassium ion (K+)
+    V_m = -0.07  # Membrane potential in volts
+    C_i_out = 5  # Concentration outside the cell in mM
+    C_i_in = 140  # Concentration inside the cell in mM
+
+    # Calculate ion flux
+    flux = ghk_flux(P_i, z_i, V_m, C_i_out, C_i_in)
+    print(f"Ion flux: {flux:.4e} mol/s/cm^2")
+
+    # Sanity checks: no net flux at the reversal potential, and pure
+    # diffusion P z F (C_in - C_out) with no applied potential
+    E_rev = nernst_potential(z_i, C_i_out, C_i_in, T)
+    assert abs(ghk_flux(P_i, z_i, E_rev, C_i_out, C_i_in)) < 1e-12 * abs(flux)
+    assert abs(ghk_flux(P_i, z_i, 0.0, C_i_out, C_i_in) - P_i * z_i * F * (C_i_in - C_i_out)) \
+        <= 1e-12 * P_i * F * C_i_in
+    print(f"Zero flux at E_rev = {E_rev * 1e3:.2f} mV; V = 0 gives P z F (C_in - C_out)")
@@ -0,0 +1,207 @@
+import atexit
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, Optional
+
+# Opt-in timers and counters for the hot paths. Decorated functions only
+# check a flag while instrumentation is off; enable it with ``enable()``,
+# the ``profiled()`` context manager, or by setting CHEMISTRYNOTE_PROFILE
+# before the process starts (``1`` prints a summary to stderr at exit, any
+# other value is a path the JSON report is written to).
+ENV_VAR = 'CHEMISTRYNOTE_PROFILE'
+
+
+@dataclass
+class TimerStats:
+    calls: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    items: int = 0
+
+    @property
+    def throughput(self) -> float:
+        """Items per second over all recorded calls (0 without items)."""
+        return self.items / self.seconds if self.seconds > 0 else 0.0
+
+
+class Registry:
+    """Thread-safe store of named timers and counters."""
+
+    def __init__(self):
+        self.enabled = False
+        self._timers: Dict[str, TimerStats] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float, items: int = 0):
+        with self._lock:
+            stats = self._timers.get(name)
+            if stats is None:
+                stats = self._timers[name] = TimerStats()
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.items += items
+
+    def count(self, name: str, n: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def reset(self):
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot as plain dicts, timers sorted by total time."""
+        with self._lock:
+            timers = sorted(self._timers.items(), key=lambda item: -item[1].seconds)
+            return {'timers': {name: dict(asdict(stats), throughput=stats.throughput)
+                               for name, stats in timers},
+                    'counters': dict(self._counters)}
+
+    def format(self) -> str:
+        """Human-readable table of the current report."""
+        report = self.report()
+        lines = [f"{'timer':<48} {'calls':>8} {'total s':>10} {'max s':>10} {'items/s':>12}"]
+        for name, stats in report['timers'].items():
+            lines.append(f"{name:<48} {stats['calls']:>8} {stats['seconds']:>10.4f} "
+                         f"{stats['max_seconds']:>10.4f} {stats['throughput']:>12.4g}")
+        for name, value in report['counters'].items():
+            lines.append(f"{name:<48} {value:>8}")
+        return "\n".join(lines)
+
+
+registry = Registry()
+
+
+def enable():
+    registry.enabled = True
+
+
+def disable():
+    registry.enabled = False
+
+
+def is_enabled() -> bool:
+    return registry.enabled
+
+
+def reset():
+    registry.reset()
+
+
+def report() -> Dict[str, Dict[str, Any]]:
+    return registry.report()
+
+
+def count(name: str, n: int = 1):
+    """Increment a named counter when instrumentation is enabled."""
+    if registry.enabled:
+        registry.count(name, n)
+
+
+def instrument(name: Optional[str] = None, items: Optional[Callable[[Any], int]] = None):
+    """
+    Decorator timing every call of a function while instrumentation is on.
+
+    Generator functions are timed while they run, not while the consumer
+    holds a value: one record covers the whole iteration and counts one
+    item per yielded value unless ``items`` maps each value to a count.
+
+    Parameters:
+    name (str): Timer name, defaulting to ``module.qualname``
+    items (Callable): Maps the return value (or each yielded value) to the
+        number of items it covers (spectra, formulas, points), used for
+        throughput
+
+    Returns:
+    Callable: The decorator
+    """
+    def decorator(func):
+        label = name or f"{func.__module__}.{func.__qualname__}"
+
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                if not registry.enabled:
+                    return (yield from func(*args, **kwargs))
+                generator = func(*args, **kwargs)
+                elapsed, count = 0.0, 0
+                try:
+                    while True:
+                        start = time.perf_counter()
+                        try:
+                            value = next(generator)
+                        except StopIteration as stop:
+                            return stop.value
+                        finally:
+                            elapsed += time.perf_counter() - start
+                        count += items(value) if items is not None else 1
+                        yield value
+                finally:
+                    generator.close()
+                    registry.record(label, elapsed, count)
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            registry.record(label, time.perf_counter() - start,
+                            items(result) if items is not None else 0)
+            return result
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def timer(name: str, items: int = 0) -> Iterator[None]:
+    """Time a block under ``name`` when instrumentation is enabled."""
+    if not registry.enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.record(name, time.perf_counter() - start, items)
+
+
+@contextmanager
+def profiled(clear: bool = True) -> Iterator[Registry]:
+    """Enable instrumentation inside the block and yield the registry.
+
+    The previous enabled state is restored on exit; ``clear`` resets the
+    timers and counters on entry.
+    """
+    previous = registry.enabled
+    if clear:
+        registry.reset()
+    registry.enabled = True
+    try:
+        yield registry
+    finally:
+        registry.enabled = previous
+
+
+def _report_at_exit(target: str):
+    if target == '1':
+        print(registry.format(), file=sys.stderr)
+    else:
+        with open(target, 'w') as f:
+            json.dump(registry.report(), f, indent=2)
+
+
+if os.environ.get(ENV_VAR):
+    enable()
+    atexit.register(_report_at_exit, os.environ[ENV_VAR])
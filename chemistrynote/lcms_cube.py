@@ -0,0 +1,254 @@
+import json
+import os
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .instrumentation import instrument
+
+# Arrays persisted as <name>.npy inside the cube directory and memory-mapped
+# on load. Scans are a CSR table (scan -> centroids sorted by m/z); the
+# mz_* arrays are the same centroids re-sorted by m/z across all scans so
+# that m/z-window queries read one contiguous slice.
+_ARRAYS = (
+    'times', 'tic',                          # per scan
+    'indptr', 'mz', 'intensity',             # scan -> (m/z, intensity)
+    'mz_sorted', 'mz_scan', 'mz_intensity',  # entries ordered by m/z
+)
+_VERSION = 1
+
+Scan = Tuple[np.ndarray, np.ndarray]
+
+
+class LCMSCube:
+    """Sparse time × m/z data cube of centroided LC-MS scans.
+
+    Only nonzero centroids are stored, twice: grouped by scan (CSR) and
+    sorted by m/z with their scan index. Extracted-ion chromatograms and
+    m/z-window queries binary-search the m/z-sorted copy and touch only
+    the entries inside the window; time-range queries slice the CSR rows.
+    ``save`` writes one ``.npy`` per array; ``load`` memory-maps them, so
+    multi-GB runs are opened without being read.
+    """
+
+    def __init__(self, arrays: dict):
+        self.arrays = arrays
+
+    @classmethod
+    def from_scans(cls, times: Sequence[float], scans: Iterable[Scan]) -> 'LCMSCube':
+        """Build a cube from per-scan (m/z, intensity) centroid arrays.
+
+        Zero intensities are dropped and each scan is sorted by m/z.
+        """
+        mz_parts: List[np.ndarray] = []
+        intensity_parts: List[np.ndarray] = []
+        counts: List[int] = []
+        for mz, intensity in scans:
+            mz = np.asarray(mz, dtype=np.float64)
+            intensity = np.asarray(intensity, dtype=np.float32)
+            keep = intensity != 0
+            order = np.argsort(mz[keep], kind='stable')
+            mz_parts.append(mz[keep][order])
+            intensity_parts.append(intensity[keep][order])
+            counts.append(len(order))
+        times = np.asarray(times, dtype=np.float64)
+        if len(counts) != len(times):
+            raise ValueError(f"Got {len(counts)} scans for {len(times)} time points")
+        indptr = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        mz = np.concatenate(mz_parts) if mz_parts else np.empty(0)
+        intensity = np.concatenate(intensity_parts) if intensity_parts else np.empty(0, dtype=np.float32)
+        return cls._index(times, indptr, mz, intensity)
+
+    @classmethod
+    def _index(cls, times, indptr, mz, intensity) -> 'LCMSCube':
+        n_scans = len(times)
+        scan = np.repeat(np.arange(n_scans, dtype=np.int32), np.diff(indptr))
+        order = np.argsort(mz, kind='stable')
+        tic = np.bincount(scan, weights=intensity, minlength=n_scans)
+        return cls({'times': times, 'tic': tic, 'indptr': indptr, 'mz': mz, 'intensity': intensity,
+                    'mz_sorted': mz[order], 'mz_scan': scan[order], 'mz_intensity': intensity[order]})
+
+    # -- persistence ----------------------------------------------------------
+
+    def save(self, path: str):
+        """Write the cube to a directory of ``.npy`` arrays."""
+        os.makedirs(path, exist_ok=True)
+        for name in _ARRAYS:
+            np.save(os.path.join(path, f'{name}.npy'), self.arrays[name])
+        meta = {'version': _VERSION, 'scans': self.n_scans, 'entries': self.nnz}
+        with open(os.path.join(path, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, path: str, mmap_mode: Optional[str] = 'r') -> 'LCMSCube':
+        """Open a saved cube; arrays are memory-mapped by default."""
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        if meta.get('version') != _VERSION:
+            raise ValueError(f"Unsupported LC-MS cube version: {meta.get('version')}")
+        return cls({name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mmap_mode)
+                    for name in _ARRAYS})
+
+    # -- queries --------------------------------------------------------------
+
+    @property
+    def n_scans(self) -> int:
+        return len(self.arrays['times'])
+
+    @property
+    def nnz(self) -> int:
+        return len(self.arrays['mz'])
+
+    @property
+    def times(self) -> np.ndarray:
+        return self.arrays['times']
+
+    def _scan_range(self, t_start: Optional[float], t_end: Optional[float]) -> Tuple[int, int]:
+        times = self.arrays['times']
+        first = 0 if t_start is None else int(np.searchsorted(times, t_start))
+        last = len(times) if t_end is None else int(np.searchsorted(times, t_end, side='right'))
+        return first, last
+
+    def _mz_range(self, mz_low: float, mz_high: float) -> Tuple[int, int]:
+        mz_sorted = self.arrays['mz_sorted']
+        return (int(np.searchsorted(mz_sorted, mz_low)),
+                int(np.searchsorted(mz_sorted, mz_high, side='right')))
+
+    def tic(self, t_start: Optional[float] = None, t_end: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Total-ion current: (times, summed intensity per scan)."""
+        first, last = self._scan_range(t_start, t_end)
+        return self.arrays['times'][first:last], self.arrays['tic'][first:last]
+
+    def spectrum(self, scan: int) -> Scan:
+        """Centroids of one scan as (m/z, intensity) views."""
+        indptr = self.arrays['indptr']
+        start, stop = indptr[scan], indptr[scan + 1]
+        return self.arrays['mz'][start:stop], self.arrays['intensity'][start:stop]
+
+    def spectrum_at(self, time: float) -> Scan:
+        """Centroids of the scan closest to ``time``."""
+        times = self.arrays['times']
+        if len(times) < 2:
+            if not len(times):
+                raise ValueError("Cube has no scans")
+            return self.spectrum(0)
+        scan = int(np.clip(np.searchsorted(times, time), 1, len(times) - 1))
+        scan -= abs(times[scan - 1] - time) <= abs(times[scan] - time)
+        return self.spectrum(scan)
+
+    @instrument()
+    def xic(self, mz: Union[float, Sequence[float]], tolerance: float = 0.01,
+            ppm: Optional[float] = None, t_start: Optional[float] = None,
+            t_end: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Extracted-ion chromatograms for one or more target m/z values.
+
+        Each target sums the intensity within ``±tolerance`` Da (or ``±ppm``)
+        per scan, touching only the entries inside that window.
+
+        Returns:
+        tuple: (times, intensities) with intensities of shape (n_scans,)
+            for a scalar target or (n_targets, n_scans)
+        """
+        targets = np.atleast_1d(np.asarray(mz, dtype=float))
+        first, last = self._scan_range(t_start, t_end)
+        out = np.zeros((len(targets), last - first))
+        for k, target in enumerate(targets.tolist()):
+            half = target * ppm * 1e-6 if ppm is not None else tolerance
+            scans, _, intensity = self._mz_window(target - half, target + half, first, last)
+            out[k] = np.bincount(scans - first, weights=intensity, minlength=last - first)
+        times = self.arrays['times'][first:last]
+        return times, out[0] if np.ndim(mz) == 0 else out
+
+    def _mz_window(self, mz_low: float, mz_high: float, first: int, last: int
+                   ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        lo, hi = self._mz_range(mz_low, mz_high)
+        scans = np.asarray(self.arrays['mz_scan'][lo:hi])
+        mz = np.asarray(self.arrays['mz_sorted'][lo:hi])
+        intensity = np.asarray(self.arrays['mz_intensity'][lo:hi])
+        if first > 0 or last < self.n_scans:
+            keep = (scans >= first) & (scans < last)
+            scans, mz, intensity = scans[keep], mz[keep], intensity[keep]
+        return scans, mz, intensity
+
+    def window(self, mz_low: float, mz_high: float, t_start: Optional[float] = None,
+               t_end: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Every centroid inside an m/z × time box as (scan, m/z, intensity).
+
+        Reads whichever of the m/z-sorted slice or the scan rows holds
+        fewer entries, so narrow boxes in either dimension stay cheap.
+        Results are ordered by scan, then m/z.
+        """
+        first, last = self._scan_range(t_start, t_end)
+        lo, hi = self._mz_range(mz_low, mz_high)
+        indptr = self.arrays['indptr']
+        if hi - lo <= indptr[last] - indptr[first]:
+            scans, mz, intensity = self._mz_window(mz_low, mz_high, first, last)
+            order = np.lexsort((mz, scans))
+            return scans[order], mz[order], intensity[order]
+        start, stop = indptr[first], indptr[last]
+        mz = np.asarray(self.arrays['mz'][start:stop])
+        intensity = np.asarray(self.arrays['intensity'][start:stop])
+        scans = np.repeat(np.arange(first, last, dtype=np.int32), np.diff(indptr[first:last + 1]))
+        keep = (mz >= mz_low) & (mz <= mz_high)
+        return scans[keep], mz[keep], intensity[keep]
+
+    def summed_spectrum(self, t_start: Optional[float] = None, t_end: Optional[float] = None,
+                        bin_width: float = 0.01) -> Scan:
+        """Spectrum summed over a time range, merged into ``bin_width`` bins."""
+        first, last = self._scan_range(t_start, t_end)
+        indptr = self.arrays['indptr']
+        mz = np.asarray(self.arrays['mz'][indptr[first]:indptr[last]])
+        intensity = np.asarray(self.arrays['intensity'][indptr[first]:indptr[last]], dtype=float)
+        keys, inverse = np.unique(np.round(mz / bin_width).astype(np.int64), return_inverse=True)
+        total = np.bincount(inverse, weights=intensity, minlength=len(keys))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            centers = np.bincount(inverse, weights=mz * intensity, minlength=len(keys)) / total
+        return centers, total
+
+
+def simulate_lcms(time: np.ndarray, elution: np.ndarray, spectra: Sequence[Scan],
+                  threshold: float = 1e-3, noise_peaks: int = 0,
+                  mz_range: Tuple[float, float] = (50.0, 1000.0), noise_level: float = 0.0,
+                  rng: Optional[np.random.Generator] = None, seed: Optional[int] = None) -> LCMSCube:
+    """Simulate a centroided LC-MS run as a sparse cube.
+
+    Parameters:
+    time (ndarray): Scan times, shape (n_scans,)
+    elution (ndarray): EMG (area, retention, sigma, tau) per compound, shape (M, 4)
+    spectra (list): (m/z, relative abundance) per compound, e.g. isotope patterns
+    threshold (float): Elution intensities below this fraction of each
+        compound's apex are not emitted, which keeps the cube sparse
+    noise_peaks (int): Random chemical-noise centroids added per scan
+    mz_range (tuple): m/z range of the noise centroids
+    noise_level (float): Intensity scale of the noise centroids
+    """
+    from .generate_chromatogram import PEAK_PARAMETERS, emg
+    time = np.asarray(time, dtype=float)
+    elution = np.asarray(elution, dtype=float).reshape(-1, PEAK_PARAMETERS)
+    profiles = emg(time, *(elution[:, k, None] for k in range(PEAK_PARAMETERS)))   # (M, scans)
+    emitted = (profiles >= threshold * profiles.max(axis=1, keepdims=True)) & (profiles > 0)
+    scan_of, compound_of = np.nonzero(emitted.T)
+
+    # Each (scan, compound) pair contributes every peak of that compound's spectrum
+    lengths = np.array([len(mz) for mz, _ in spectra])[compound_of]
+    spectrum_mz = np.concatenate([np.asarray(mz, dtype=float) for mz, _ in spectra])
+    spectrum_ab = np.concatenate([np.asarray(ab, dtype=float) for _, ab in spectra])
+    spectrum_start = np.concatenate([[0], np.cumsum([len(mz) for mz, _ in spectra])[:-1]])
+    within = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    entry = np.repeat(spectrum_start[compound_of], lengths) + within
+    scans = np.repeat(scan_of, lengths)
+    mz = spectrum_mz[entry]
+    intensity = spectrum_ab[entry] * np.repeat(profiles[compound_of, scan_of], lengths)
+
+    if noise_peaks:
+        rng = rng if rng is not None else np.random.default_rng(seed)
+        noise_scans = np.repeat(np.arange(len(time)), noise_peaks)
+        scans = np.concatenate([scans, noise_scans])
+        mz = np.concatenate([mz, rng.uniform(*mz_range, len(noise_scans))])
+        intensity = np.concatenate([intensity, rng.exponential(noise_level or 1.0, len(noise_scans))])
+
+    order = np.lexsort((mz, scans))
+    indptr = np.zeros(len(time) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(scans, minlength=len(time)), out=indptr[1:])
+    return LCMSCube._index(time, indptr, mz[order], intensity[order].astype(np.float32))
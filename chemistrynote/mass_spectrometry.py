@@ -0,0 +1,254 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .formula_parser import FormulaParser, default_parser
+
+ELECTRON_MASS = 0.00054857990946
+PROTON_MASS = 1.007276466812
+
+# Stable isotopes: (exact mass in Da, natural abundance), IUPAC 2009
+ISOTOPES: Dict[str, Tuple[Tuple[float, float], ...]] = {
+    "H": ((1.00782503207, 0.999885), (2.0141017778, 0.000115)),
+    "Li": ((6.015122795, 0.0759), (7.01600455, 0.9241)),
+    "B": ((10.0129370, 0.199), (11.0093054, 0.801)),
+    "C": ((12.0, 0.9893), (13.0033548378, 0.0107)),
+    "N": ((14.0030740048, 0.99636), (15.0001088982, 0.00364)),
+    "O": ((15.99491461956, 0.99757), (16.99913170, 0.00038), (17.9991610, 0.00205)),
+    "F": ((18.99840322, 1.0),),
+    "Na": ((22.9897692809, 1.0),),
+    "Mg": ((23.985041700, 0.7899), (24.98583692, 0.1000), (25.982592929, 0.1101)),
+    "Al": ((26.98153863, 1.0),),
+    "Si": ((27.9769265325, 0.92223), (28.976494700, 0.04685), (29.97377017, 0.03092)),
+    "P": ((30.97376163, 1.0),),
+    "S": ((31.97207100, 0.9499), (32.97145876, 0.0075), (33.96786690, 0.0425), (35.96708076, 0.0001)),
+    "Cl": ((34.96885268, 0.7576), (36.96590259, 0.2424)),
+    "K": ((38.96370668, 0.932581), (39.96399848, 0.000117), (40.96182576, 0.067302)),
+    "Ca": ((39.96259098, 0.96941), (41.95861801, 0.00647), (42.9587666, 0.00135),
+           (43.9554818, 0.02086), (45.9536926, 0.00004), (47.952534, 0.00187)),
+    "Fe": ((53.9396105, 0.05845), (55.9349375, 0.91754), (56.9353940, 0.02119), (57.9332756, 0.00282)),
+    "Cu": ((62.9295975, 0.6915), (64.9277895, 0.3085)),
+    "Zn": ((63.9291422, 0.48268), (65.9260334, 0.27975), (66.9271273, 0.04102),
+           (67.9248442, 0.19024), (69.9253193, 0.00631)),
+    "Se": ((73.9224764, 0.0089), (75.9192136, 0.0937), (76.9199140, 0.0763),
+           (77.9173091, 0.2377), (79.9165213, 0.4961), (81.9166994, 0.0873)),
+    "Br": ((78.9183371, 0.5069), (80.9162906, 0.4931)),
+    "I": ((126.904473, 1.0),),
+}
+
+Distribution = Tuple[np.ndarray, np.ndarray]  # (masses, probabilities)
+
+
+@dataclass
+class IsotopePattern:
+    """Isotopic distribution of one ion, most abundant peak = 1."""
+    formula: str
+    charge: int
+    mz: np.ndarray
+    abundance: np.ndarray
+
+    @property
+    def monoisotopic_mz(self) -> float:
+        """m/z of the lightest peak kept after pruning."""
+        return float(self.mz[0])
+
+    @property
+    def base_peak_mz(self) -> float:
+        return float(self.mz[np.argmax(self.abundance)])
+
+    @property
+    def average_mz(self) -> float:
+        return float(np.average(self.mz, weights=self.abundance))
+
+
+class IsotopePatternEngine:
+    """Isotope patterns by aggregated convolution with pruning.
+
+    Each element's distribution for ``n`` atoms is built by binary
+    exponentiation: cached powers ``2^k`` are convolved together, so
+    C₂₀₀₀ costs about 11 convolutions, and they are shared by every formula
+    in a batch. After each convolution, peaks closer than ``resolution`` Da
+    are merged at their abundance-weighted mass. Peaks below ``threshold``
+    of the largest are dropped, which keeps the support small even for
+    proteins. ``resolution=1.0`` gives the nominal-mass (aggregated)
+    pattern; a small value keeps the fine structure.
+    """
+
+    def __init__(self, resolution: float = 0.01, threshold: float = 1e-6,
+                 parser: Optional[FormulaParser] = None, maxsize: int = 4096):
+        self.resolution = resolution
+        self.threshold = threshold
+        self.parser = parser if parser is not None else default_parser
+        self._powers: Dict[Tuple[str, int], Distribution] = {}
+        self._cached = lru_cache(maxsize=maxsize)(self._pattern)
+        self.element = lru_cache(maxsize=maxsize)(self.element)
+
+    def _prune(self, masses: np.ndarray, probabilities: np.ndarray) -> Distribution:
+        keep = probabilities >= self.threshold * probabilities.max()
+        masses, probabilities = masses[keep], probabilities[keep]
+        keys = np.round(masses / self.resolution).astype(np.int64)
+        unique, inverse = np.unique(keys, return_inverse=True)
+        if len(unique) == len(keys):
+            order = np.argsort(masses)
+            return masses[order], probabilities[order]
+        merged = np.bincount(inverse, weights=probabilities)
+        return np.bincount(inverse, weights=masses * probabilities) / merged, merged
+
+    def convolve(self, a: Distribution, b: Distribution) -> Distribution:
+        """Distribution of the sum of two independent fragments."""
+        masses = np.add.outer(a[0], b[0]).ravel()
+        probabilities = np.multiply.outer(a[1], b[1]).ravel()
+        return self._prune(masses, probabilities)
+
+    def _power_of_two(self, symbol: str, k: int) -> Distribution:
+        key = (symbol, k)
+        distribution = self._powers.get(key)
+        if distribution is None:
+            if k == 0:
+                try:
+                    isotopes = np.array(ISOTOPES[symbol])
+                except KeyError:
+                    raise ValueError(f"No isotope data for element: {symbol}") from None
+                distribution = (isotopes[:, 0], isotopes[:, 1])
+            else:
+                half = self._power_of_two(symbol, k - 1)
+                distribution = self.convolve(half, half)
+            self._powers[key] = distribution
+        return distribution
+
+    def element(self, symbol: str, count: int) -> Distribution:
+        """Distribution of ``count`` atoms of one element."""
+        result: Optional[Distribution] = None
+        k = 0
+        while count:
+            if count & 1:
+                power = self._power_of_two(symbol, k)
+                result = power if result is None else self.convolve(result, power)
+            count >>= 1
+            k += 1
+        return result if result is not None else (np.zeros(1), np.ones(1))
+
+    def pattern(self, formula: str, charge: int = 0) -> IsotopePattern:
+        """Isotope pattern of a formula, served from an LRU cache.
+
+        A non-zero ``charge`` adds that many protons ([M+zH]^z+); otherwise
+        the formula's own charge (e.g. ``SO4^2-``) is applied as electrons.
+        Neutral formulas give masses rather than m/z.
+        """
+        return self._cached(formula, charge)
+
+    def _pattern(self, formula: str, charge: int) -> IsotopePattern:
+        composition, formula_charge = self.parser.parse_with_charge(formula)
+        masses, probabilities = np.zeros(1), np.ones(1)
+        for symbol, count in sorted(composition.items(), key=lambda item: -item[1]):
+            masses, probabilities = self.convolve((masses, probabilities), self.element(symbol, count))
+        z = charge or formula_charge
+        if charge:
+            masses = masses + charge * PROTON_MASS
+        elif formula_charge:
+            masses = masses - formula_charge * ELECTRON_MASS
+        mz = masses / abs(z) if z else masses
+        mz.setflags(write=False)
+        abundance = probabilities / probabilities.max()
+        abundance.setflags(write=False)
+        return IsotopePattern(formula, z, mz, abundance)
+
+    def patterns(self, formulas: Iterable[str], charge: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Patterns for many formulas packed as CSR arrays.
+
+        Returns:
+        tuple: (indptr, mz, abundance); formula ``i`` owns
+            ``mz[indptr[i]:indptr[i + 1]]``
+        """
+        results = [self.pattern(formula, charge) for formula in formulas]
+        indptr = np.zeros(len(results) + 1, dtype=np.int64)
+        np.cumsum([len(p.mz) for p in results], out=indptr[1:])
+        if not results:
+            return indptr, np.empty(0), np.empty(0)
+        return (indptr, np.concatenate([p.mz for p in results]),
+                np.concatenate([p.abundance for p in results]))
+
+
+def centroid(mz: np.ndarray, spectra: np.ndarray, height: float = 0.01,
+             distance: int = 1):
+    """Centroid profile-mode spectra.
+
+    Apexes come from :func:`find_peaks_batch` and are refined by fitting a
+    Gaussian through the apex and its two neighbours (a parabola in log
+    intensity).
+
+    Returns:
+    PeakCharacteristics: with ``position`` and ``height`` replaced by the
+        interpolated centroid m/z and apex intensity
+    """
+    from .peak_characterization import characterize_peaks, find_peaks_batch
+    mz = np.asarray(mz, dtype=float)
+    spectra = np.atleast_2d(np.asarray(spectra, dtype=float))
+    rows, indices = find_peaks_batch(spectra, height=height, distance=distance)
+    stats = characterize_peaks(mz, spectra, rows, indices)
+    inner = (indices > 0) & (indices < spectra.shape[1] - 1)
+    i = np.where(inner, indices, 1 if spectra.shape[1] > 2 else 0)
+    tiny = np.finfo(float).tiny
+    with np.errstate(divide='ignore', invalid='ignore'):
+        a = np.log(np.maximum(spectra[rows, i - 1], tiny))
+        b = np.log(np.maximum(spectra[rows, i], tiny))
+        c = np.log(np.maximum(spectra[rows, np.minimum(i + 1, spectra.shape[1] - 1)], tiny))
+        curvature = a - 2 * b + c
+        delta = np.where(inner & (curvature < 0), 0.5 * (a - c) / curvature, 0.0)
+    delta = np.clip(delta, -0.5, 0.5)
+    step = np.where(delta >= 0, mz[np.minimum(i + 1, len(mz) - 1)] - mz[i], mz[i] - mz[i - 1])
+    stats.position = mz[indices] + np.where(inner, delta * step, 0.0)
+    stats.height = np.where(inner, np.exp(b - 0.25 * (a - c) * delta), stats.height)
+    return stats
+
+
+class MassReference:
+    """Sorted theoretical m/z table for matching observed centroids.
+
+    Every kept isotope peak of every candidate formula is one entry,
+    labelled ``formula`` for the monoisotopic peak and ``formula M+n``
+    for heavier isotopologues (n = nominal mass offset).
+    """
+
+    def __init__(self, formulas: Sequence[str], charge: int = 1,
+                 engine: Optional[IsotopePatternEngine] = None, min_abundance: float = 0.001):
+        self.engine = engine if engine is not None else IsotopePatternEngine()
+        self.formulas = tuple(formulas)
+        labels: List[str] = []
+        mz_parts, abundance_parts, code_parts = [], [], []
+        for formula in self.formulas:
+            pattern = self.engine.pattern(formula, charge)
+            keep = pattern.abundance >= min_abundance
+            mz, abundance = pattern.mz[keep], pattern.abundance[keep]
+            z = abs(pattern.charge) or 1
+            offsets = np.rint((mz - pattern.mz[0]) * z).astype(int)
+            for offset in offsets.tolist():
+                labels.append(formula if offset == 0 else f"{formula} M+{offset}")
+            code_parts.append(np.arange(len(labels) - len(mz), len(labels)))
+            mz_parts.append(mz)
+            abundance_parts.append(abundance)
+        mz = np.concatenate(mz_parts) if mz_parts else np.empty(0)
+        order = np.argsort(mz, kind='stable')
+        self.mz = mz[order]
+        self.abundance = (np.concatenate(abundance_parts) if abundance_parts else np.empty(0))[order]
+        self.codes = (np.concatenate(code_parts) if code_parts else np.empty(0, dtype=np.intp))[order]
+        self.labels = tuple(labels)
+
+    def match(self, observed: np.ndarray, tolerance_ppm: float = 20.0) -> Tuple[np.ndarray, np.ndarray]:
+        """Nearest reference within tolerance for each observed m/z.
+
+        Returns:
+        tuple: (label code or -1, error in ppm or NaN)
+        """
+        observed = np.asarray(observed, dtype=float)
+        if not len(self.mz):
+            return np.full(observed.shape, -1, dtype=np.intp), np.full(observed.shape, np.nan)
+        index = np.searchsorted(self.mz, observed)
+        left = np.clip(index - 1, 0, len(self.mz) - 1)
+        right = np.clip(index, 0, len(self.mz) - 1)
+        nearest = np.where(np.abs(self.mz[left] - observed) <= np.abs(self.mz[right] - observed), left, right)
+        error = (observed - self.mz[nearest]) / self.mz[nearest] * 1e6
+        hit = np.abs(error) <= tolerance_ppm
+        return np.where(hit, self.codes[nearest], -1), np.where(hit, error, np.nan)
@@ -0,0 +1,497 @@
+import numpy as np
+from typing import Dict, Iterator, List, Tuple, Optional, Union
+from enum import Enum
+from . import rendering
+from .assignment_index import IntervalIndex
+from .instrumentation import instrument
+from .mass_spectrometry import IsotopePattern, IsotopePatternEngine, MassReference, centroid
+from .peak_characterization import PeakCharacteristics, characterize_peaks, find_peaks_batch
+from .peak_table import PeakTable, SpectralPeak
+from .spectral_library import SpectralLibrary
+from .spectrum_synthesis import SpectrumSynthesizer, cached_grid
+
+class SpectroscopyType(Enum):
+    IR = "Infrared"
+    RAMAN = "Raman"
+    UV_VIS = "UV-Visible"
+    NMR = "Nuclear Magnetic Resonance"
+    MASS = "Mass Spectrometry"
+
+# Axis grid (start, stop, points) and peak width divisor per spectrum type;
+# peaks are Gaussians with σ = half the reference range / divisor
+SPECTRUM_GRIDS = {
+    SpectroscopyType.IR: ((500, 4000, 3500), 1),
+    SpectroscopyType.RAMAN: ((100, 3500, 3400), 2),
+    SpectroscopyType.UV_VIS: ((150, 400, 2500), 1),
+    SpectroscopyType.NMR: ((0, 10, 1000), 5),
+}
+
+class _ReferenceTable(dict):
+    """Reference dict that drops its cached interval index when edited in place."""
+
+    def __init__(self, table, indices: Dict, spec_type: 'SpectroscopyType'):
+        super().__init__(table)
+        self._indices, self._spec_type = indices, spec_type
+
+    def _invalidate(self):
+        # Unpickling fills items before instance attributes are restored
+        indices = getattr(self, '_indices', None)
+        if indices is not None:
+            indices.pop(self._spec_type, None)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._invalidate()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._invalidate()
+
+    def __ior__(self, other):
+        result = super().__ior__(other)
+        self._invalidate()
+        return result
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._invalidate()
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._invalidate()
+        return value
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._invalidate()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._invalidate()
+        return item
+
+    def clear(self):
+        super().clear()
+        self._invalidate()
+
+
+class MolecularSpectroscopyAnalyzer:
+    def __init__(self):
+        self.synthesizer = SpectrumSynthesizer()
+        self._tables: Dict[SpectroscopyType, Dict[str, Tuple[float, float]]] = {}
+        self._indices: Dict[SpectroscopyType, IntervalIndex] = {}
+        self.isotopes = IsotopePatternEngine()
+        self._mass_reference: Optional[MassReference] = None
+
+        # Common functional groups and their IR frequencies (cm⁻¹)
+        self.ir_functional_groups = {
+            "O-H stretch": (3200, 3600),
+            "N-H stretch": (3300, 3500),
+            "C-H stretch": (2850, 3000),
+            "C=O stretch": (1670, 1780),
+            "C=C stretch": (1620, 1680),
+            "C≡N stretch": (2200, 2260),
+            "NO₂ stretch": (1500, 1570)
+        }
+
+        # Raman bands (cm⁻¹)
+        self.raman_bands = {
+            "S-S stretch": (430, 550),
+            "C-S stretch": (600, 750),
+            "Ring breathing": (990, 1010),
+            "C=C stretch": (1600, 1680),
+            "C=O stretch": (1650, 1750),
+            "C≡C stretch": (2100, 2260),
+            "C-H stretch": (2800, 3100)
+        }
+
+        # UV-Vis chromophore data (nm)
+        self.uv_chromophores = {
+            "C=C": (170, 190),
+            "C=O": (270, 290),
+            "C=N": (230, 250),
+            "C≡C": (170, 180),
+            "Benzene": (230, 270)
+        }
+
+        # NMR chemical shift ranges (ppm)
+        self.nmr_shifts = {
+            "CH3": (0.7, 1.3),
+            "CH2": (1.2, 1.4),
+            "CH": (1.4, 1.7),
+            "OH": (1.5, 5.5),
+            "Aromatic": (6.5, 8.5)
+        }
+
+    def generate_ir_spectrum(self, functional_groups: List[str], 
+                           noise_level: float = 0.02) -> Tuple[np.ndarray, np.ndarray]:
+        """Generate IR spectrum for given functional groups."""
+        wavenumbers = self.grid(SpectroscopyType.IR)
+        centers, widths = self._components(SpectroscopyType.IR, [functional_groups])
+        spectrum = self.synthesizer.synthesize(wavenumbers, centers, widths, dtype=np.float64)[0]
+
+        # Add noise
+        noise = np.random.normal(0, noise_level, size=wavenumbers.shape)
+        spectrum += noise
+        return wavenumbers, spectrum
+
+    def analyze_ir_spectrum(self, wavenumbers: np.ndarray, 
+                          spectrum: np.ndarray) -> PeakTable:
+        """Analyze IR spectrum to identify functional groups."""
+        return self._analyze_spectrum(wavenumbers, spectrum, SpectroscopyType.IR)
+
+    def generate_raman_spectrum(self, bands: List[str],
+                                noise_level: float = 0.02) -> Tuple[np.ndarray, np.ndarray]:
+        """Generate Raman spectrum for given vibrational bands."""
+        shifts = self.grid(SpectroscopyType.RAMAN)
+        centers, widths = self._components(SpectroscopyType.RAMAN, [bands])
+        spectrum = self.synthesizer.synthesize(shifts, centers, widths, dtype=np.float64)[0]
+
+        noise = np.random.normal(0, noise_level, size=shifts.shape)
+        spectrum += noise
+        return shifts, spectrum
+
+    def analyze_raman_spectrum(self, shifts: np.ndarray,
+                               spectrum: np.ndarray) -> PeakTable:
+        """Analyze Raman spectrum to identify vibrational bands."""
+        return self._analyze_spectrum(shifts, spectrum, SpectroscopyType.RAMAN)
+
+    def generate_uv_vis_spectrum(self, chromophores: List[str], 
+                               noise_level: float = 0.02) -> Tuple[np.ndarray, np.ndarray]:
+        """Generate UV-Vis spectrum for given chromophores."""
+        wavelengths = self.grid(SpectroscopyType.UV_VIS)
+        centers, widths = self._components(SpectroscopyType.UV_VIS, [chromophores])
+        spectrum = self.synthesizer.synthesize(wavelengths, centers, widths, dtype=np.float64)[0]
+
+        noise = np.random.normal(0, noise_level, size=wavelengths.shape)
+        spectrum += noise
+        return wavelengths, spectrum
+
+    def analyze_uv_vis_spectrum(self, wavelengths: np.ndarray, 
+                              spectrum: np.ndarray) -> PeakTable:
+        """Analyze UV-Vis spectrum to identify chromophores."""
+        return self._analyze_spectrum(wavelengths, spectrum, SpectroscopyType.UV_VIS)
+
+    def generate_nmr_spectrum(self, proton_environments: List[str], 
+                            noise_level: float = 0.02) -> Tuple[np.ndarray, np.ndarray]:
+        """Generate NMR spectrum for given proton environments."""
+        chemical_shifts = self.grid(SpectroscopyType.NMR)
+        centers, widths = self._components(SpectroscopyType.NMR, [proton_environments])
+        spectrum = self.synthesizer.synthesize(chemical_shifts, centers, widths, dtype=np.float64)[0]
+
+        noise = np.random.normal(0, noise_level, size=chemical_shifts.shape)
+        spectrum += noise
+        return chemical_shifts, spectrum
+
+    def analyze_nmr_spectrum(self, chemical_shifts: np.ndarray, 
+                           spectrum: np.ndarray) -> PeakTable:
+        """Analyze NMR spectrum to identify proton environments."""
+        return self._analyze_spectrum(chemical_shifts, spectrum, SpectroscopyType.NMR)
+
+    def generate_mass_spectrum(self, formulas: List[str], charge: int = 1,
+                               resolving_power: float = 20000, noise_level: float = 0.0,
+                               amplitudes: Optional[List[float]] = None,
+                               points_per_fwhm: int = 8) -> Tuple[np.ndarray, np.ndarray]:
+        """Generate a profile-mode mass spectrum of a mixture of formulas.
+
+        Each isotope peak is a Gaussian whose FWHM is m/z / resolving_power;
+        the m/z axis spans all patterns with ``points_per_fwhm`` samples per
+        FWHM at the lowest m/z.
+        """
+        patterns = [self.isotopes.pattern(formula, charge) for formula in formulas]
+        scale = np.ones(len(patterns)) if amplitudes is None else np.asarray(amplitudes, dtype=float)
+        centers = np.concatenate([p.mz for p in patterns])
+        heights = np.concatenate([p.abundance * a for p, a in zip(patterns, scale)])
+        sigmas = centers / resolving_power / (2 * np.sqrt(2 * np.log(2)))
+        start, stop = centers.min() - 2.0, centers.max() + 2.0
+        step = sigmas.min() * 2 * np.sqrt(2 * np.log(2)) / points_per_fwhm
+        mz = cached_grid(float(start), float(stop), int((stop - start) / step) + 1)
+        spectrum = self.synthesizer.synthesize(mz, centers[np.newaxis], sigmas[np.newaxis],
+                                               heights[np.newaxis], dtype=np.float64)[0]
+        spectrum /= spectrum.max()
+        if noise_level:
+            spectrum += np.random.normal(0, noise_level, size=mz.shape)
+        return mz, spectrum
+
+    def analyze_mass_spectrum(self, mz: np.ndarray, spectrum: np.ndarray,
+                              candidates: Optional[List[str]] = None, charge: int = 1,
+                              tolerance_ppm: float = 20.0, height: float = 0.01) -> PeakTable:
+        """Centroid a profile mass spectrum and match peaks to candidate formulas.
+
+        Peaks are assigned ``formula`` (monoisotopic) or ``formula M+n``
+        when within ``tolerance_ppm`` of a theoretical isotope peak;
+        without ``candidates`` the set from set_mass_candidates is used.
+        """
+        reference = self._mass_reference if candidates is None else MassReference(
+            candidates, charge, self.isotopes)
+        return self._analyze_mass(mz, spectrum, reference, tolerance_ppm, height)
+
+    def set_mass_candidates(self, formulas: List[str], charge: int = 1):
+        """Formulas used to assign mass spectra by default (and by streaming)."""
+        self._mass_reference = MassReference(formulas, charge, self.isotopes)
+
+    def isotope_patterns(self, formulas: List[str], charge: int = 0) -> List[IsotopePattern]:
+        """Isotope patterns for many formulas; element powers are shared."""
+        return [self.isotopes.pattern(formula, charge) for formula in formulas]
+
+    def _analyze_mass(self, mz: np.ndarray, spectra: np.ndarray,
+                      reference: Optional[MassReference], tolerance_ppm: float = 20.0,
+                      height: float = 0.01, distance: int = 1,
+                      sources: Optional[List[str]] = None) -> PeakTable:
+        stats = centroid(mz, spectra, height, distance)
+        if reference is None:
+            labels: Tuple[str, ...] = ()
+            codes = np.full(len(stats), -1)
+        else:
+            labels = reference.labels
+            codes, _ = reference.match(stats.position, tolerance_ppm)
+        return PeakTable.from_arrays(stats.row, stats.position, stats.height, stats.fwhm,
+                                     codes % (len(labels) + 1), labels + ("Unknown",), sources)
+
+    @instrument(items=lambda result: len(result[1]))
+    def generate_spectra(self, spec_type: SpectroscopyType, samples: List[List[str]],
+                         noise_level: float = 0.02, amplitudes: Optional[np.ndarray] = None,
+                         rng: Optional[np.random.Generator] = None, seed: Optional[int] = None,
+                         out: Optional[np.ndarray] = None,
+                         dtype=np.float32) -> Tuple[np.ndarray, np.ndarray]:
+        """Generate a batch of spectra, one row per list of components.
+
+        ``amplitudes`` optionally scales each component, shape (N, M) with M
+        the longest component list. Noise comes from ``rng`` (or a generator
+        seeded with ``seed``) so batches are reproducible. Returns the shared
+        axis grid and an (N, points) array, written into ``out`` if given.
+        """
+        grid = self.grid(spec_type)
+        centers, widths = self._components(spec_type, samples)
+        spectra = self.synthesizer.synthesize(grid, centers, widths, amplitudes, noise_level,
+                                              rng=rng, seed=seed, out=out, dtype=dtype)
+        return grid, spectra
+
+    def grid(self, spec_type: SpectroscopyType) -> np.ndarray:
+        """Shared, read-only axis grid for a spectrum type."""
+        try:
+            (start, stop, points), _ = SPECTRUM_GRIDS[spec_type]
+        except KeyError:
+            raise ValueError(f"No synthesis grid for {spec_type}") from None
+        return cached_grid(start, stop, points)
+
+    def _reference_table(self, spec_type: SpectroscopyType) -> Dict[str, Tuple[float, float]]:
+        if spec_type == SpectroscopyType.IR:
+            return self.ir_functional_groups
+        if spec_type == SpectroscopyType.RAMAN:
+            return self.raman_bands
+        if spec_type == SpectroscopyType.UV_VIS:
+            return self.uv_chromophores
+        if spec_type == SpectroscopyType.NMR:
+            return self.nmr_shifts
+        if spec_type == SpectroscopyType.MASS:
+            raise ValueError("Mass spectra are assigned from candidate formulas; "
+                             "see set_mass_candidates")
+        raise ValueError(f"No reference table for {spec_type}")
+
+    def _components(self, spec_type: SpectroscopyType,
+                    samples: List[List[str]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Peak centers and widths, (N, M) padded with NaN; unknown names are skipped."""
+        table = self._reference_table(spec_type)
+        _, divisor = SPECTRUM_GRIDS[spec_type]
+        n_components = max((len(names) for names in samples), default=0)
+        centers = np.full((len(samples), n_components), np.nan)
+        widths = np.ones((len(samples), n_components))
+        for i, names in enumerate(samples):
+            for j, name in enumerate(names):
+                if name in table:
+                    low, high = table[name]
+                    centers[i, j] = (low + high) / 2
+                    widths[i, j] = (high - low) / 2 / divisor
+        return centers, widths
+
+    def _identify_ir_peak(self, wavenumber: float) -> str:
+        """Identify functional group from IR wavenumber."""
+        return self.assignment_index(SpectroscopyType.IR).best(wavenumber)[0]
+
+    def _identify_uv_peak(self, wavelength: float) -> str:
+        """Identify chromophore from UV-Vis wavelength."""
+        return self.assignment_index(SpectroscopyType.UV_VIS).best(wavelength)[0]
+
+    def _identify_nmr_peak(self, shift: float) -> str:
+        """Identify proton environment from NMR chemical shift."""
+        return self.assignment_index(SpectroscopyType.NMR).best(shift)[0]
+
+    def assign_peaks(self, positions: np.ndarray,
+                     spec_type: SpectroscopyType) -> List[List[Tuple[str, float]]]:
+        """Every overlapping reference assignment, with a score, for each peak."""
+        return self.assignment_index(spec_type).candidates(positions)
+
+    def assignment_index(self, spec_type: SpectroscopyType) -> IntervalIndex:
+        """Interval index over a reference table, built once per table."""
+        index = self._indices.get(spec_type)
+        if index is None:
+            index = self._indices[spec_type] = IntervalIndex(self._reference_table(spec_type))
+        return index
+
+    def set_reference_table(self, spec_type: SpectroscopyType,
+                            table: Dict[str, Tuple[float, float]]):
+        """Swap in a new reference library; its index is rebuilt on next use."""
+        self._tables[spec_type] = _ReferenceTable(table, self._indices, spec_type)
+        self._indices.pop(spec_type, None)
+
+    # Reassigning these attributes swaps the library and editing them in
+    # place (t[name] = range, del, update) invalidates the cached index;
+    # either way it is rebuilt on next use
+    ir_functional_groups = property(
+        lambda self: self._tables[SpectroscopyType.IR],
+        lambda self, table: self.set_reference_table(SpectroscopyType.IR, table))
+    raman_bands = property(
+        lambda self: self._tables[SpectroscopyType.RAMAN],
+        lambda self, table: self.set_reference_table(SpectroscopyType.RAMAN, table))
+    uv_chromophores = property(
+        lambda self: self._tables[SpectroscopyType.UV_VIS],
+        lambda self, table: self.set_reference_table(SpectroscopyType.UV_VIS, table))
+    nmr_shifts = property(
+        lambda self: self._tables[SpectroscopyType.NMR],
+        lambda self, table: self.set_reference_table(SpectroscopyType.NMR, table))
+
+    def characterize_peaks(self, x: np.ndarray, spectra: np.ndarray, height: float = 0.1,
+                           distance: int = 50) -> PeakCharacteristics:
+        """Find and measure peaks of a (N, points) batch in one pass.
+
+        Returns FWHM (in axis units), prominence, area and asymmetry for
+        every peak, tagged with the row it came from.
+        """
+        rows, indices = find_peaks_batch(spectra, height=height, distance=distance)
+        return characterize_peaks(x, spectra, rows, indices)
+
+    @instrument(items=len)
+    def analyze_spectra(self, x: np.ndarray, spectra: np.ndarray, spec_type: SpectroscopyType,
+                        height: float = 0.1, distance: Optional[int] = None,
+                        sources: Optional[List[str]] = None) -> PeakTable:
+        """Find, measure and assign the peaks of a (N, points) batch.
+
+        Returns one PeakTable for the whole batch; its ``row`` column gives
+        the spectrum each peak came from. ``distance`` (minimum samples
+        between peaks) defaults to 50, or 1 for centroided mass spectra,
+        which are matched against set_mass_candidates.
+        """
+        if spec_type == SpectroscopyType.MASS:
+            return self._analyze_mass(x, spectra, self._mass_reference, height=height,
+                                      distance=distance or 1, sources=sources)
+        distance = 50 if distance is None else distance
+        stats = self.characterize_peaks(x, spectra, height, distance)
+        index = self.assignment_index(spec_type)
+        # Unmatched peaks (-1) map to the trailing "Unknown" category
+        codes = index.best_index(stats.position) % (len(index) + 1)
+        return PeakTable.from_arrays(stats.row, stats.position, stats.height, stats.fwhm,
+                                     codes, index.names + ("Unknown",), sources)
+
+    def _analyze_spectrum(self, x: np.ndarray, spectrum: np.ndarray,
+                          spec_type: SpectroscopyType) -> PeakTable:
+        """Find, measure and assign the peaks of one spectrum."""
+        return self.analyze_spectra(x, spectrum, spec_type)
+
+    def stream_peaks(self, source, spec_type: Optional[SpectroscopyType] = None,
+                     **options) -> Iterator[Tuple[str, SpectralPeak]]:
+        """Analyze JCAMP-DX/CSV/.npy spectra from files or directories lazily.
+
+        Yields ``(source, SpectralPeak)`` records as each batch finishes;
+        ``options`` are passed to :class:`spectral_io.SpectrumPipeline`;
+        use its ``tables`` method for one PeakTable per batch instead.
+        """
+        from .spectral_io import SpectrumPipeline
+        return SpectrumPipeline(self, spec_type, **options).run(source)
+
+    def spectral_library(self, spec_type: SpectroscopyType,
+                         samples: Optional[List[List[str]]] = None,
+                         names: Optional[List[str]] = None, **options) -> SpectralLibrary:
+        """Reference library on the shared grid of ``spec_type``.
+
+        When ``samples`` are given, their noise-free synthetic spectra are
+        added as references (named by ``names`` or the joined components).
+        ``options`` (bins, components, metric) go to SpectralLibrary; query
+        it with ``library.search(x, spectra, k)``.
+        """
+        grid = self.grid(spec_type)
+        library = SpectralLibrary(grid, **options)
+        if samples:
+            _, spectra = self.generate_spectra(spec_type, samples, noise_level=0.0)
+            library.add(grid, spectra, names or [' + '.join(sample) for sample in samples])
+        return library
+
+    def plot_spectrum(self, x: np.ndarray, y: np.ndarray,
+                     peaks: Union[PeakTable, List[SpectralPeak]],
+                     spec_type: SpectroscopyType):
+        """Plot spectrum with peak assignments."""
+        import matplotlib.pyplot as plt
+        plt.figure(figsize=(12, 6))
+        
+        # Plot spectrum
+        plt.plot(x, y, 'b-', label='Spectrum')
+        
+        # Plot peak markers and labels
+        for peak in peaks:
+            plt.plot(peak.wavelength, peak.intensity, 'ro')
+            plt.annotate(peak.assignment, 
+                        (peak.wavelength, peak.intensity),
+                        xytext=(10, 10), 
+                        textcoords='offset points',
+                        arrowprops=dict(arrowstyle='->'))
+
+        # Set labels based on spectroscopy type
+        xlabel, ylabel = rendering.AXIS_LABELS[spec_type.value]
+        plt.xlabel(xlabel)
+        plt.ylabel(ylabel)
+
+        plt.title(f'{spec_type.value} Spectrum')
+        plt.grid(True)
+        plt.legend()
+        plt.show()
+
+    def render_spectrum(self, x: np.ndarray, y: np.ndarray,
+                        peaks: Union[PeakTable, List[SpectralPeak]],
+                        spec_type: SpectroscopyType, fmt: str = 'png') -> bytes:
+        """Render spectrum with peak assignments headlessly to PNG/SVG bytes."""
+        return rendering.get_renderer('spectrum').render(x, y, peaks, spec_type, fmt)
+
+# Example usage
+if __name__ == "__main__":
+    analyzer = MolecularSpectroscopyAnalyzer()
+
+    # Generate and analyze IR spectrum
+    print("Analyzing IR Spectrum...")
+    wavenumbers, ir_spectrum = analyzer.generate_ir_spectrum(
+        ["O-H stretch", "C=O stretch", "C-H stretch"]
+    )
+    ir_peaks = analyzer.analyze_ir_spectrum(wavenumbers, ir_spectrum)
+    analyzer.plot_spectrum(wavenumbers, ir_spectrum, ir_peaks, SpectroscopyType.IR)
+
+    # Generate and analyze UV-Vis spectrum
+    print("\nAnalyzing UV-Vis Spectrum...")
+    wavelengths, uv_spectrum = analyzer.generate_uv_vis_spectrum(
+        ["C=C", "Benzene"]
+    )
+    uv_peaks = analyzer.analyze_uv_vis_spectrum(wavelengths, uv_spectrum)
+    analyzer.plot_spectrum(wavelengths, uv_spectrum, uv_peaks, SpectroscopyType.UV_VIS)
+
+    # Generate and analyze NMR spectrum
+    print("\nAnalyzing NMR Spectrum...")
+    shifts, nmr_spectrum = analyzer.generate_nmr_spectrum(
+        ["CH3", "Aromatic", "OH"]
+    )
+    nmr_peaks = analyzer.analyze_nmr_spectrum(shifts, nmr_spectrum)
+    analyzer.plot_spectrum(shifts, nmr_spectrum, nmr_peaks, SpectroscopyType.NMR)
+
+    # Generate and analyze Raman spectrum
+    print("\nAnalyzing Raman Spectrum...")
+    raman_shifts, raman_spectrum = analyzer.generate_raman_spectrum(
+        ["Ring breathing", "C=C stretch", "C-H stretch"]
+    )
+    raman_peaks = analyzer.analyze_raman_spectrum(raman_shifts, raman_spectrum)
+    analyzer.plot_spectrum(raman_shifts, raman_spectrum, raman_peaks, SpectroscopyType.RAMAN)
+
+    # Generate and analyze mass spectrum
+    print("\nAnalyzing Mass Spectrum...")
+    mz, mass_spectrum = analyzer.generate_mass_spectrum(
+        ["C6H12O6", "C8H10N4O2"], noise_level=0.002
+    )
+    mass_peaks = analyzer.analyze_mass_spectrum(mz, mass_spectrum, ["C6H12O6", "C8H10N4O2"])
+    analyzer.plot_spectrum(mz, mass_spectrum, mass_peaks, SpectroscopyType.MASS)
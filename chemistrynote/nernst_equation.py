@@ -0,0 +1,28 @@
+from .electrophysiology import F, R, nernst_equation as _nernst_equation
+
+def nernst_equation(E_standard, T, n, Q):
+    """
+    Calculate the cell potential using the Nernst equation.
+    
+    Parameters:
+    E_standard (float or array): Standard electrode potential in volts
+    T (float or array): Temperature in Kelvin
+    n (int or array): Number of moles of electrons transferred
+    Q (float or array): Reaction quotient
+
+    Returns:
+    float or ndarray: Cell potential in volts; arrays broadcast
+    """
+    potential = _nernst_equation(E_standard, T, n, Q)
+    return potential[()] if potential.ndim == 0 else potential
+
+if __name__ == "__main__":
+    # Example values
+    E_standard = 1.10  # Standard electrode potential for the reaction (in volts)
+    T = 298.15  # Temperature in Kelvin (25°C)
+    n = 2  # Number of moles of electrons transferred
+    Q = 0.01  # Reaction quotient
+
+    # Calculate cell potential
+    E_cell = nernst_equation(E_standard, T, n, Q)
+    print(f"Cell potential: {E_cell:.4f} V")
@@ -0,0 +1,34 @@
+from .electrophysiology import F, R, nernst_planck_flux as _nernst_planck_flux
+
+# Constants
+T = 310.15  # Temperature in Kelvin (37°C)
+
+def nernst_planck_flux(D_i, z_i, C_i, dC_dx, dphi_dx, T=T):
+    """
+    Calculate the ion flux using the Nernst-Planck equation.
+    
+    Parameters:
+    D_i (float or array): Diffusion coefficient of ion i
+    z_i (int or array): Valence of ion i
+    C_i (float or array): Concentration of ion i
+    dC_dx (float or array): Concentration gradient of ion i
+    dphi_dx (float or array): Electric potential gradient
+    T (float or array): Temperature in Kelvin
+
+    Returns:
+    float or ndarray: Flux of ion i; arrays broadcast
+    """
+    flux = _nernst_planck_flux(D_i, z_i, C_i, dC_dx, dphi_dx, T)
+    return flux[()] if flux.ndim == 0 else flux
+
+if __name__ == "__main__":
+    # Example values
+    D_i = 1e-5  # Diffusion coefficient in cm^2/s
+    z_i = 1  # Valence for potassium ion (K+)
+    C_i = 100  # Concentration in mM
+    dC_dx = -0.1  # Concentration gradient in mM/cm
+    dphi_dx = 0.01  # Electric potential gradient in V/cm
+
+    # Calculate ion flux
+    flux_np = nernst_planck_flux(D_i, z_i, C_i, dC_dx, dphi_dx)
+    print(f"Nernst-Planck flux: {flux_np:.4e} mol/s/cm^2")
@@ -0,0 +1,144 @@
+import math
+from fractions import Fraction
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+OxidationState = Union[int, float]
+Composition = Tuple[Tuple[str, int], ...]
+
+
+class OxidationStateSolver:
+    """Assign oxidation states by solving a small integer program.
+
+    Every element contributes ``count * state`` and the total must equal the
+    net charge, with each state drawn from the element's allowed list.
+    Elements are assigned in order of decreasing electronegativity and each
+    tries its lowest state first, so the more electronegative partner takes
+    the negative states; the most electronegative element is held at its
+    lowest state unless nothing else balances. Hydrogen is fixed at +1
+    unless it is the most electronegative element (metal hydrides). When no integer assignment
+    exists (Fe3O4, glucose, KO2) the most variable element takes a
+    fractional average state. Results are memoized by composition.
+    """
+
+    def __init__(self, periodic_table: Mapping, maxsize: int = 65536):
+        self.periodic_table = periodic_table
+        self._solve = lru_cache(maxsize=maxsize)(self._solve_uncached)
+
+    def solve(self, composition: Composition, charge: int = 0) -> Dict[str, OxidationState]:
+        """Return oxidation states for a sorted (element, count) composition."""
+        return dict(self._solve(composition, charge))
+
+    def cache_info(self):
+        """Return memoization statistics."""
+        return self._solve.cache_info()
+
+    def _allowed(self, symbol: str) -> List[int]:
+        try:
+            element = self.periodic_table[symbol]
+        except KeyError:
+            raise ValueError(f"Unknown element: {symbol}") from None
+        return sorted(element.oxidation_states) or [0]
+
+    def _electronegativity(self, symbol: str) -> float:
+        value = self.periodic_table[symbol].electronegativity
+        return -math.inf if math.isnan(value) else value
+
+    def _solve_uncached(self, composition: Composition, charge: int) -> Tuple:
+        if len(composition) == 1:
+            (symbol, count), = composition
+            allowed = self._allowed(symbol)
+            state = Fraction(charge, count)
+            # Free elements are 0; ions need an allowed state, or an average
+            # within the allowed range for polyatomic ions such as O2^- and I3^-
+            if charge and not (state in allowed if state.denominator == 1
+                               else allowed[0] < state < allowed[-1]):
+                raise ValueError(f"No consistent oxidation states for composition "
+                                 f"{dict(composition)} with charge {charge}")
+            return ((symbol, _normalize(state)),)
+
+        order = sorted(composition, key=lambda item: (-self._electronegativity(item[0]), item[0]))
+        symbols = [symbol for symbol, _ in order]
+        counts = [count for _, count in order]
+        allowed = [self._allowed(symbol) for symbol in symbols]
+        for i, symbol in enumerate(symbols):
+            if symbol == 'H' and i > 0 and 1 in allowed[i]:
+                allowed[i] = [1]
+
+        # Pin the most electronegative element to its lowest state first and
+        # only relax it (peroxides, superoxides) when that has no solution
+        states = None
+        for first in ([allowed[0][0]], allowed[0]):
+            pinned = [first] + allowed[1:]
+            states = _search(counts, pinned, charge)
+            if states is None:
+                states = self._average(counts, pinned, charge)
+            if states is not None:
+                break
+        if states is None:
+            raise ValueError(f"No consistent oxidation states for composition {dict(composition)}"
+                             f" with charge {charge}")
+        return tuple(sorted((symbol, _normalize(state)) for symbol, state in zip(symbols, states)))
+
+    def _average(self, counts: List[int], allowed: List[List[int]],
+                 charge: int) -> Optional[List[Fraction]]:
+        """Let one element take a fractional average state (mixed valence)."""
+        # Most variable element first; the most electronegative element last
+        candidates = sorted(range(1, len(counts)), key=lambda i: -len(allowed[i])) + [0]
+        for balance in candidates:
+            others = [i for i in range(len(counts)) if i != balance]
+            low = min(allowed[balance]) * counts[balance]
+            high = max(allowed[balance]) * counts[balance]
+            found = _search([counts[i] for i in others] + [counts[balance]],
+                            [allowed[i] for i in others] + [None], charge, (low, high))
+            if found is not None:
+                states: List[Fraction] = [Fraction(0)] * len(counts)
+                for i, state in zip(others + [balance], found):
+                    states[i] = state
+                return states
+        return None
+
+
+def _search(counts: Sequence[int], allowed: Sequence[Optional[List[int]]], charge: int,
+            free_range: Optional[Tuple[int, int]] = None) -> Optional[List[Fraction]]:
+    """Depth-first search with bound pruning for sum(count * state) == charge.
+
+    The last element is solved directly from the remainder. If
+    ``free_range`` is given it may take any rational value whose total
+    contribution lies in that range, otherwise it must be one of its
+    allowed integer states.
+    """
+    n = len(counts)
+    # Bounds on what elements i.. can still contribute
+    low = [0] * (n + 1)
+    high = [0] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        if allowed[i] is None:
+            low[i], high[i] = low[i + 1] + free_range[0], high[i + 1] + free_range[1]
+        else:
+            low[i] = low[i + 1] + counts[i] * allowed[i][0]
+            high[i] = high[i + 1] + counts[i] * allowed[i][-1]
+
+    states: List[Fraction] = []
+
+    def visit(i: int, remaining: int) -> bool:
+        if not low[i] <= remaining <= high[i]:
+            return False
+        if i == n - 1:
+            state = Fraction(remaining, counts[i])
+            if allowed[i] is None or (state.denominator == 1 and int(state) in allowed[i]):
+                states.append(state)
+                return True
+            return False
+        for state in allowed[i]:
+            states.append(Fraction(state))
+            if visit(i + 1, remaining - counts[i] * state):
+                return True
+            states.pop()
+        return False
+
+    return states if visit(0, charge) else None
+
+
+def _normalize(state: Fraction) -> OxidationState:
+    return int(state) if state.denominator == 1 else round(float(state), 4)
@@ -0,0 +1,189 @@
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+
+@dataclass
+class SpectralPeak:
+    wavelength: float
+    intensity: float
+    assignment: str
+    width: float
+
+
+PEAK_DTYPE = np.dtype([
+    ('row', np.int32),          # spectrum index (into ``sources`` when given)
+    ('wavelength', np.float64), # peak position in axis units
+    ('intensity', np.float64),
+    ('width', np.float64),      # FWHM in axis units
+    ('assignment', np.int32),   # code into ``categories``
+])
+
+
+class PeakTable:
+    """Columnar peak records backed by one structured NumPy array.
+
+    Assignments are stored as integer codes into ``categories``, so a table
+    costs 32 bytes per peak. Indexing with a slice returns a view that
+    shares memory; masks and index arrays return compact copies. Iterating
+    or indexing with an integer materializes :class:`SpectralPeak` objects
+    on demand for code written against the old list interface.
+    """
+
+    def __init__(self, data: np.ndarray, categories: Sequence[str],
+                 sources: Optional[Sequence[str]] = None):
+        if data.dtype != PEAK_DTYPE:
+            raise ValueError(f"PeakTable data must have dtype {PEAK_DTYPE}")
+        self.data = data
+        self.categories = tuple(categories)
+        self.sources = None if sources is None else tuple(sources)
+
+    @classmethod
+    def from_arrays(cls, rows, wavelength, intensity, width, codes,
+                    categories: Sequence[str], sources: Optional[Sequence[str]] = None) -> 'PeakTable':
+        """Build a table from column arrays of equal length."""
+        data = np.empty(len(wavelength), dtype=PEAK_DTYPE)
+        data['row'] = rows
+        data['wavelength'] = wavelength
+        data['intensity'] = intensity
+        data['width'] = width
+        data['assignment'] = codes
+        return cls(data, categories, sources)
+
+    @classmethod
+    def from_peaks(cls, peaks: Sequence[SpectralPeak], row: int = 0) -> 'PeakTable':
+        """Pack SpectralPeak objects (e.g. from older code) into a table."""
+        categories: Dict[str, int] = {}
+        codes = [categories.setdefault(peak.assignment, len(categories)) for peak in peaks]
+        return cls.from_arrays(np.full(len(peaks), row), [p.wavelength for p in peaks],
+                               [p.intensity for p in peaks], [p.width for p in peaks],
+                               codes, list(categories))
+
+    @classmethod
+    def concatenate(cls, tables: Sequence['PeakTable']) -> 'PeakTable':
+        """Stack tables, merging categories and renumbering rows and sources."""
+        categories: Dict[str, int] = {}
+        sources: List[str] = []
+        parts = []
+        row_offset = 0
+        for table in tables:
+            remap = np.array([categories.setdefault(name, len(categories))
+                              for name in table.categories], dtype=np.int32)
+            part = table.data.copy()
+            part['assignment'] = remap[part['assignment']] if len(remap) else part['assignment']
+            part['row'] += row_offset
+            n_rows = len(table.sources) if table.sources is not None else (
+                int(part['row'].max()) - row_offset + 1 if len(part) else 0)
+            if table.sources is not None:
+                sources.extend(table.sources)
+            row_offset += n_rows
+            parts.append(part)
+        data = np.concatenate(parts) if parts else np.empty(0, dtype=PEAK_DTYPE)
+        return cls(data, list(categories), sources if sources else None)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, key) -> Union[SpectralPeak, 'PeakTable']:
+        if isinstance(key, (int, np.integer)):
+            return self._peak(self.data[key])
+        return PeakTable(self.data[key], self.categories, self.sources)
+
+    def __iter__(self) -> Iterator[SpectralPeak]:
+        categories = self.categories
+        for row in self.data.tolist():
+            yield SpectralPeak(row[1], row[2], categories[row[4]], row[3])
+
+    def __repr__(self) -> str:
+        return f"PeakTable({len(self)} peaks, {len(self.categories)} assignments)"
+
+    def _peak(self, record) -> SpectralPeak:
+        return SpectralPeak(float(record['wavelength']), float(record['intensity']),
+                            self.categories[record['assignment']], float(record['width']))
+
+    @property
+    def row(self) -> np.ndarray:
+        return self.data['row']
+
+    @property
+    def wavelength(self) -> np.ndarray:
+        return self.data['wavelength']
+
+    @property
+    def intensity(self) -> np.ndarray:
+        return self.data['intensity']
+
+    @property
+    def width(self) -> np.ndarray:
+        return self.data['width']
+
+    @property
+    def codes(self) -> np.ndarray:
+        return self.data['assignment']
+
+    @property
+    def assignment(self) -> np.ndarray:
+        """Assignment names per peak (object array)."""
+        return np.asarray(self.categories, dtype=object)[self.codes]
+
+    def where(self, assignment: Optional[str] = None, min_intensity: Optional[float] = None,
+              low: Optional[float] = None, high: Optional[float] = None,
+              row: Optional[int] = None) -> 'PeakTable':
+        """Peaks matching every given criterion."""
+        mask = np.ones(len(self), dtype=bool)
+        if assignment is not None:
+            code = self.categories.index(assignment) if assignment in self.categories else -1
+            mask &= self.codes == code
+        if min_intensity is not None:
+            mask &= self.intensity >= min_intensity
+        if low is not None:
+            mask &= self.wavelength >= low
+        if high is not None:
+            mask &= self.wavelength <= high
+        if row is not None:
+            mask &= self.row == row
+        return self[mask]
+
+    def spectrum(self, row: int) -> 'PeakTable':
+        """Peaks of one spectrum; a zero-copy view when rows are sorted."""
+        rows = self.row
+        if len(rows) and np.all(rows[1:] >= rows[:-1]):
+            return self[int(np.searchsorted(rows, row)):int(np.searchsorted(rows, row, side='right'))]
+        return self[rows == row]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of peaks per assignment."""
+        totals = np.bincount(self.codes, minlength=len(self.categories))
+        return {name: int(n) for name, n in zip(self.categories, totals) if n}
+
+    def tolist(self) -> List[SpectralPeak]:
+        return list(self)
+
+    def to_dict(self) -> Dict[str, np.ndarray]:
+        """Column arrays (views, except the decoded assignment names)."""
+        columns = {name: self.data[name] for name in ('row', 'wavelength', 'intensity', 'width')}
+        columns['assignment'] = self.assignment
+        if self.sources is not None:
+            columns['source'] = np.asarray(self.sources, dtype=object)[self.row]
+        return columns
+
+    def to_arrow(self):
+        """``pyarrow.Table`` with numeric columns shared and assignments dictionary-encoded."""
+        import pyarrow as pa
+        columns = {name: pa.array(np.ascontiguousarray(self.data[name]))
+                   for name in ('row', 'wavelength', 'intensity', 'width')}
+        columns['assignment'] = pa.DictionaryArray.from_arrays(
+            pa.array(np.ascontiguousarray(self.codes)), pa.array(list(self.categories), pa.string()))
+        return pa.table(columns)
+
+    def save(self, path):
+        """Write the records and categories to an ``.npz`` archive."""
+        np.savez(path, data=self.data, categories=np.asarray(self.categories, dtype=str),
+                 sources=np.asarray(self.sources if self.sources is not None else [], dtype=str))
+
+    @classmethod
+    def load(cls, path) -> 'PeakTable':
+        with np.load(path) as archive:
+            sources = archive['sources'].tolist()
+            return cls(archive['data'], archive['categories'].tolist(), sources or None)
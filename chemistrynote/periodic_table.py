@@ -0,0 +1,182 @@
+import numpy as np
+from typing import Dict, Iterable, List
+
+# Z symbol standard-atomic-weight Pauling-electronegativity oxidation-states
+# ('-' marks a missing value; masses of radioactive elements are the mass
+# number of the longest-lived isotope)
+_DATA = """
+1 H 1.008 2.20 -1,1
+2 He 4.0026 - 0
+3 Li 6.94 0.98 1
+4 Be 9.0122 1.57 2
+5 B 10.81 2.04 3
+6 C 12.011 2.55 -4,-3,-2,-1,1,2,3,4
+7 N 14.007 3.04 -3,-2,-1,1,2,3,4,5
+8 O 15.999 3.44 -2,-1,1,2
+9 F 18.998 3.98 -1
+10 Ne 20.180 - 0
+11 Na 22.990 0.93 1
+12 Mg 24.305 1.31 2
+13 Al 26.982 1.61 3
+14 Si 28.085 1.90 -4,4
+15 P 30.974 2.19 -3,3,5
+16 S 32.06 2.58 -2,2,4,6
+17 Cl 35.45 3.16 -1,1,3,5,7
+18 Ar 39.948 - 0
+19 K 39.098 0.82 1
+20 Ca 40.078 1.00 2
+21 Sc 44.956 1.36 3
+22 Ti 47.867 1.54 2,3,4
+23 V 50.942 1.63 2,3,4,5
+24 Cr 51.996 1.66 2,3,6
+25 Mn 54.938 1.55 2,3,4,6,7
+26 Fe 55.845 1.83 2,3
+27 Co 58.933 1.88 2,3
+28 Ni 58.693 1.91 2
+29 Cu 63.546 1.90 1,2
+30 Zn 65.38 1.65 2
+31 Ga 69.723 1.81 3
+32 Ge 72.630 2.01 -4,2,4
+33 As 74.922 2.18 -3,3,5
+34 Se 78.971 2.55 -2,4,6
+35 Br 79.904 2.96 -1,1,3,5
+36 Kr 83.798 3.00 2
+37 Rb 85.468 0.82 1
+38 Sr 87.62 0.95 2
+39 Y 88.906 1.22 3
+40 Zr 91.224 1.33 4
+41 Nb 92.906 1.6 5
+42 Mo 95.95 2.16 4,6
+43 Tc 98 1.9 4,7
+44 Ru 101.07 2.2 3,4
+45 Rh 102.91 2.28 3
+46 Pd 106.42 2.20 2,4
+47 Ag 107.87 1.93 1
+48 Cd 112.41 1.69 2
+49 In 114.82 1.78 3
+50 Sn 118.71 1.96 -4,2,4
+51 Sb 121.76 2.05 -3,3,5
+52 Te 127.60 2.1 -2,4,6
+53 I 126.90 2.66 -1,1,3,5,7
+54 Xe 131.29 2.6 2,4,6
+55 Cs 132.91 0.79 1
+56 Ba 137.33 0.89 2
+57 La 138.91 1.10 3
+58 Ce 140.12 1.12 3,4
+59 Pr 140.91 1.13 3
+60 Nd 144.24 1.14 3
+61 Pm 145 1.13 3
+62 Sm 150.36 1.17 2,3
+63 Eu 151.96 1.2 2,3
+64 Gd 157.25 1.20 3
+65 Tb 158.93 1.1 3
+66 Dy 162.50 1.22 3
+67 Ho 164.93 1.23 3
+68 Er 167.26 1.24 3
+69 Tm 168.93 1.25 3
+70 Yb 173.05 1.1 2,3
+71 Lu 174.97 1.27 3
+72 Hf 178.49 1.3 4
+73 Ta 180.95 1.5 5
+74 W 183.84 2.36 4,6
+75 Re 186.21 1.9 4,7
+76 Os 190.23 2.2 4
+77 Ir 192.22 2.20 3,4
+78 Pt 195.08 2.28 2,4
+79 Au 196.97 2.54 1,3
+80 Hg 200.59 2.00 1,2
+81 Tl 204.38 1.62 1,3
+82 Pb 207.2 2.33 2,4
+83 Bi 208.98 2.02 3,5
+84 Po 209 2.0 -2,2,4
+85 At 210 2.2 -1,1
+86 Rn 222 2.2 2
+87 Fr 223 0.7 1
+88 Ra 226 0.9 2
+89 Ac 227 1.1 3
+90 Th 232.04 1.3 4
+91 Pa 231.04 1.5 5
+92 U 238.03 1.38 3,4,5,6
+93 Np 237 1.36 3,4,5,6
+94 Pu 244 1.28 3,4,5,6
+95 Am 243 1.13 3
+96 Cm 247 1.28 3
+97 Bk 247 1.3 3,4
+98 Cf 251 1.3 3
+99 Es 252 1.3 3
+100 Fm 257 1.3 3
+101 Md 258 1.3 2,3
+102 No 259 1.3 2,3
+103 Lr 266 - 3
+104 Rf 267 - 4
+105 Db 268 - 5
+106 Sg 269 - 6
+107 Bh 270 - 7
+108 Hs 269 - 8
+109 Mt 278 - -
+110 Ds 281 - -
+111 Rg 282 - -
+112 Cn 285 - 2
+113 Nh 286 - -
+114 Fl 289 - -
+115 Mc 290 - -
+116 Lv 293 - -
+117 Ts 294 - -
+118 Og 294 - -
+"""
+
+# Bit (state + OXIDATION_OFFSET) is set for every allowed oxidation state
+OXIDATION_OFFSET = 5
+
+
+def encode_oxidation_states(states: Iterable[int]) -> int:
+    """Pack oxidation states into a bitmask."""
+    mask = 0
+    for state in states:
+        mask |= 1 << (state + OXIDATION_OFFSET)
+    return mask
+
+
+def decode_oxidation_states(mask: int) -> List[int]:
+    """Unpack a bitmask into a sorted list of oxidation states."""
+    mask = int(mask)
+    return [bit - OXIDATION_OFFSET for bit in range(mask.bit_length()) if mask >> bit & 1]
+
+
+def _build():
+    rows = [line.split() for line in _DATA.strip().splitlines()]
+    size = len(rows) + 1
+    symbols = [''] * size
+    mass = np.full(size, np.nan)
+    electronegativity = np.full(size, np.nan)
+    oxidation_mask = np.zeros(size, dtype=np.uint32)
+    for z, symbol, m, en, states in rows:
+        z = int(z)
+        symbols[z] = symbol
+        mass[z] = float(m)
+        if en != '-':
+            electronegativity[z] = float(en)
+        if states != '-':
+            oxidation_mask[z] = encode_oxidation_states(int(s) for s in states.split(','))
+    for array in (mass, electronegativity, oxidation_mask):
+        array.setflags(write=False)
+    return tuple(symbols), mass, electronegativity, oxidation_mask
+
+
+# Arrays indexed by atomic number; index 0 is an unused placeholder
+SYMBOLS, ATOMIC_MASS, ELECTRONEGATIVITY, OXIDATION_MASK = _build()
+ATOMIC_NUMBER: Dict[str, int] = {symbol: z for z, symbol in enumerate(SYMBOLS) if symbol}
+N_ELEMENTS = len(SYMBOLS) - 1
+
+
+def atomic_number(symbol: str) -> int:
+    """Look up the atomic number of an element symbol."""
+    try:
+        return ATOMIC_NUMBER[symbol]
+    except KeyError:
+        raise ValueError(f"Unknown element: {symbol}") from None
+
+
+def oxidation_states(z: int) -> List[int]:
+    """Return the allowed oxidation states of element ``z``."""
+    return decode_oxidation_states(OXIDATION_MASK[z])
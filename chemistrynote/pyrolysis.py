@@ -0,0 +1,254 @@
+from dataclasses import dataclass
+from multiprocessing import Pool
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .instrumentation import instrument
+
+R = 8.314  # Gas constant in J/(mol·K)
+
+
+@dataclass
+class Reaction:
+    """First-order lump conversion reactant → product with Arrhenius
+    constants: pre-exponential factor A in 1/s and activation energy Ea
+    in J/mol. Mass is conserved (one kg of reactant gives one kg of product)."""
+    reactant: str
+    product: str
+    A: float
+    Ea: float
+
+
+# Hypothetical polyolefin scheme: primary cracking of the plastic into
+# oil (wax/liquid), gas and char, plus secondary cracking of the oil.
+DEFAULT_REACTIONS = (
+    Reaction('plastic', 'oil', 5.0e14, 230e3),
+    Reaction('plastic', 'gas', 1.0e13, 225e3),
+    Reaction('plastic', 'char', 2.0e10, 200e3),
+    Reaction('oil', 'gas', 1.0e9, 200e3),
+    Reaction('oil', 'char', 1.0e7, 170e3),
+)
+
+
+@dataclass
+class PyrolysisResult:
+    """Batched reactor trajectories.
+
+    masses has shape (runs, species, times); temperatures (runs, times).
+    """
+    species: List[str]
+    times: np.ndarray
+    masses: np.ndarray
+    temperatures: np.ndarray
+    success: np.ndarray
+
+    def mass(self, species: str) -> np.ndarray:
+        """Trajectory of one species, shape (runs, times)."""
+        return self.masses[:, self.species.index(species)]
+
+    def yields(self) -> Dict[str, np.ndarray]:
+        """Final mass fraction of every species per run."""
+        final = self.masses[:, :, -1]
+        fractions = final / final.sum(axis=1, keepdims=True)
+        return {name: fractions[:, i] for i, name in enumerate(self.species)}
+
+
+class PyrolysisModel:
+    """
+    Lumped-kinetics pyrolysis reactor for many runs at once.
+
+    Every run (feedstock × temperature program) follows the same reaction
+    network, so the runs are stacked into one block-diagonal ODE system:
+    dm/dt = S · (k(T(t)) ∘ m[reactant]) with the stoichiometric matrix S
+    shared by all blocks. The system is linear in the masses, so the
+    Jacobian is exact and cheap: its sparsity pattern is built once from
+    the network and only the rate constants are written into it per call.
+    Stiff spreads in rate constants are handled by BDF.
+    """
+
+    def __init__(self, reactions: Sequence[Reaction] = DEFAULT_REACTIONS,
+                 species: Optional[Sequence[str]] = None):
+        self.reactions = list(reactions)
+        if species is None:
+            species = []
+            for r in self.reactions:
+                for name in (r.reactant, r.product):
+                    if name not in species:
+                        species.append(name)
+        self.species = list(species)
+        index = {name: i for i, name in enumerate(self.species)}
+        self.reactant_index = np.array([index[r.reactant] for r in self.reactions])
+        self.product_index = np.array([index[r.product] for r in self.reactions])
+        self.A = np.array([r.A for r in self.reactions], dtype=float)
+        self.Ea = np.array([r.Ea for r in self.reactions], dtype=float)
+
+        n_species, n_reactions = len(self.species), len(self.reactions)
+        self.stoichiometry = np.zeros((n_species, n_reactions))
+        np.add.at(self.stoichiometry, (self.reactant_index, np.arange(n_reactions)), -1.0)
+        np.add.at(self.stoichiometry, (self.product_index, np.arange(n_reactions)), 1.0)
+        # Jacobian block d(dm_i/dt)/dm_j = Σ_r S[i, r] k_r [reactant_r == j],
+        # kept as its nonzero entries (i, j) and a map from rate constants to values
+        block = np.zeros((n_species, n_species, n_reactions))
+        for r, j in enumerate(self.reactant_index):
+            block[:, j, r] += self.stoichiometry[:, r]
+        rows, cols = np.nonzero(np.any(block != 0, axis=2))
+        self._pattern = (rows, cols)
+        self._values = block[rows, cols]  # (entries, reactions)
+
+    # -- kinetics ------------------------------------------------------------
+
+    @staticmethod
+    def temperature(t, T0, heating_rate, T_final) -> np.ndarray:
+        """Linear ramp from T0 at heating_rate (K/s), held at T_final."""
+        return np.minimum(T0 + heating_rate * t, T_final)
+
+    def rate_constants(self, T, A=None, Ea=None) -> np.ndarray:
+        """Arrhenius k = A exp(-Ea / RT); T (runs,) gives (runs, reactions)."""
+        A = self.A if A is None else A
+        Ea = self.Ea if Ea is None else Ea
+        return A * np.exp(-Ea / (R * np.asarray(T, dtype=float)[..., None]))
+
+    def _system(self, T0, heating_rate, T_final, A, Ea):
+        """Vectorized right-hand side and sparse Jacobian for stacked runs."""
+        from scipy import sparse
+
+        n_runs, n_species = len(T0), len(self.species)
+        rows, cols = self._pattern
+        offsets = (np.arange(n_runs) * n_species)[:, None]
+        jac_rows = (offsets + rows).ravel()
+        jac_cols = (offsets + cols).ravel()
+        size = n_runs * n_species
+
+        def rates(t):
+            return self.rate_constants(self.temperature(t, T0, heating_rate, T_final), A, Ea)
+
+        def rhs(t, y):
+            # y is (size,) or (size, k) when solve_ivp evaluates columns together
+            m = y.reshape(n_runs, n_species, -1)
+            flux = rates(t)[:, :, None] * m[:, self.reactant_index]
+            return (self.stoichiometry @ flux).reshape(y.shape)
+
+        def jac(t, y):
+            values = (rates(t) @ self._values.T).ravel()
+            return sparse.csc_matrix((values, (jac_rows, jac_cols)), shape=(size, size))
+
+        return rhs, jac
+
+    def _solve(self, task) -> PyrolysisResult:
+        """Integrate one chunk of runs as a single stacked system."""
+        from scipy.integrate import solve_ivp
+
+        times, initial, T0, heating_rate, T_final, A, Ea, rtol, atol = task
+        rhs, jac = self._system(T0, heating_rate, T_final, A, Ea)
+        solution = solve_ivp(rhs, (times[0], times[-1]), initial.ravel(), method='BDF',
+                             t_eval=times, jac=jac, vectorized=True, rtol=rtol, atol=atol)
+        n_runs = len(initial)
+        masses = np.full((n_runs, len(self.species), len(times)), np.nan)
+        if solution.success:
+            masses[:] = solution.y.reshape(n_runs, len(self.species), -1)
+        temperatures = self.temperature(times[None, :], T0[:, None], heating_rate[:, None], T_final[:, None])
+        return PyrolysisResult(self.species, times, masses, temperatures,
+                               np.full(n_runs, solution.success))
+
+    @instrument(items=lambda result: len(result.masses))
+    def simulate(self, times, initial, T0=298.15, heating_rate=10.0 / 60, T_final=773.15,
+                 A=None, Ea=None, rtol: float = 1e-6, atol: Optional[float] = None,
+                 chunk_size: int = 256, workers: Optional[int] = 1) -> PyrolysisResult:
+        """
+        Integrate the reactor for every run.
+
+        Parameters:
+        times (array): Output times in seconds, starting at the initial state
+        initial (array): Initial masses (runs, species), or plastic mass per
+            run (runs,) to start from pure feedstock in the first species
+        T0, heating_rate, T_final (array): Temperature program per run, in K,
+            K/s and K; scalars are shared
+        A, Ea (array): Optional per-run Arrhenius parameters (runs, reactions)
+        rtol, atol (float): Integrator tolerances (atol defaults to 1e-9 of the
+            largest initial mass)
+        chunk_size (int): Runs stacked into one ODE system
+        workers (int): Processes for the chunks (None: one per CPU, 1: in-process)
+
+        Returns:
+        PyrolysisResult: Mass trajectories and temperatures of every run
+        """
+        times = np.asarray(times, dtype=float)
+        initial = np.asarray(initial, dtype=float)
+        if initial.ndim == 1:
+            masses = np.zeros((len(initial), len(self.species)))
+            masses[:, 0] = initial
+            initial = masses
+        if initial.ndim != 2 or initial.shape[1] != len(self.species):
+            raise ValueError(f"initial must have shape (runs, {len(self.species)})")
+        n_runs = len(initial)
+        T0, heating_rate, T_final = (np.broadcast_to(np.asarray(a, dtype=float), (n_runs,))
+                                     for a in (T0, heating_rate, T_final))
+        n_reactions = len(self.reactions)
+        A = np.broadcast_to(self.A if A is None else np.asarray(A, dtype=float), (n_runs, n_reactions))
+        Ea = np.broadcast_to(self.Ea if Ea is None else np.asarray(Ea, dtype=float), (n_runs, n_reactions))
+        if atol is None:
+            atol = 1e-9 * max(float(initial.max()), 1e-300)
+
+        # The stacked system steps as finely as its fastest transient needs, so
+        # chunks of runs with similar temperature programs take far fewer steps
+        order = np.lexsort((T0, T_final, heating_rate))
+        tasks = [(times, initial[s], T0[s], heating_rate[s], T_final[s], A[s], Ea[s], rtol, atol)
+                 for s in (order[i:i + chunk_size] for i in range(0, n_runs, chunk_size))]
+        if workers == 1 or len(tasks) == 1:
+            parts = list(map(self._solve, tasks))
+        else:
+            with Pool(workers) as pool:
+                parts = list(pool.imap(self._solve, tasks))
+        restore = np.argsort(order)
+        return PyrolysisResult(self.species, times, np.concatenate([p.masses for p in parts])[restore],
+                               np.concatenate([p.temperatures for p in parts])[restore],
+                               np.concatenate([p.success for p in parts])[restore])
+
+
+def pyrolysis(plastic_mass):
+    """
+    Simulate the pyrolysis process to convert plastic into oil, gas, and char.
+
+    Parameters:
+    plastic_mass (float): Mass of plastic waste in kilograms
+
+    Returns:
+    dict: Masses of oil, gas, and char produced
+    """
+    # Conversion ratios (these are hypothetical values for demonstration purposes)
+    oil_ratio = 0.6  # 60% of plastic mass converted to oil
+    gas_ratio = 0.3  # 30% of plastic mass converted to gas
+    char_ratio = 0.1  # 10% of plastic mass converted to char
+
+    oil_mass = plastic_mass * oil_ratio
+    gas_mass = plastic_mass * gas_ratio
+    char_mass = plastic_mass * char_ratio
+
+    return {
+        'oil_mass': oil_mass,
+        'gas_mass': gas_mass,
+        'char_mass': char_mass
+    }
+
+
+if __name__ == "__main__":
+    # Example usage
+    plastic_mass = 1000  # Mass of plastic waste in kilograms
+
+    # Simulate pyrolysis
+    products = pyrolysis(plastic_mass)
+
+    print(f"From {plastic_mass} kg of plastic waste, we get:")
+    print(f"Oil: {products['oil_mass']} kg")
+    print(f"Gas: {products['gas_mass']} kg")
+    print(f"Char: {products['char_mass']} kg")
+
+    # Kinetic model: 1000 kg heated at 5, 10 and 20 K/min to 500 °C, held for an hour
+    model = PyrolysisModel()
+    rates = np.array([5.0, 10.0, 20.0]) / 60
+    times = np.linspace(0, (773.15 - 298.15) / rates.min() + 3600, 200)
+    result = model.simulate(times, np.full(3, plastic_mass), heating_rate=rates)
+    for rate, *fractions in zip(rates * 60, *result.yields().values()):
+        print(f"{rate:4.0f} K/min: " + ", ".join(
+            f"{name} {100 * f:.1f}%" for name, f in zip(result.species, fractions)))
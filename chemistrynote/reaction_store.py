@@ -0,0 +1,318 @@
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import periodic_table as pt
+from .chemical_analyzer import ChemicalAnalyzer
+
+# Arrays persisted as <name>.npy inside the store directory and memory-mapped
+# on load. Compounds and reactions are CSR tables keyed by integer id.
+_ARRAYS = (
+    'formula_offsets', 'formula_blob',        # compound id -> formula text
+    'hill_keys', 'hill_order',                # sorted canonical keys -> compound id
+    'comp_indptr', 'comp_elements', 'comp_counts',   # compound -> (Z, count)
+    'rxn_indptr', 'rxn_compounds', 'rxn_coefficients',  # reaction -> (compound, ±coef)
+    'cr_indptr', 'cr_reactions', 'cr_roles',  # compound -> (reaction, +1 consumed/-1 produced)
+    'ec_indptr', 'ec_compounds',              # element -> compounds containing it
+    'consumed_indptr', 'consumed_reactions',  # element -> reactions consuming it
+    'produced_indptr', 'produced_reactions',  # element -> reactions producing it
+)
+_VERSION = 1
+
+
+def hill_formula(composition: Sequence[Tuple[str, int]], charge: int = 0) -> str:
+    """Canonical Hill-order formula used as the compound key."""
+    counts = dict(composition)
+    if 'C' in counts:
+        order = ['C'] + (['H'] if 'H' in counts else []) + sorted(e for e in counts if e not in ('C', 'H'))
+    else:
+        order = sorted(counts)
+    key = ''.join(f"{e}{counts[e] if counts[e] != 1 else ''}" for e in order)
+    if charge:
+        key += f"^{abs(charge)}{'+' if charge > 0 else '-'}"
+    return key
+
+
+def _csr(keys: np.ndarray, values: np.ndarray, n_keys: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Group values by integer key into (indptr, values sorted by key, value)."""
+    order = np.lexsort((values, keys))
+    indptr = np.zeros(n_keys + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=n_keys), out=indptr[1:])
+    return indptr, values[order]
+
+
+class ReactionStore:
+    """Persistent store of compounds and balanced reactions.
+
+    Compounds are deduplicated by composition (Hill key) and held with
+    reactions in compact integer-id CSR tables. Inverted indices map each
+    element to its compounds and to the reactions consuming or producing
+    it, and each compound to its reactions, so queries cost time
+    proportional to the posting lists they touch. ``save`` writes one
+    ``.npy`` per table; ``load`` memory-maps them.
+    """
+
+    def __init__(self, analyzer: Optional[ChemicalAnalyzer] = None):
+        self.analyzer = analyzer if analyzer is not None else ChemicalAnalyzer()
+        self._formulas: List[str] = []
+        self._keys: Dict[str, int] = {}
+        self._compositions: List[Tuple[Tuple[int, int], ...]] = []
+        self._reactions: List[Tuple[Tuple[int, int], ...]] = []
+        self._arrays: Optional[Dict[str, np.ndarray]] = None
+
+    # -- building ---------------------------------------------------------
+
+    def _resolve(self, formula: str) -> Tuple[str, Tuple[Tuple[int, int], ...]]:
+        """Hill key and (Z, count) composition; raises before touching the store."""
+        parser = self.analyzer.parser
+        composition = parser.composition(formula)
+        return (hill_formula(composition, parser.charge(formula)),
+                tuple((pt.atomic_number(e), n) for e, n in composition))
+
+    def _insert(self, formula: str, key: str, composition: Tuple[Tuple[int, int], ...]) -> int:
+        compound_id = self._keys.get(key)
+        if compound_id is None:
+            compound_id = len(self._formulas)
+            self._formulas.append(formula)
+            self._compositions.append(composition)
+            self._keys[key] = compound_id
+            self._arrays = None
+        return compound_id
+
+    def add_compound(self, formula: str) -> int:
+        """Return the id of a compound, adding it if its composition is new."""
+        resolved = self._resolve(formula)
+        self._thaw()
+        return self._insert(formula, *resolved)
+
+    def add_reaction(self, reactants: str, products: str) -> int:
+        """Balance a reaction, store it and return its id.
+
+        Every compound is resolved before the store changes, so a reaction
+        that fails (unbalanceable, unknown element) leaves it untouched.
+        """
+        r_coeff, p_coeff = self.analyzer.balance_equation(reactants, products)
+        sides = [(c, int(n)) for c, n in zip(reactants.split(' + '), r_coeff)]
+        sides += [(c, -int(n)) for c, n in zip(products.split(' + '), p_coeff)]
+        resolved = [(c, self._resolve(c), n) for c, n in sides]
+        self._thaw()
+        entries = [(self._insert(c, *r), n) for c, r, n in resolved]
+        self._reactions.append(tuple(entries))
+        self._arrays = None
+        return len(self._reactions) - 1
+
+    def add_reactions(self, reactions: Iterable[Tuple[str, str]]) -> List[Optional[int]]:
+        """Add many reactions; entries that fail to balance get ``None``."""
+        ids = []
+        for reactants, products in reactions:
+            try:
+                ids.append(self.add_reaction(reactants, products))
+            except ValueError:
+                ids.append(None)
+        return ids
+
+    def _thaw(self):
+        """Copy memory-mapped tables back into growable lists."""
+        if self._formulas or self._arrays is None:
+            return
+        a = self._arrays
+        blob = bytes(a['formula_blob'])
+        offsets = a['formula_offsets'].tolist()
+        self._formulas = [blob[offsets[i]:offsets[i + 1]].decode() for i in range(len(offsets) - 1)]
+        for key, compound_id in zip(a['hill_keys'].tolist(), a['hill_order'].tolist()):
+            self._keys[key.decode()] = compound_id
+        indptr, elements, counts = a['comp_indptr'], a['comp_elements'].tolist(), a['comp_counts'].tolist()
+        self._compositions = [tuple(zip(elements[indptr[i]:indptr[i + 1]], counts[indptr[i]:indptr[i + 1]]))
+                              for i in range(len(indptr) - 1)]
+        indptr, compounds, coefficients = a['rxn_indptr'], a['rxn_compounds'].tolist(), a['rxn_coefficients'].tolist()
+        self._reactions = [tuple(zip(compounds[indptr[i]:indptr[i + 1]], coefficients[indptr[i]:indptr[i + 1]]))
+                           for i in range(len(indptr) - 1)]
+
+    # -- index construction -------------------------------------------------
+
+    @property
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """The CSR tables and indices, rebuilt after any additions."""
+        if self._arrays is None:
+            self._arrays = self._build()
+        return self._arrays
+
+    def _build(self) -> Dict[str, np.ndarray]:
+        n_compounds = len(self._formulas)
+        n_reactions = len(self._reactions)
+        n_z = pt.N_ELEMENTS + 1
+        a: Dict[str, np.ndarray] = {}
+
+        encoded = [f.encode() for f in self._formulas]
+        a['formula_offsets'] = np.zeros(n_compounds + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=a['formula_offsets'][1:])
+        a['formula_blob'] = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+
+        keys = sorted(self._keys.items())
+        a['hill_keys'] = np.array([k.encode() for k, _ in keys], dtype=bytes) if keys else np.array([], dtype='S1')
+        a['hill_order'] = np.array([i for _, i in keys], dtype=np.int64)
+
+        sizes = [len(c) for c in self._compositions]
+        a['comp_indptr'] = np.zeros(n_compounds + 1, dtype=np.int64)
+        np.cumsum(sizes, out=a['comp_indptr'][1:])
+        flat = [pair for c in self._compositions for pair in c]
+        a['comp_elements'] = np.array([z for z, _ in flat], dtype=np.uint8)
+        a['comp_counts'] = np.array([n for _, n in flat], dtype=np.int32)
+
+        sizes = [len(r) for r in self._reactions]
+        a['rxn_indptr'] = np.zeros(n_reactions + 1, dtype=np.int64)
+        np.cumsum(sizes, out=a['rxn_indptr'][1:])
+        flat_r = [pair for r in self._reactions for pair in r]
+        a['rxn_compounds'] = np.array([c for c, _ in flat_r], dtype=np.int64)
+        a['rxn_coefficients'] = np.array([n for _, n in flat_r], dtype=np.int32)
+
+        # compound -> reactions, with the role encoded in the sign
+        rxn_of_entry = np.repeat(np.arange(n_reactions, dtype=np.int64), sizes)
+        roles = np.sign(a['rxn_coefficients']).astype(np.int8)
+        order = np.lexsort((rxn_of_entry, a['rxn_compounds']))
+        a['cr_indptr'] = np.zeros(n_compounds + 1, dtype=np.int64)
+        np.cumsum(np.bincount(a['rxn_compounds'], minlength=n_compounds), out=a['cr_indptr'][1:])
+        a['cr_reactions'] = rxn_of_entry[order]
+        a['cr_roles'] = roles[order]
+
+        # element -> compounds
+        compound_of_entry = np.repeat(np.arange(n_compounds, dtype=np.int64), np.diff(a['comp_indptr']))
+        a['ec_indptr'], a['ec_compounds'] = _csr(a['comp_elements'].astype(np.int64), compound_of_entry, n_z)
+
+        # element -> reactions consuming / producing it
+        per_entry = np.diff(a['comp_indptr'])[a['rxn_compounds']]
+        entry_rxn = np.repeat(rxn_of_entry, per_entry)
+        entry_role = np.repeat(roles, per_entry)
+        starts = np.repeat(a['comp_indptr'][a['rxn_compounds']], per_entry)
+        within = np.arange(len(entry_rxn)) - np.repeat(np.cumsum(per_entry) - per_entry, per_entry)
+        entry_z = a['comp_elements'][starts + within].astype(np.int64)
+        for name, role in (('consumed', 1), ('produced', -1)):
+            mask = entry_role == role
+            pairs = np.unique(entry_z[mask] * max(n_reactions, 1) + entry_rxn[mask])
+            z, rxn = np.divmod(pairs, max(n_reactions, 1))
+            a[f'{name}_indptr'], a[f'{name}_reactions'] = _csr(z, rxn, n_z)
+        return a
+
+    # -- persistence --------------------------------------------------------
+
+    def save(self, path: str):
+        """Write the store to a directory of ``.npy`` tables."""
+        os.makedirs(path, exist_ok=True)
+        arrays = self.arrays
+        for name in _ARRAYS:
+            np.save(os.path.join(path, f'{name}.npy'), arrays[name])
+        meta = {'version': _VERSION, 'compounds': self.n_compounds, 'reactions': self.n_reactions}
+        with open(os.path.join(path, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, path: str, analyzer: Optional[ChemicalAnalyzer] = None,
+             mmap_mode: Optional[str] = 'r') -> 'ReactionStore':
+        """Open a saved store; tables are memory-mapped by default."""
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        if meta.get('version') != _VERSION:
+            raise ValueError(f"Unsupported reaction store version: {meta.get('version')}")
+        store = cls(analyzer)
+        store._arrays = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mmap_mode)
+                         for name in _ARRAYS}
+        store._keys = {}
+        return store
+
+    # -- lookups --------------------------------------------------------------
+
+    @property
+    def n_compounds(self) -> int:
+        return len(self.arrays['formula_offsets']) - 1
+
+    @property
+    def n_reactions(self) -> int:
+        return len(self.arrays['rxn_indptr']) - 1
+
+    def formula(self, compound_id: int) -> str:
+        """Formula text of a compound as first added."""
+        offsets = self.arrays['formula_offsets']
+        return bytes(self.arrays['formula_blob'][offsets[compound_id]:offsets[compound_id + 1]]).decode()
+
+    def compound_id(self, formula: str) -> Optional[int]:
+        """Id of the compound with the same composition as ``formula``."""
+        parser = self.analyzer.parser
+        key = hill_formula(parser.composition(formula), parser.charge(formula)).encode()
+        keys = self.arrays['hill_keys']
+        i = int(np.searchsorted(keys, key))
+        if i < len(keys) and keys[i] == key:
+            return int(self.arrays['hill_order'][i])
+        return None
+
+    def reaction(self, reaction_id: int) -> Dict[str, List[Tuple[int, str]]]:
+        """Balanced reaction as (coefficient, formula) lists."""
+        a = self.arrays
+        lo, hi = a['rxn_indptr'][reaction_id], a['rxn_indptr'][reaction_id + 1]
+        result: Dict[str, List[Tuple[int, str]]] = {'reactants': [], 'products': []}
+        for compound_id, coefficient in zip(a['rxn_compounds'][lo:hi].tolist(),
+                                            a['rxn_coefficients'][lo:hi].tolist()):
+            side = 'reactants' if coefficient > 0 else 'products'
+            result[side].append((abs(coefficient), self.formula(compound_id)))
+        return result
+
+    def compounds_containing(self, *elements: str) -> np.ndarray:
+        """Sorted ids of compounds that contain every given element."""
+        a = self.arrays
+        return self._intersect(a['ec_indptr'], a['ec_compounds'],
+                               [pt.atomic_number(e) for e in elements])
+
+    def reactions_with_compound(self, formula: str, role: Optional[str] = None) -> np.ndarray:
+        """Sorted ids of reactions involving a compound ('consumes'/'produces' to filter)."""
+        compound_id = self.compound_id(formula)
+        if compound_id is None:
+            return np.empty(0, dtype=np.int64)
+        a = self.arrays
+        lo, hi = a['cr_indptr'][compound_id], a['cr_indptr'][compound_id + 1]
+        reactions = np.asarray(a['cr_reactions'][lo:hi])
+        if role is None:
+            return np.unique(reactions)
+        roles = np.asarray(a['cr_roles'][lo:hi])
+        if role not in ('consumes', 'produces'):
+            raise ValueError(f"Unknown role: {role}")
+        return reactions[roles == (1 if role == 'consumes' else -1)]
+
+    def query(self, consumes: Iterable[str] = (), produces: Iterable[str] = (),
+              compounds: Iterable[str] = ()) -> np.ndarray:
+        """Sorted ids of reactions matching every criterion.
+
+        ``consumes``/``produces`` are element symbols that must appear in some
+        reactant/product; ``compounds`` are formulas (matched by composition)
+        that must take part in the reaction.
+        """
+        a = self.arrays
+        postings = []
+        for z in (pt.atomic_number(e) for e in consumes):
+            postings.append(a['consumed_reactions'][a['consumed_indptr'][z]:a['consumed_indptr'][z + 1]])
+        for z in (pt.atomic_number(e) for e in produces):
+            postings.append(a['produced_reactions'][a['produced_indptr'][z]:a['produced_indptr'][z + 1]])
+        for formula in compounds:
+            postings.append(self.reactions_with_compound(formula))
+        if not postings:
+            return np.arange(self.n_reactions)
+        return self._intersect_postings(postings)
+
+    @staticmethod
+    def _intersect(indptr: np.ndarray, values: np.ndarray, keys: List[int]) -> np.ndarray:
+        if not keys:
+            return np.empty(0, dtype=np.int64)
+        return ReactionStore._intersect_postings([values[indptr[k]:indptr[k + 1]] for k in keys])
+
+    @staticmethod
+    def _intersect_postings(postings: List[np.ndarray]) -> np.ndarray:
+        # Shortest list first keeps every step bounded by the smallest result
+        # and binary search keeps it independent of the longer lists' length
+        postings = sorted(postings, key=len)
+        result = np.asarray(postings[0])
+        for posting in postings[1:]:
+            if not len(result) or not len(posting):
+                return result[:0]
+            idx = np.minimum(np.searchsorted(posting, result), len(posting) - 1)
+            result = result[posting[idx] == result]
+        return result
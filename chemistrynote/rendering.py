@@ -0,0 +1,178 @@
+import io
+from multiprocessing import Pool
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+# matplotlib is imported lazily: nothing here touches it until a renderer
+# is created, and renderers draw on an Agg canvas without pyplot, so they
+# never open windows or block the caller.
+
+# (x label, y label) by SpectroscopyType value
+AXIS_LABELS: Dict[str, Tuple[str, str]] = {
+    "Infrared": ('Wavenumber (cm⁻¹)', 'Transmittance'),
+    "Raman": ('Raman Shift (cm⁻¹)', 'Intensity'),
+    "UV-Visible": ('Wavelength (nm)', 'Absorbance'),
+    "Nuclear Magnetic Resonance": ('Chemical Shift (ppm)', 'Intensity'),
+    "Mass Spectrometry": ('m/z', 'Relative Abundance'),
+}
+
+
+def use_headless_backend():
+    """Switch pyplot to the non-interactive Agg backend."""
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _agg_figure(figsize: Tuple[float, float], dpi: int):
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    figure = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def _to_bytes(figure, fmt: str) -> bytes:
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+def energy_profile(reactants_energy: float, products_energy: float,
+                   activation_energy: float, points: int = 100) -> Tuple[np.ndarray, np.ndarray]:
+    """Quadratic reaction-coordinate profile through reactants, TS and products."""
+    x = np.array([0, 0.5, 1])
+    y = np.array([reactants_energy, reactants_energy + activation_energy, products_energy])
+    coordinate = np.linspace(0, 1, points)
+    return coordinate, np.polyval(np.polyfit(x, y, 2), coordinate)
+
+
+class EnergyDiagramRenderer:
+    """Reusable energy-diagram figure whose artists are updated in place."""
+
+    def __init__(self, figsize: Tuple[float, float] = (10, 6), dpi: int = 100):
+        self.figure = _agg_figure(figsize, dpi)
+        ax = self.axes = self.figure.add_subplot()
+        self._curve, = ax.plot([], [], 'b-', linewidth=2)
+        self._reactants, = ax.plot([], [], 'ro', label='Reactants')
+        self._products, = ax.plot([], [], 'go', label='Products')
+        self._transition, = ax.plot([], [], 'ko', label='Transition State')
+        self._ea_arrow = ax.annotate('', xy=(0, 0), xytext=(0, 0),
+                                     arrowprops=dict(arrowstyle='-|>', color='r'))
+        self._dh_arrow = ax.annotate('', xy=(0, 0), xytext=(0, 0),
+                                     arrowprops=dict(arrowstyle='-|>', color='g'))
+        self._ea_text = ax.text(0, 0, '')
+        self._dh_text = ax.text(0, 0, '')
+        self._title = ax.set_title('')
+        ax.set_xlabel('Reaction Coordinate')
+        ax.set_ylabel('Energy (kJ/mol)')
+        ax.legend()
+        ax.grid(True)
+
+    def draw(self, reactants_energy: float, products_energy: float,
+             activation_energy: float, reaction_name: str = ""):
+        """Update the figure for a new reaction."""
+        transition_energy = reactants_energy + activation_energy
+        self._curve.set_data(*energy_profile(reactants_energy, products_energy, activation_energy))
+        self._reactants.set_data([0], [reactants_energy])
+        self._products.set_data([1], [products_energy])
+        self._transition.set_data([0.5], [transition_energy])
+
+        ea_base = reactants_energy + activation_energy / 2
+        self._ea_arrow.set_position((0.1, ea_base))
+        self._ea_arrow.xy = (0.1, transition_energy)
+        self._ea_text.set_position((0.15, ea_base))
+        self._ea_text.set_text(f'Ea = {activation_energy:.1f} kJ/mol')
+
+        dH = products_energy - reactants_energy
+        dh_base = min(reactants_energy, products_energy) + abs(dH) / 2
+        self._dh_arrow.set_position((0.8, dh_base))
+        self._dh_arrow.xy = (0.8, dh_base + dH / 10)
+        self._dh_text.set_position((0.85, dh_base))
+        self._dh_text.set_text(f'ΔH = {dH:.1f} kJ/mol')
+
+        self._title.set_text(f'Energy Diagram: {reaction_name}')
+        self.axes.relim()
+        self.axes.autoscale_view()
+
+    def render(self, reactants_energy: float, products_energy: float,
+               activation_energy: float, reaction_name: str = "", fmt: str = 'png') -> bytes:
+        """Draw and return the diagram as PNG/SVG/PDF bytes."""
+        self.draw(reactants_energy, products_energy, activation_energy, reaction_name)
+        return _to_bytes(self.figure, fmt)
+
+
+class SpectrumRenderer:
+    """Reusable spectrum figure whose artists are updated in place."""
+
+    def __init__(self, figsize: Tuple[float, float] = (12, 6), dpi: int = 100):
+        self.figure = _agg_figure(figsize, dpi)
+        ax = self.axes = self.figure.add_subplot()
+        self._line, = ax.plot([], [], 'b-', label='Spectrum')
+        self._markers, = ax.plot([], [], 'ro')
+        self._annotations = []
+        self._title = ax.set_title('')
+        ax.grid(True)
+        ax.legend()
+
+    def draw(self, x: np.ndarray, y: np.ndarray, peaks, spec_type):
+        """Update the figure for a new spectrum and its assigned peaks."""
+        ax = self.axes
+        self._line.set_data(x, y)
+        self._markers.set_data([p.wavelength for p in peaks], [p.intensity for p in peaks])
+        for annotation in self._annotations:
+            annotation.remove()
+        self._annotations = [
+            ax.annotate(peak.assignment, (peak.wavelength, peak.intensity),
+                        xytext=(10, 10), textcoords='offset points',
+                        arrowprops=dict(arrowstyle='->'))
+            for peak in peaks
+        ]
+        name = getattr(spec_type, 'value', spec_type)
+        xlabel, ylabel = AXIS_LABELS.get(name, ('', ''))
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        self._title.set_text(f'{name} Spectrum')
+        ax.relim()
+        ax.autoscale_view()
+
+    def render(self, x: np.ndarray, y: np.ndarray, peaks, spec_type, fmt: str = 'png') -> bytes:
+        """Draw and return the spectrum as PNG/SVG/PDF bytes."""
+        self.draw(x, y, peaks, spec_type)
+        return _to_bytes(self.figure, fmt)
+
+
+# One renderer of each kind per process
+_renderers: Dict[str, object] = {}
+_RENDERER_TYPES = {'energy': EnergyDiagramRenderer, 'spectrum': SpectrumRenderer}
+
+
+def get_renderer(kind: str):
+    """Return this process's shared renderer ('energy' or 'spectrum')."""
+    renderer = _renderers.get(kind)
+    if renderer is None:
+        if kind not in _RENDERER_TYPES:
+            raise ValueError(f"Unknown renderer: {kind}")
+        renderer = _renderers[kind] = _RENDERER_TYPES[kind]()
+    return renderer
+
+
+def _render_job(job: Tuple[str, dict, str]) -> bytes:
+    kind, kwargs, fmt = job
+    return get_renderer(kind).render(fmt=fmt, **kwargs)
+
+
+def render_many(kind: str, jobs: Iterable[dict], fmt: str = 'png',
+                workers: Optional[int] = None, chunksize: int = 8) -> Iterator[bytes]:
+    """Render many figures to bytes, in input order, across a process pool.
+
+    Each job holds the keyword arguments of the renderer's ``render`` method
+    (e.g. ``reactants_energy=...`` for ``kind='energy'``). Every worker reuses
+    one figure for all of its jobs. ``workers=1`` renders in-process.
+    """
+    tasks = ((kind, job, fmt) for job in jobs)
+    if workers == 1:
+        yield from map(_render_job, tasks)
+        return
+    with Pool(workers, initializer=use_headless_backend) as pool:
+        yield from pool.imap(_render_job, tasks, chunksize)
@@ -0,0 +1,335 @@
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .molecular_spectroscopy_analyzer import SpectroscopyType
+from .peak_table import PeakTable, SpectralPeak
+
+JCAMP_EXTENSIONS = ('.jdx', '.dx', '.jcamp')
+CSV_EXTENSIONS = ('.csv', '.tsv', '.txt')
+ARRAY_EXTENSIONS = ('.npy',)
+
+# JCAMP-DX ##DATA TYPE keywords
+_DATA_TYPES = (
+    ("RAMAN", SpectroscopyType.RAMAN),
+    ("INFRARED", SpectroscopyType.IR),
+    ("UV", SpectroscopyType.UV_VIS),
+    ("NMR", SpectroscopyType.NMR),
+    ("MASS", SpectroscopyType.MASS),
+)
+
+# ASDF compression characters (JCAMP-DX 4.24): SQZ digits start a new
+# value, DIF digits add to the previous one, DUP digits repeat the last step.
+# Compressed lines carry no exponents, so 'E' is always SQZ 5 there.
+_SQZ = {c: d for d, c in enumerate('@ABCDEFGHI')}
+_SQZ.update({c: -d for d, c in enumerate('abcdefghi', 1)})
+_DIF = {c: d for d, c in enumerate('%JKLMNOPQR')}
+_DIF.update({c: -d for d, c in enumerate('jklmnopqr', 1)})
+_DUP = {c: d for d, c in enumerate('STUVWXYZs', 1)}
+_ASDF_TOKEN = re.compile(r'[@A-Ia-i%J-Rj-rS-Zs][0-9]*\.?[0-9]*|[+-]?[0-9]*\.?[0-9]+')
+_LABEL = re.compile(r'##\s*([^=]*)=(.*)')
+
+Source = Union[str, os.PathLike, Iterable[Union[str, os.PathLike]]]
+
+
+@dataclass
+class Spectrum:
+    """One spectrum read from disk; ``x`` and ``y`` may be memory-mapped views."""
+    source: str
+    x: np.ndarray
+    y: np.ndarray
+    spec_type: Optional[SpectroscopyType] = None
+    title: str = ""
+    y_units: str = ""
+
+
+def _normalize_label(label: str) -> str:
+    return re.sub(r'[\s\-/_]', '', label).upper()
+
+
+def _float(value: str, default: float = 0.0) -> float:
+    try:
+        return float(value.split()[0])
+    except (IndexError, ValueError):
+        return default
+
+
+def _spectroscopy_type(data_type: str) -> Optional[SpectroscopyType]:
+    data_type = data_type.upper()
+    for keyword, spec_type in _DATA_TYPES:
+        if keyword in data_type:
+            return spec_type
+    return None
+
+
+def _decode_asdf(line: str) -> Tuple[List[float], bool]:
+    """Values of one (X++(Y..Y)) line and whether it ended in DIF form."""
+    fields = line.replace(',', ' ').split()
+    try:
+        return [float(f) for f in fields], False
+    except ValueError:
+        pass
+
+    values: List[float] = []
+    step = 0.0
+    last_dif = False
+    for token in _ASDF_TOKEN.findall(line):
+        head, tail = token[0], token[1:]
+        if head in _SQZ:
+            value = float(f"{'-' if _SQZ[head] < 0 else ''}{abs(_SQZ[head])}{tail}")
+            values.append(value)
+            last_dif = False
+        elif head in _DIF:
+            step = float(f"{'-' if _DIF[head] < 0 else ''}{abs(_DIF[head])}{tail}")
+            values.append(values[-1] + step)
+            last_dif = True
+        elif head in _DUP:
+            for _ in range(int(f"{_DUP[head]}{tail}") - 1):
+                values.append(values[-1] + step if last_dif else values[-1])
+        else:
+            values.append(float(token))
+            last_dif = False
+    return values, last_dif
+
+
+def _jcamp_block(source: str, header: Dict[str, str], lines: List[str],
+                 pairs: bool) -> Spectrum:
+    x_factor = _float(header.get('XFACTOR', '1'), 1.0)
+    y_factor = _float(header.get('YFACTOR', '1'), 1.0)
+    if pairs:
+        values = np.array([float(v) for line in lines
+                           for v in line.replace(';', ' ').replace(',', ' ').split()])
+        x, y = values[0::2] * x_factor, values[1::2] * y_factor
+    else:
+        abscissae: List[float] = []
+        ordinates: List[float] = []
+        counts: List[int] = []
+        y_check = False
+        for line in lines:
+            values, dif = _decode_asdf(line)
+            if not values:
+                continue
+            ys = values[1:]
+            if y_check and ys:
+                # DIF lines repeat the previous line's last ordinate as a check
+                ys = ys[1:]
+            abscissae.append(values[0])
+            counts.append(len(ys))
+            ordinates.extend(ys)
+            y_check = dif
+        y = np.asarray(ordinates) * y_factor
+        points = int(_float(header.get('NPOINTS', ''), len(y)))
+        if 'FIRSTX' in header and 'LASTX' in header and points == len(y):
+            x = np.linspace(_float(header['FIRSTX']), _float(header['LASTX']), points)
+        else:
+            # Equally spaced ordinates between consecutive line abscissae
+            delta = (_float(header.get('DELTAX', ''), 1.0 / x_factor)) * x_factor
+            x = np.repeat(np.asarray(abscissae) * x_factor, counts) + delta * (
+                np.arange(len(y)) - np.repeat(np.cumsum(counts) - counts, counts))
+    return Spectrum(source, x, y, _spectroscopy_type(header.get('DATATYPE', '')),
+                    header.get('TITLE', ''), header.get('YUNITS', ''))
+
+
+def iter_jcamp(path: Union[str, os.PathLike]) -> Iterator[Spectrum]:
+    """Stream every data block of a JCAMP-DX file, one line at a time.
+
+    Handles AFFN and ASDF-compressed (SQZ/DIF/DUP) ``##XYDATA=(X++(Y..Y))``
+    tables as well as ``##XYPOINTS``/``##PEAK TABLE`` pair lists; linked
+    multi-block files yield one Spectrum per block.
+    """
+    path = os.fspath(path)
+    header: Dict[str, str] = {}
+    lines: List[str] = []
+    form: Optional[str] = None
+    block = 0
+    with open(path, encoding='utf-8', errors='replace') as handle:
+        for raw in handle:
+            line = raw.split('$$', 1)[0].strip()
+            if not line:
+                continue
+            match = _LABEL.match(line)
+            if match is None:
+                if form is not None:
+                    lines.append(line)
+                continue
+            label, value = _normalize_label(match.group(1)), match.group(2).strip()
+            if form is not None:
+                yield _jcamp_block(f"{path}#{block}" if block else path, header, lines, form != 'XYDATA')
+                block += 1
+                form, lines = None, []
+            if label == 'END':
+                header = {key: header[key] for key in ('DATATYPE', 'XUNITS', 'YUNITS')
+                          if key in header}
+            elif label in ('XYDATA', 'XYPOINTS', 'PEAKTABLE'):
+                form = label
+            else:
+                header[label] = value
+    if form is not None:
+        yield _jcamp_block(f"{path}#{block}" if block else path, header, lines, form != 'XYDATA')
+
+
+def iter_csv(path: Union[str, os.PathLike], spec_type: Optional[SpectroscopyType] = None,
+             delimiter: Optional[str] = None) -> Iterator[Spectrum]:
+    """Stream the spectra of a delimited text file.
+
+    The first numeric column is the axis and every further column is one
+    spectrum. Non-numeric header lines are skipped; the delimiter is
+    sniffed from the first data line when not given.
+    """
+    path = os.fspath(path)
+    with open(path, encoding='utf-8', errors='replace') as handle:
+        data = [line for line in handle if line.strip()[:1] in '+-.0123456789' and line.strip()]
+    if not data:
+        return
+    if delimiter is None:
+        delimiter = next((d for d in (',', '\t', ';') if d in data[0]), None)
+    table = np.atleast_2d(np.loadtxt(data, delimiter=delimiter, ndmin=2))
+    x = table[:, 0]
+    for column in range(1, table.shape[1]):
+        source = path if table.shape[1] == 2 else f"{path}:{column}"
+        yield Spectrum(source, x, table[:, column], spec_type)
+
+
+def iter_array(path: Union[str, os.PathLike],
+               spec_type: Optional[SpectroscopyType] = None) -> Iterator[Spectrum]:
+    """Stream the rows of a memory-mapped ``.npy`` batch.
+
+    Row 0 is the shared axis and rows 1.. are spectra; rows are yielded as
+    read-only views, so only the pages that are analyzed are read.
+    """
+    path = os.fspath(path)
+    table = np.load(path, mmap_mode='r')
+    if table.ndim != 2 or table.shape[0] < 2:
+        raise ValueError(f"{path}: expected an (N + 1, points) array, got shape {table.shape}")
+    x = table[0]
+    for row in range(1, table.shape[0]):
+        yield Spectrum(f"{path}:{row - 1}", x, table[row], spec_type)
+
+
+def _expand(source: Source) -> Iterator[str]:
+    if isinstance(source, (str, os.PathLike)):
+        source = os.fspath(source)
+        if os.path.isdir(source):
+            for entry in sorted(os.scandir(source), key=lambda e: e.name):
+                if entry.is_file() and entry.name.lower().endswith(
+                        JCAMP_EXTENSIONS + CSV_EXTENSIONS + ARRAY_EXTENSIONS):
+                    yield entry.path
+        else:
+            yield source
+    else:
+        for item in source:
+            yield from _expand(item)
+
+
+def iter_spectra(source: Source, spec_type: Optional[SpectroscopyType] = None) -> Iterator[Spectrum]:
+    """Stream spectra from files, directories or an iterable of paths.
+
+    Formats are chosen by extension (JCAMP-DX, CSV/TSV/TXT, ``.npy``).
+    ``spec_type`` overrides the type recorded in JCAMP headers.
+    """
+    for path in _expand(source):
+        extension = os.path.splitext(path)[1].lower()
+        if extension in JCAMP_EXTENSIONS:
+            for spectrum in iter_jcamp(path):
+                if spec_type is not None:
+                    spectrum.spec_type = spec_type
+                yield spectrum
+        elif extension in ARRAY_EXTENSIONS:
+            yield from iter_array(path, spec_type)
+        elif extension in CSV_EXTENSIONS:
+            yield from iter_csv(path, spec_type)
+        else:
+            raise ValueError(f"Unsupported spectrum file: {path}")
+
+
+def to_absorbance(y: np.ndarray, y_units: str) -> np.ndarray:
+    """Turn transmittance (fraction or percent) into absorbance; other units pass through."""
+    if 'TRANSMITTANCE' not in y_units.upper():
+        return y
+    transmittance = np.asarray(y, dtype=float)
+    if 'PERCENT' in y_units.upper() or '%' in y_units or np.nanmax(transmittance) > 1.5:
+        transmittance = transmittance / 100.0
+    return -np.log10(np.clip(transmittance, 1e-6, None))
+
+
+def subtract_baseline(spectra: np.ndarray, window: Optional[int] = None) -> np.ndarray:
+    """Remove a slowly varying baseline from every row of a batch.
+
+    The baseline is a morphological opening (rolling minimum, then rolling
+    maximum) over ``window`` samples of a lightly smoothed copy, smoothed
+    again with a moving average of the same size. Peaks narrower than the window are kept; ``window`` defaults
+    to a third of the row length and 0 disables the correction.
+    """
+    from scipy.ndimage import maximum_filter1d, minimum_filter1d, uniform_filter1d
+    spectra = np.atleast_2d(np.asarray(spectra, dtype=float))
+    if window is None:
+        window = max(3, spectra.shape[1] // 3)
+    if window <= 1:
+        return spectra
+    # Smooth first so the rolling minimum follows the baseline, not the noise floor
+    smoothed = uniform_filter1d(spectra, max(3, window // 20), axis=1, mode='nearest')
+    baseline = maximum_filter1d(minimum_filter1d(smoothed, window, axis=1, mode='nearest'),
+                                window, axis=1, mode='nearest')
+    baseline = uniform_filter1d(baseline, window, axis=1, mode='nearest')
+    return spectra - baseline
+
+
+class SpectrumPipeline:
+    """Generator pipeline: read → baseline → peak finding → assignment.
+
+    Spectra are pulled lazily from :func:`iter_spectra` and analyzed in
+    batches of up to ``batch_size`` consecutive spectra that share an axis
+    and type, so memory stays bounded by one batch regardless of how many
+    files are processed. Each batch becomes one PeakTable (:meth:`tables`)
+    or a stream of ``(source, SpectralPeak)`` records (:meth:`run`).
+    """
+
+    def __init__(self, analyzer, spec_type: Optional[SpectroscopyType] = None,
+                 baseline_window: Optional[int] = None, height: float = 0.1,
+                 distance: Optional[int] = None, batch_size: int = 256, absorbance: bool = True):
+        self.analyzer = analyzer
+        self.spec_type = spec_type
+        self.baseline_window = baseline_window
+        self.height = height
+        self.distance = distance
+        self.batch_size = batch_size
+        self.absorbance = absorbance
+
+    def tables(self, source: Source) -> Iterator[PeakTable]:
+        """Stream one PeakTable per batch; ``table.sources`` names its spectra."""
+        batch: List[Spectrum] = []
+        for spectrum in iter_spectra(source, self.spec_type):
+            if spectrum.spec_type is None:
+                raise ValueError(f"{spectrum.source}: unknown spectrum type; pass spec_type")
+            if batch and (len(batch) >= self.batch_size or not self._compatible(batch[0], spectrum)):
+                yield self._analyze(batch)
+                batch = []
+            batch.append(spectrum)
+        if batch:
+            yield self._analyze(batch)
+
+    def run(self, source: Source) -> Iterator[Tuple[str, SpectralPeak]]:
+        """Stream ``(source, SpectralPeak)`` records for every spectrum in ``source``."""
+        for table in self.tables(source):
+            for row, peak in zip(table.row.tolist(), table):
+                yield table.sources[row], peak
+
+    __call__ = run
+
+    @staticmethod
+    def _compatible(first: Spectrum, spectrum: Spectrum) -> bool:
+        return (first.spec_type == spectrum.spec_type and first.y_units == spectrum.y_units
+                and (first.x is spectrum.x or np.array_equal(first.x, spectrum.x)))
+
+    def _analyze(self, batch: List[Spectrum]) -> PeakTable:
+        first = batch[0]
+        spectra = np.stack([spectrum.y for spectrum in batch]).astype(float)
+        if self.absorbance:
+            spectra = to_absorbance(spectra, first.y_units)
+        if self.baseline_window != 0:
+            spectra = subtract_baseline(spectra, self.baseline_window)
+        return self.analyzer.analyze_spectra(first.x, spectra, first.spec_type, self.height,
+                                             self.distance, [spectrum.source for spectrum in batch])
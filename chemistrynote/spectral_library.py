@@ -0,0 +1,306 @@
+import json
+import os
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .instrumentation import instrument
+
+# Arrays persisted as <name>.npy inside the library directory. ``matrix``
+# holds one unit-norm feature row per reference and is memory-mapped on
+# load; the rest are small. ``ivf_*`` only exist once build_ivf has run.
+_ARRAYS = ('grid', 'matrix', 'name_offsets', 'name_blob', 'pca_mean', 'pca_basis')
+_IVF_ARRAYS = ('ivf_centroids', 'ivf_indptr', 'ivf_rows')
+_VERSION = 1
+
+
+def resample(x: np.ndarray, spectra: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    """Linearly interpolate every row of a batch onto ``grid``.
+
+    ``x`` may be ascending or descending; grid points outside its range
+    are set to 0. The interpolation weights are computed once and applied
+    to all rows.
+    """
+    x = np.asarray(x, dtype=float)
+    spectra = np.atleast_2d(np.asarray(spectra, dtype=float))
+    if x.shape == grid.shape and (x is grid or np.array_equal(x, grid)):
+        return spectra
+    if x[0] > x[-1]:
+        x, spectra = x[::-1], spectra[:, ::-1]
+    right = np.clip(np.searchsorted(x, grid), 1, len(x) - 1)
+    left = right - 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weight = np.nan_to_num((grid - x[left]) / (x[right] - x[left]))
+    result = spectra[:, left] * (1 - weight) + spectra[:, right] * weight
+    result[:, (grid < x[0]) | (grid > x[-1])] = 0.0
+    return result
+
+
+def _normalize(features: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(features, axis=1, keepdims=True)
+    return np.divide(features, norms, out=np.zeros_like(features), where=norms > 0)
+
+
+def _merge_top_k(scores: np.ndarray, indices: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Keep the ``k`` best columns per row (unordered)."""
+    if scores.shape[1] > k:
+        keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        scores = np.take_along_axis(scores, keep, axis=1)
+        indices = np.take_along_axis(indices, keep, axis=1)
+    return scores, indices
+
+
+class SpectralLibrary:
+    """Reference spectra library with top-k similarity search.
+
+    Spectra are resampled onto a shared grid, optionally averaged into
+    ``bins`` bins, centered per spectrum for the ``'correlation'`` metric,
+    optionally projected onto ``components`` principal components, and
+    stored as unit-norm float32 rows. Cosine (or Pearson correlation)
+    scores are then plain dot products, so a search is a sequence of
+    blocked matrix multiplies over the (possibly memory-mapped) matrix
+    with a running top-k merge. :meth:`build_ivf` adds an approximate
+    inverted-file index that probes only the closest clusters.
+    """
+
+    def __init__(self, grid: np.ndarray, bins: Optional[int] = None,
+                 components: Optional[int] = None, metric: str = 'cosine'):
+        if metric not in ('cosine', 'correlation'):
+            raise ValueError(f"Unknown metric: {metric}")
+        self.grid = np.asarray(grid, dtype=float)
+        if bins is not None and not 0 < bins <= len(self.grid):
+            raise ValueError(f"bins must be between 1 and {len(self.grid)}")
+        self.bins = bins
+        self.components = components
+        self.metric = metric
+        self.pca_mean: Optional[np.ndarray] = None
+        self.pca_basis: Optional[np.ndarray] = None
+        self._chunks: List[np.ndarray] = []
+        self._names: List[str] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._name_offsets: Optional[np.ndarray] = None
+        self._name_blob: Optional[np.ndarray] = None
+        self._ivf: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    # -- preprocessing --------------------------------------------------------
+
+    def _reduce(self, x: np.ndarray, spectra: np.ndarray) -> np.ndarray:
+        """Resample, bin, center and normalize (no PCA)."""
+        features = resample(x, spectra, self.grid)
+        if self.bins is not None:
+            width = features.shape[1] // self.bins
+            features = features[:, :width * self.bins].reshape(len(features), self.bins, width).mean(axis=2)
+        if self.metric == 'correlation':
+            features = features - features.mean(axis=1, keepdims=True)
+        return _normalize(features)
+
+    def fit(self, x: np.ndarray, spectra: np.ndarray) -> 'SpectralLibrary':
+        """Fit the PCA projection on a representative sample of spectra."""
+        if not self.components:
+            return self
+        features = self._reduce(x, spectra)
+        if len(features) < self.components:
+            raise ValueError(f"Need at least {self.components} spectra to fit {self.components} components")
+        self.pca_mean = features.mean(axis=0)
+        _, _, vt = np.linalg.svd(features - self.pca_mean, full_matrices=False)
+        self.pca_basis = vt[:self.components].astype(np.float32)
+        return self
+
+    def transform(self, x: np.ndarray, spectra: np.ndarray) -> np.ndarray:
+        """Unit-norm float32 feature rows for a batch of spectra."""
+        features = self._reduce(x, spectra)
+        if self.components:
+            if self.pca_basis is None:
+                raise ValueError("PCA is not fitted; call fit() or add() a first batch")
+            features = _normalize((features - self.pca_mean) @ self.pca_basis.T)
+        return features.astype(np.float32)
+
+    # -- building -------------------------------------------------------------
+
+    def add(self, x: np.ndarray, spectra: np.ndarray, names: Sequence[str]):
+        """Append references; the first batch fits PCA when it is enabled."""
+        spectra = np.atleast_2d(spectra)
+        if len(names) != len(spectra):
+            raise ValueError(f"Got {len(names)} names for {len(spectra)} spectra")
+        if self._matrix is not None:
+            raise ValueError("Library is read-only once saved or loaded")
+        if self.components and self.pca_basis is None:
+            self.fit(x, spectra)
+        self._chunks.append(self.transform(x, spectra))
+        self._names.extend(names)
+        self._ivf = None
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """(n_references, dim) float32 feature matrix."""
+        if self._matrix is not None:
+            return self._matrix
+        if len(self._chunks) != 1:
+            dim = self.components or self.bins or len(self.grid)
+            self._chunks = [np.concatenate(self._chunks) if self._chunks
+                            else np.empty((0, dim), dtype=np.float32)]
+        return self._chunks[0]
+
+    def __len__(self) -> int:
+        return len(self.matrix)
+
+    def name(self, index: int) -> str:
+        if self._name_offsets is None:
+            return self._names[index]
+        start, stop = self._name_offsets[index], self._name_offsets[index + 1]
+        return bytes(self._name_blob[start:stop]).decode()
+
+    # -- search ---------------------------------------------------------------
+
+    @instrument(items=lambda result: len(result[0]))
+    def search(self, x: np.ndarray, queries: np.ndarray, k: int = 5,
+               block_rows: int = 1 << 16, nprobe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-``k`` references for each query spectrum.
+
+        Parameters:
+        x (ndarray): Axis of the query spectra
+        queries (ndarray): Query intensities, shape (Q, points) or (points,)
+        k (int): Number of matches per query
+        block_rows (int): References scored per matrix multiply
+        nprobe (int): With an IVF index, clusters searched per query;
+            None searches the whole library exactly
+
+        Returns:
+        tuple: (indices, scores), each (Q, k), best first; missing matches
+            have index -1 and score -inf
+        """
+        features = self.transform(x, queries)
+        if nprobe is not None and self._ivf is not None:
+            return self._search_ivf(features, k, nprobe)
+        matrix = self.matrix
+        n_queries = len(features)
+        scores = np.full((n_queries, 0), -np.inf, dtype=np.float32)
+        indices = np.empty((n_queries, 0), dtype=np.int64)
+        for start in range(0, len(matrix), block_rows):
+            block = np.asarray(matrix[start:start + block_rows])
+            block_scores = features @ block.T
+            block_indices = np.broadcast_to(np.arange(start, start + len(block)), block_scores.shape)
+            block_scores, block_indices = _merge_top_k(block_scores, block_indices, k)
+            scores, indices = _merge_top_k(np.concatenate([scores, block_scores], axis=1),
+                                           np.concatenate([indices, block_indices], axis=1), k)
+        return self._finish(scores, indices, k)
+
+    @staticmethod
+    def _finish(scores: np.ndarray, indices: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        order = np.argsort(-scores, axis=1, kind='stable')
+        scores = np.take_along_axis(scores, order, axis=1)
+        indices = np.take_along_axis(indices, order, axis=1)
+        if scores.shape[1] < k:
+            pad = k - scores.shape[1]
+            scores = np.pad(scores, ((0, 0), (0, pad)), constant_values=-np.inf)
+            indices = np.pad(indices, ((0, 0), (0, pad)), constant_values=-1)
+        return indices, scores
+
+    def matches(self, x: np.ndarray, queries: np.ndarray, k: int = 5,
+                **options) -> List[List[Tuple[str, float]]]:
+        """(name, score) lists per query, best first."""
+        indices, scores = self.search(x, queries, k, **options)
+        return [[(self.name(i), s) for i, s in zip(row_i, row_s) if i >= 0]
+                for row_i, row_s in zip(indices.tolist(), scores.tolist())]
+
+    # -- approximate index ----------------------------------------------------
+
+    def build_ivf(self, n_lists: Optional[int] = None, iterations: int = 10,
+                  sample: int = 50000, seed: int = 0, block_rows: int = 1 << 16):
+        """Cluster the references (spherical k-means) into an inverted file.
+
+        Searches with ``nprobe`` then score only the references in the
+        ``nprobe`` clusters closest to each query.
+        """
+        matrix = self.matrix
+        n = len(matrix)
+        n_lists = min(n, n_lists or max(1, int(np.sqrt(n))))
+        rng = np.random.default_rng(seed)
+        training = np.asarray(matrix[np.sort(rng.choice(n, min(n, max(sample, n_lists)), replace=False))])
+        centroids = training[rng.choice(len(training), n_lists, replace=False)]
+        for _ in range(iterations):
+            labels = np.argmax(training @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, training)
+            empty = ~sums.any(axis=1)
+            sums[empty] = centroids[empty]
+            centroids = _normalize(sums)
+        labels = np.concatenate([np.argmax(np.asarray(matrix[s:s + block_rows]) @ centroids.T, axis=1)
+                                 for s in range(0, n, block_rows)]) if n else np.empty(0, dtype=np.intp)
+        indptr = np.zeros(n_lists + 1, dtype=np.int64)
+        np.cumsum(np.bincount(labels, minlength=n_lists), out=indptr[1:])
+        self._ivf = (centroids.astype(np.float32), indptr, np.argsort(labels, kind='stable').astype(np.int64))
+
+    def _search_ivf(self, features: np.ndarray, k: int, nprobe: int) -> Tuple[np.ndarray, np.ndarray]:
+        centroids, indptr, rows = self._ivf
+        nprobe = min(nprobe, len(centroids))
+        probes = np.argpartition(-(features @ centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+        matrix = self.matrix
+        all_scores = np.full((len(features), k), -np.inf, dtype=np.float32)
+        all_indices = np.full((len(features), k), -1, dtype=np.int64)
+        for q, lists in enumerate(probes):
+            candidates = np.sort(np.concatenate([rows[indptr[c]:indptr[c + 1]] for c in lists]))
+            scores = np.asarray(matrix[candidates]) @ features[q]
+            top = min(k, len(candidates))
+            if top:
+                best = np.argpartition(-scores, top - 1)[:top]
+                all_scores[q, :top] = scores[best]
+                all_indices[q, :top] = candidates[best]
+        return self._finish(all_scores, all_indices, k)
+
+    # -- persistence ----------------------------------------------------------
+
+    def save(self, path: str):
+        """Write the library to a directory of ``.npy`` arrays."""
+        os.makedirs(path, exist_ok=True)
+        if self._name_offsets is None:
+            encoded = [name.encode() for name in self._names]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(e) for e in encoded], out=offsets[1:])
+            blob = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        else:
+            offsets, blob = self._name_offsets, self._name_blob
+        arrays = {'grid': self.grid, 'name_offsets': offsets, 'name_blob': blob,
+                  'pca_mean': self.pca_mean if self.pca_mean is not None else np.empty(0),
+                  'pca_basis': self.pca_basis if self.pca_basis is not None else np.empty((0, 0))}
+        if self._ivf is not None:
+            arrays.update(zip(_IVF_ARRAYS, self._ivf))
+        for name, array in arrays.items():
+            np.save(os.path.join(path, f'{name}.npy'), array)
+        # Stream the matrix chunk by chunk instead of concatenating in memory
+        chunks = [self._matrix] if self._matrix is not None else self._chunks
+        rows = sum(len(chunk) for chunk in chunks)
+        dim = chunks[0].shape[1] if chunks else (self.components or self.bins or len(self.grid))
+        out = np.lib.format.open_memmap(os.path.join(path, 'matrix.npy'), mode='w+',
+                                        dtype=np.float32, shape=(rows, dim))
+        start = 0
+        for chunk in chunks:
+            out[start:start + len(chunk)] = chunk
+            start += len(chunk)
+        out.flush()
+        del out
+        meta = {'version': _VERSION, 'bins': self.bins, 'components': self.components,
+                'metric': self.metric, 'references': rows, 'ivf': self._ivf is not None}
+        with open(os.path.join(path, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, path: str, mmap_mode: Optional[str] = 'r') -> 'SpectralLibrary':
+        """Open a saved library; the feature matrix is memory-mapped by default."""
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        if meta.get('version') != _VERSION:
+            raise ValueError(f"Unsupported spectral library version: {meta.get('version')}")
+        arrays = {name: np.load(os.path.join(path, f'{name}.npy'),
+                                mmap_mode=mmap_mode if name == 'matrix' else None)
+                  for name in _ARRAYS + (_IVF_ARRAYS if meta['ivf'] else ())}
+        library = cls(arrays['grid'], meta['bins'], meta['components'], meta['metric'])
+        if meta['components']:
+            library.pca_mean = arrays['pca_mean']
+            library.pca_basis = arrays['pca_basis']
+        library._matrix = arrays['matrix']
+        library._name_offsets = arrays['name_offsets']
+        library._name_blob = arrays['name_blob']
+        if meta['ivf']:
+            library._ivf = tuple(arrays[name] for name in _IVF_ARRAYS)
+        return library
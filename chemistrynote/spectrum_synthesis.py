@@ -0,0 +1,135 @@
+import numpy as np
+from functools import lru_cache
+from typing import Optional
+
+
+@lru_cache(maxsize=64)
+def cached_grid(start: float, stop: float, points: int) -> np.ndarray:
+    """Shared, read-only ``np.linspace`` grid."""
+    grid = np.linspace(start, stop, points)
+    grid.setflags(write=False)
+    return grid
+
+
+class SpectrumSynthesizer:
+    """Batched spectrum synthesis with truncated peak windows.
+
+    Each peak is evaluated only on the grid points within ``window`` widths
+    of its center; all windows of a block of samples are flattened into one
+    ragged array, evaluated with a single exp and scattered into the output
+    with ``np.bincount``. Cost therefore scales with the number of points
+    under peaks instead of samples × components × grid points.
+
+    Lorentzian tails are heavy, so the default window depends on the shape:
+    6σ leaves Gaussians below 1e-7 of their height, 100 half widths leaves
+    Lorentzians at 1e-4. An explicit ``window`` applies to both shapes.
+    """
+
+    WINDOWS = {'gaussian': 6.0, 'lorentzian': 100.0}
+
+    def __init__(self, window: Optional[float] = None, max_block_points: int = 1 << 22):
+        self.window = window
+        self.max_block_points = max_block_points
+
+    def synthesize(self, grid: np.ndarray, centers, widths, amplitudes=None,
+                   noise_level: float = 0.0, rng: Optional[np.random.Generator] = None,
+                   seed: Optional[int] = None, out: Optional[np.ndarray] = None,
+                   dtype=np.float32, shape: str = 'gaussian') -> np.ndarray:
+        """Render N samples × M components onto an ascending grid.
+
+        Parameters:
+        grid (ndarray): Ascending axis values, shape (points,)
+        centers, widths (array): Peak centers and widths (σ for Gaussians,
+            half width for Lorentzians), shape (N, M); NaN centers are skipped
+        amplitudes (array): Peak heights (both shapes are unit height),
+            shape (N, M); defaults to 1
+        noise_level (float): Standard deviation of added Gaussian noise
+        rng, seed: Generator (or seed for a new one) used for the noise
+        out (ndarray): Preallocated (N, points) array; overwritten
+        dtype: Output dtype when ``out`` is not given
+
+        Returns:
+        ndarray: Spectra of shape (N, points)
+        """
+        if shape not in self.WINDOWS:
+            raise ValueError(f"Unknown peak shape: {shape}")
+        window = self.WINDOWS[shape] if self.window is None else self.window
+        grid = np.asarray(grid)
+        centers = np.atleast_2d(np.asarray(centers, dtype=float))
+        n_samples, _ = centers.shape
+        widths = np.broadcast_to(np.asarray(widths, dtype=float), centers.shape)
+        amplitudes = np.broadcast_to(np.asarray(1.0 if amplitudes is None else amplitudes, dtype=float),
+                                     centers.shape)
+        points = grid.shape[0]
+        if out is None:
+            out = np.empty((n_samples, points), dtype=dtype)
+        elif out.shape != (n_samples, points):
+            raise ValueError(f"out must have shape {(n_samples, points)}, got {out.shape}")
+
+        valid = np.isfinite(centers) & (amplitudes != 0) & (widths > 0)
+        c = np.where(valid, centers, 0.0)
+        half = window * np.where(valid, widths, 0.0)
+        lo = np.searchsorted(grid, c - half)
+        hi = np.where(valid, np.searchsorted(grid, c + half, side='right'), lo)
+        cumulative = np.cumsum((hi - lo).sum(axis=1))
+        max_rows = max(1, self.max_block_points // max(points, 1))
+
+        if noise_level and rng is None:
+            rng = np.random.default_rng(seed)
+        noise_dtype = np.float32 if out.dtype == np.float32 else np.float64
+
+        start = 0
+        while start < n_samples:
+            # Bound both the ragged window array and the dense block size
+            done = cumulative[start - 1] if start else 0
+            stop = int(np.searchsorted(cumulative, done + self.max_block_points, side='right'))
+            stop = min(max(stop, start + 1), start + max_rows, n_samples)
+            block = out[start:stop]
+            block[...] = 0
+            self._render_block(block, grid, c[start:stop], widths[start:stop],
+                               amplitudes[start:stop], lo[start:stop], hi[start:stop], shape)
+            if noise_level:
+                noise = rng.standard_normal(block.shape, dtype=noise_dtype)
+                noise *= noise_level
+                block += noise
+            start = stop
+        return out
+
+    @staticmethod
+    def _render_block(block, grid, centers, widths, amplitudes, lo, hi, shape):
+        """Add every peak of a block of samples into ``block`` in place."""
+        rows, points = block.shape
+        flat = block.reshape(-1)
+        base = np.arange(rows) * points
+        compute = block.dtype if block.dtype in (np.float32, np.float64) else np.float64
+        step = (grid[-1] - grid[0]) / (points - 1) if points > 1 else 0.0
+        uniform = points > 2 and np.allclose(np.diff(grid), step)
+        # One component column at a time: windows of different rows never
+        # share output cells, so a plain fancy-index add is safe
+        for m in range(centers.shape[1]):
+            lengths = hi[:, m] - lo[:, m]
+            total = int(lengths.sum())
+            if not total:
+                continue
+            offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            if uniform:
+                # Distance from the center without gathering grid values
+                dx = np.repeat((grid[0] + lo[:, m] * step - centers[:, m]).astype(compute), lengths)
+                dx += offsets * compute.type(step)
+            else:
+                dx = (grid[np.repeat(lo[:, m], lengths) + offsets]
+                      - np.repeat(centers[:, m], lengths)).astype(compute)
+            w = np.repeat(widths[:, m].astype(compute), lengths)
+            if shape == 'gaussian':
+                dx /= w
+                dx *= dx
+                dx *= -0.5
+                values = np.exp(dx, out=dx)
+            else:
+                # w² / (dx² + w²): unit height, like the Gaussian
+                dx /= w
+                dx *= dx
+                dx += 1
+                values = np.reciprocal(dx, out=dx)
+            values *= np.repeat(amplitudes[:, m].astype(compute), lengths)
+            flat[np.repeat(base + lo[:, m], lengths) + offsets] += values
@@ -0,0 +1,87 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+
+@dataclass
+class YieldResult:
+    """Batched limiting-reagent analysis; leading axes follow the input."""
+    reactants: List[str]
+    products: List[str]
+    limiting_index: np.ndarray    # (...,) index of the limiting reactant
+    extent: np.ndarray            # (...,) moles of reaction
+    product_moles: np.ndarray     # (..., n_products) theoretical yield
+    product_masses: np.ndarray    # (..., n_products) theoretical yield in g
+    leftover_moles: np.ndarray    # (..., n_reactants) unreacted amounts
+    leftover_masses: np.ndarray   # (..., n_reactants) unreacted amounts in g
+    mass_balance: np.ndarray      # (...,) input mass - (products + leftovers)
+
+    @property
+    def limiting_reagent(self) -> np.ndarray:
+        """Formula of the limiting reactant for every batch."""
+        return np.asarray(self.reactants)[self.limiting_index]
+
+    def percent_yield(self, actual_masses) -> np.ndarray:
+        """Actual over theoretical product mass, in percent."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return 100.0 * np.asarray(actual_masses, dtype=float) / self.product_masses
+
+
+class ReactionStoichiometry:
+    """Vectorized stoichiometry for one balanced reaction.
+
+    Amounts are arrays whose last axis runs over the reactants, so thousands
+    of plant batches are evaluated with a handful of array operations.
+    """
+
+    def __init__(self, reactants: Sequence[str], products: Sequence[str],
+                 reactant_coefficients: Sequence[int], product_coefficients: Sequence[int],
+                 reactant_molar_masses: Sequence[float], product_molar_masses: Sequence[float]):
+        self.reactants = list(reactants)
+        self.products = list(products)
+        self.reactant_coefficients = np.asarray(reactant_coefficients, dtype=float)
+        self.product_coefficients = np.asarray(product_coefficients, dtype=float)
+        self.reactant_molar_masses = np.asarray(reactant_molar_masses, dtype=float)
+        self.product_molar_masses = np.asarray(product_molar_masses, dtype=float)
+
+    def moles(self, masses) -> np.ndarray:
+        """Convert reactant masses (g) to moles."""
+        return np.asarray(masses, dtype=float) / self.reactant_molar_masses
+
+    def yields(self, masses=None, moles: Optional[np.ndarray] = None) -> YieldResult:
+        """Limiting reagent, theoretical yields and leftovers for each batch.
+
+        Parameters:
+        masses (array): Reactant masses in g, shape (..., n_reactants)
+        moles (array): Reactant amounts in mol, used instead of masses
+
+        Returns:
+        YieldResult: Arrays with the same leading shape as the input
+        """
+        if moles is None:
+            if masses is None:
+                raise ValueError("Provide masses or moles")
+            moles = self.moles(masses)
+        else:
+            moles = np.asarray(moles, dtype=float)
+        if moles.shape[-1] != len(self.reactants):
+            raise ValueError(f"Expected {len(self.reactants)} reactant amounts, got {moles.shape[-1]}")
+
+        ratios = moles / self.reactant_coefficients
+        limiting = np.argmin(ratios, axis=-1)
+        extent = np.take_along_axis(ratios, limiting[..., np.newaxis], axis=-1)
+        product_moles = extent * self.product_coefficients
+        leftover_moles = moles - extent * self.reactant_coefficients
+        product_masses = product_moles * self.product_molar_masses
+        leftover_masses = leftover_moles * self.reactant_molar_masses
+        mass_in = (moles * self.reactant_molar_masses).sum(axis=-1)
+        mass_balance = mass_in - product_masses.sum(axis=-1) - leftover_masses.sum(axis=-1)
+        return YieldResult(self.reactants, self.products, limiting, extent[..., 0],
+                           product_moles, product_masses, leftover_moles, leftover_masses,
+                           mass_balance)
+
+    def required_masses(self, product_index: int, target_mass) -> np.ndarray:
+        """Reactant masses (g) needed to make ``target_mass`` g of a product."""
+        extent = (np.asarray(target_mass, dtype=float)
+                  / (self.product_coefficients[product_index] * self.product_molar_masses[product_index]))
+        return extent[..., np.newaxis] * self.reactant_coefficients * self.reactant_molar_masses
@@ -0,0 +1,92 @@
+import numpy as np
+from typing import Tuple
+
+R = 8.314  # Gas constant in J/(mol·K)
+
+# Inputs are anything np.asarray accepts; results broadcast like NumPy
+# ufuncs. Grid helpers take per-reaction vectors and a temperature vector
+# and return (n_reactions, n_temperatures) arrays.
+
+
+def gibbs_energy(delta_H, delta_S, temperature):
+    """Calculate ΔG = ΔH - TΔS (J/mol) with broadcasting."""
+    return np.asarray(delta_H, dtype=float) - np.asarray(temperature, dtype=float) * np.asarray(delta_S, dtype=float)
+
+
+def ln_equilibrium_constant(delta_G, temperature=298.15):
+    """Natural log of K from ΔG (J/mol); finite even for very negative ΔG."""
+    return -np.asarray(delta_G, dtype=float) / (R * np.asarray(temperature, dtype=float))
+
+
+def log10_equilibrium_constant(delta_G, temperature=298.15):
+    """Base-10 log of K from ΔG (J/mol)."""
+    return ln_equilibrium_constant(delta_G, temperature) / np.log(10.0)
+
+
+def equilibrium_constant(delta_G, temperature=298.15):
+    """Calculate K = exp(-ΔG/RT); overflows to inf instead of warning.
+
+    Prefer ln_equilibrium_constant when ΔG can be very negative.
+    """
+    with np.errstate(over='ignore'):
+        return np.exp(ln_equilibrium_constant(delta_G, temperature))
+
+
+def equilibrium_grid(temperatures, delta_H=None, delta_S=None, delta_G=None,
+                     log: bool = True) -> np.ndarray:
+    """Evaluate K(T) for many reactions over many temperatures in one pass.
+
+    Parameters:
+    temperatures (array): Temperatures in Kelvin, shape (n_T,)
+    delta_H, delta_S (array): Reaction enthalpies (J/mol) and entropies
+        (J/(mol·K)), shape (n_reactions,); ΔG(T) = ΔH - TΔS
+    delta_G (array): Temperature-independent ΔG (J/mol), used instead of
+        ΔH/ΔS when given
+    log (bool): Return ln K (default) rather than K
+
+    Returns:
+    ndarray: Shape (n_reactions, n_T)
+    """
+    T = np.asarray(temperatures, dtype=float)[np.newaxis, :]
+    if delta_G is not None:
+        dG = np.asarray(delta_G, dtype=float)[:, np.newaxis]
+    elif delta_H is not None and delta_S is not None:
+        dG = gibbs_energy(np.asarray(delta_H, dtype=float)[:, np.newaxis],
+                          np.asarray(delta_S, dtype=float)[:, np.newaxis], T)
+    else:
+        raise ValueError("Provide delta_G or both delta_H and delta_S")
+    ln_K = ln_equilibrium_constant(dG, T)
+    if log:
+        return ln_K
+    with np.errstate(over='ignore'):
+        return np.exp(ln_K)
+
+
+def van_t_hoff(temperatures, delta_H, delta_S) -> Tuple[np.ndarray, np.ndarray]:
+    """Van 't Hoff curves: ln K = -ΔH/(R T) + ΔS/R.
+
+    Returns:
+    tuple: (1/T with shape (n_T,), ln K with shape (n_reactions, n_T))
+    """
+    inverse_T = 1.0 / np.asarray(temperatures, dtype=float)
+    dH = np.asarray(delta_H, dtype=float)[:, np.newaxis]
+    dS = np.asarray(delta_S, dtype=float)[:, np.newaxis]
+    return inverse_T, -dH / R * inverse_T[np.newaxis, :] + dS / R
+
+
+def extrapolate_ln_k(ln_K_ref, T_ref, delta_H, temperature):
+    """Shift ln K from T_ref to another temperature (integrated van 't Hoff).
+
+    Assumes ΔH is constant over the interval; broadcasts over all inputs.
+    """
+    return (np.asarray(ln_K_ref, dtype=float)
+            - np.asarray(delta_H, dtype=float) / R
+            * (1.0 / np.asarray(temperature, dtype=float) - 1.0 / np.asarray(T_ref, dtype=float)))
+
+
+def temperature_at_k(delta_H, delta_S, K: float = 1.0):
+    """Temperature where K reaches a target value (K=1 gives ΔH/ΔS)."""
+    dH = np.asarray(delta_H, dtype=float)
+    dS = np.asarray(delta_S, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return dH / (dS - R * np.log(K))